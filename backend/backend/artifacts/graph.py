@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Curriculum graph loading helpers shared by the API views and services.
+"""
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+from src.utils import create_graph_data, load_curriculum_data
+
+CURRICULUM_ROOT = Path(settings.CURRICULUM_DIR)
+CACHE_TIMEOUT_SECONDS = 60 * 60  # 1 hour caching window per curriculum file
+GraphData = tuple[list[dict[str, Any]], list[dict[str, Any]]]
+NodeIndex = dict[str, dict[str, Any]]
+
+# Per-process node maps keyed by curriculum file path -> (file signature, index)
+_NODE_INDEXES: dict[str, tuple[str, NodeIndex]] = {}
+
+logger = logging.getLogger(__name__)
+
+
+def get_cached_graph_data(file_path: str) -> GraphData:
+    """Load graph data from cache or rebuild from disk when missing."""
+
+    signature = curriculum_file_signature(Path(file_path))
+    cache_key = f"graph-data:{file_path}:{signature}"
+    cached: GraphData | None = cache.get(cache_key)
+    if cached is not None:
+        logger.info(
+            "graph-data cache hit", extra={"file": file_path, "cache_key": cache_key}
+        )
+        return cached
+
+    records = load_curriculum_data(file_path)
+    graph_data = create_graph_data(records)
+    cache.set(cache_key, graph_data, CACHE_TIMEOUT_SECONDS)
+    logger.info(
+        "graph-data cache miss — rebuilt",
+        extra={
+            "file": file_path,
+            "cache_key": cache_key,
+            "node_count": len(graph_data[0]),
+            "link_count": len(graph_data[1]),
+        },
+    )
+    return graph_data
+
+
+def resolve_curriculum_file(
+    subject: str | None = None, filename: str | None = None
+) -> Path:
+    """Resolve curriculum JSON path based on subject and konu.
+
+    If no subject is provided, defaults to "matematik".
+    If no konu is provided, we fall back to the legacy
+    matematik_kazanimlari_124_154.json if present or the first JSON file.
+
+    For now, konu is not used to select a specific file; the file-level layout
+    remains the same. Filtering by konu is done after loading the nodes.
+    """
+
+    base = CURRICULUM_ROOT
+    subject = subject or "matematik"
+    subject_dir = base / subject
+    if not subject_dir.exists() or not subject_dir.is_dir():
+        raise FileNotFoundError(f"Curriculum subject '{subject}' not found")
+
+    if filename:
+        candidate = subject_dir / filename
+        if candidate.exists():
+            return candidate
+        raise FileNotFoundError(
+            f"Curriculum file '{filename}' not found for subject '{subject}'"
+        )
+
+    # Legacy default for matematik
+    legacy = subject_dir / "matematik_kazanimlari.json"
+    if legacy.exists():
+        return legacy
+
+    # Otherwise pick the first json file
+    for path in subject_dir.glob("*.json"):
+        return path
+
+    raise FileNotFoundError(f"No curriculum JSON found for subject '{subject}'")
+
+
+def curriculum_file_signature(data_file: Path) -> str:
+    """Version string of a curriculum file (changes when the file is edited)."""
+
+    try:
+        stat = data_file.stat()
+    except OSError:
+        return "unknown"
+    return f"{int(stat.st_mtime)}:{stat.st_size}"
+
+
+def get_subject_nodes(subject: str | None) -> NodeIndex:
+    """Return the nodes of a subject's default curriculum file keyed by id.
+
+    The map is built once per curriculum file version and kept in process
+    memory, so lookups by id are O(1) without re-reading the graph cache.
+    Callers must treat the returned dict and nodes as read-only.
+    """
+
+    data_file = resolve_curriculum_file(subject, None)
+    signature = curriculum_file_signature(data_file)
+    cached = _NODE_INDEXES.get(str(data_file))
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    nodes, _ = get_cached_graph_data(str(data_file))
+    index = {str(node["id"]): node for node in nodes if "id" in node}
+    _NODE_INDEXES[str(data_file)] = (signature, index)
+    return index
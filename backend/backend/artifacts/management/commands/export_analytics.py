@@ -0,0 +1,64 @@
+"""Export kazanım scores joined with curriculum labels to CSV or Parquet."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.artifacts.services.export import (
+    EXPORT_CHUNK_SIZE,
+    iter_csv,
+    iter_export_rows,
+    write_parquet,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream every stored kazanım score (with node labels) to a CSV or Parquet "
+        "file in fixed-size chunks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=("csv", "parquet"),
+            default="csv",
+            dest="fmt",
+            help="Parquet output needs the optional 'pyarrow' package.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Destination file. CSV is written to stdout when omitted.",
+        )
+        parser.add_argument("--subject")
+        parser.add_argument("--grade", type=int)
+        parser.add_argument("--track")
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        rows = iter_export_rows(
+            subject=options["subject"],
+            grade=options["grade"],
+            track=options["track"],
+            chunk_size=options["chunk_size"],
+        )
+
+        if options["fmt"] == "parquet":
+            if not options["output"]:
+                raise CommandError("--output is required for Parquet exports.")
+            try:
+                written = write_parquet(
+                    rows, options["output"], row_group_size=options["chunk_size"]
+                )
+            except RuntimeError as exc:
+                raise CommandError(str(exc)) from exc
+            self.stderr.write(f"{written} rows written to {options['output']}")
+            return
+
+        chunks = iter_csv(rows, chunk_size=options["chunk_size"])
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        with open(options["output"], "w", encoding="utf-8", newline="") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+        self.stderr.write(f"Export written to {options['output']}")
@@ -0,0 +1,29 @@
+"""Recompute peer score distributions from the stored kazanım scores."""
+
+from django.core.management.base import BaseCommand
+
+from backend.artifacts.models import KazanimScore
+from backend.artifacts.services.distributions import rebuild_distributions
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the percentile histograms of every cohort from KazanimScore rows. "
+        "Run after backfilling scores or bulk grade/track changes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--subject",
+            action="append",
+            dest="subjects",
+            help="Only rebuild the given subject (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        subjects = options["subjects"] or sorted(
+            KazanimScore.objects.values_list("subject", flat=True).distinct()
+        )
+        for subject in subjects:
+            written = rebuild_distributions(subject)
+            self.stdout.write(f"{subject}: {written} distributions rebuilt")
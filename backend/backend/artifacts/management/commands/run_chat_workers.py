@@ -0,0 +1,68 @@
+"""Run the background workers of the asynchronous chat mode."""
+
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.artifacts.services.chat_jobs import (
+    process_chat_jobs,
+    purge_finished_jobs,
+    work,
+)
+from backend.artifacts.services.llm import get_llm_provider
+
+PURGE_INTERVAL_SECONDS = 600
+
+
+class Command(BaseCommand):
+    help = (
+        'Complete queued chat jobs (POST /api/graph/chat/ with "async": true) '
+        "with a pool of worker threads until interrupted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=settings.LLM_MAX_CONCURRENCY,
+            help="Worker threads (defaults to LLM_MAX_CONCURRENCY).",
+        )
+        parser.add_argument("--poll-interval", type=float, default=0.5)
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the runnable jobs once and exit.",
+        )
+
+    def handle(self, *args, **options):
+        provider = get_llm_provider()
+        if provider is None:
+            raise CommandError("No chat LLM provider is configured.")
+
+        if options["once"]:
+            processed = process_chat_jobs(provider)
+            self.stdout.write(f"{processed} chat jobs processed")
+            return
+
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        threads = [
+            threading.Thread(
+                target=work,
+                args=(provider, stop, options["poll_interval"]),
+                name=f"chat-worker-{index}",
+            )
+            for index in range(max(1, options["threads"]))
+        ]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(f"{len(threads)} chat workers started")
+        try:
+            while not stop.wait(PURGE_INTERVAL_SECONDS):
+                purge_finished_jobs()
+        except KeyboardInterrupt:
+            stop.set()
+        for thread in threads:
+            thread.join()
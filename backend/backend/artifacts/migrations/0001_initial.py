@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="KazanimScore",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("subject", models.CharField(max_length=64, verbose_name="Subject")),
+                (
+                    "node_id",
+                    models.CharField(max_length=128, verbose_name="Curriculum Node ID"),
+                ),
+                (
+                    "konu",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Top-level konu of the node, denormalized for GROUP BY queries",
+                        max_length=255,
+                        verbose_name="Konu",
+                    ),
+                ),
+                (
+                    "score",
+                    models.FloatField(
+                        help_text="Success score between 0 and 100",
+                        verbose_name="Score",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Last Update"),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="kazanim_scores",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Student",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Kazanım Score",
+                "verbose_name_plural": "Kazanım Scores",
+                "indexes": [
+                    models.Index(
+                        fields=["subject", "node_id"], name="score_subject_node_idx"
+                    ),
+                    models.Index(
+                        fields=["subject", "konu"], name="score_subject_konu_idx"
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "subject", "node_id"),
+                        name="unique_user_node_score",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("artifacts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScoreDistribution",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("subject", models.CharField(max_length=64, verbose_name="Subject")),
+                (
+                    "scope",
+                    models.CharField(
+                        choices=[("kazanim", "Kazanım"), ("konu", "Konu")],
+                        max_length=10,
+                        verbose_name="Scope",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        help_text="Node id or konu label, depending on scope",
+                        max_length=255,
+                        verbose_name="Key",
+                    ),
+                ),
+                ("grade", models.IntegerField(verbose_name="Grade")),
+                (
+                    "track",
+                    models.CharField(
+                        blank=True, default="", max_length=10, verbose_name="Track"
+                    ),
+                ),
+                ("counts", models.JSONField(default=list, verbose_name="Bin Counts")),
+                ("total", models.PositiveIntegerField(default=0, verbose_name="Total")),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Last Update"),
+                ),
+            ],
+            options={
+                "verbose_name": "Score Distribution",
+                "verbose_name_plural": "Score Distributions",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("subject", "scope", "key", "grade", "track"),
+                        name="unique_score_distribution",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("artifacts", "0002_scoredistribution"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="kazanimscore",
+            index=models.Index(fields=["user", "score"], name="score_user_score_idx"),
+        ),
+    ]
@@ -0,0 +1,114 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:21
+
+import uuid
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("artifacts", "0003_kazanimscore_user_score_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChatJob",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("owner", models.CharField(max_length=64, verbose_name="Chat Owner")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "Queued"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="queued",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "messages",
+                    models.JSONField(default=list, verbose_name="Prompt Messages"),
+                ),
+                ("question", models.TextField(verbose_name="Question")),
+                (
+                    "context",
+                    models.TextField(
+                        blank=True, default="", verbose_name="Prompt Context"
+                    ),
+                ),
+                (
+                    "reply_key",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        max_length=128,
+                        verbose_name="Reply Cache Key",
+                    ),
+                ),
+                (
+                    "reply",
+                    models.TextField(blank=True, default="", verbose_name="Reply"),
+                ),
+                (
+                    "error",
+                    models.TextField(blank=True, default="", verbose_name="Error"),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Attempts"
+                    ),
+                ),
+                (
+                    "available_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Available At"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Started At"
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Finished At"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Chat Job",
+                "verbose_name_plural": "Chat Jobs",
+                "indexes": [
+                    models.Index(
+                        fields=["status", "available_at"],
+                        name="chatjob_status_avail_idx",
+                    ),
+                    models.Index(
+                        fields=["owner", "status"], name="chatjob_owner_status_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -1,8 +1,142 @@
 # -*- coding: utf-8 -*-
 """
 Models for the artifacts app.
-Currently, the graph is generated from JSON files, so no database models are needed.
+The curriculum graph itself is generated from JSON files; only per-student
+scores on its nodes (and queued chat completions) are stored in the database.
 """
 
+import uuid
 
-# No models needed for now - graph data comes from JSON files
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class KazanimScore(models.Model):
+    """Latest success score (0-100) of a student on a single curriculum node."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="kazanim_scores",
+        verbose_name="Student",
+    )
+    subject = models.CharField("Subject", max_length=64)
+    node_id = models.CharField("Curriculum Node ID", max_length=128)
+    konu = models.CharField(
+        "Konu",
+        max_length=255,
+        blank=True,
+        default="",
+        help_text="Top-level konu of the node, denormalized for GROUP BY queries",
+    )
+    score = models.FloatField("Score", help_text="Success score between 0 and 100")
+    updated_at = models.DateTimeField("Last Update", auto_now=True)
+
+    class Meta:
+        verbose_name = "Kazanım Score"
+        verbose_name_plural = "Kazanım Scores"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "subject", "node_id"], name="unique_user_node_score"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["subject", "node_id"], name="score_subject_node_idx"),
+            models.Index(fields=["subject", "konu"], name="score_subject_konu_idx"),
+            models.Index(fields=["user", "score"], name="score_user_score_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.subject}:{self.node_id}={self.score}"
+
+
+class ScoreDistribution(models.Model):
+    """Fixed-bin histogram of peer scores for one node or konu of a cohort.
+
+    Kept up to date incrementally by score ingestion so percentile queries only
+    read a single row instead of scanning every peer's score.
+    """
+
+    SCOPE_KAZANIM = "kazanim"
+    SCOPE_KONU = "konu"
+    SCOPE_CHOICES = [
+        (SCOPE_KAZANIM, "Kazanım"),
+        (SCOPE_KONU, "Konu"),
+    ]
+
+    subject = models.CharField("Subject", max_length=64)
+    scope = models.CharField("Scope", max_length=10, choices=SCOPE_CHOICES)
+    key = models.CharField(
+        "Key", max_length=255, help_text="Node id or konu label, depending on scope"
+    )
+    grade = models.IntegerField("Grade")
+    track = models.CharField("Track", max_length=10, blank=True, default="")
+    counts = models.JSONField("Bin Counts", default=list)
+    total = models.PositiveIntegerField("Total", default=0)
+    updated_at = models.DateTimeField("Last Update", auto_now=True)
+
+    class Meta:
+        verbose_name = "Score Distribution"
+        verbose_name_plural = "Score Distributions"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["subject", "scope", "key", "grade", "track"],
+                name="unique_score_distribution",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject}:{self.scope}:{self.key}:{self.grade}:{self.track}"
+
+
+class ChatJob(models.Model):
+    """A chat completion queued for the background workers.
+
+    ``owner`` is the chat history owner (``user:<pk>`` or ``session:<id>``);
+    workers run at most one job per owner at a time so a single student cannot
+    occupy every worker.
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.CharField("Chat Owner", max_length=64)
+    status = models.CharField(
+        "Status", max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED
+    )
+    messages = models.JSONField("Prompt Messages", default=list)
+    question = models.TextField("Question")
+    context = models.TextField("Prompt Context", blank=True, default="")
+    reply_key = models.CharField(
+        "Reply Cache Key", max_length=128, blank=True, default=""
+    )
+    reply = models.TextField("Reply", blank=True, default="")
+    error = models.TextField("Error", blank=True, default="")
+    attempts = models.PositiveSmallIntegerField("Attempts", default=0)
+    available_at = models.DateTimeField("Available At", default=timezone.now)
+    created_at = models.DateTimeField("Created At", auto_now_add=True)
+    started_at = models.DateTimeField("Started At", null=True, blank=True)
+    finished_at = models.DateTimeField("Finished At", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Chat Job"
+        verbose_name_plural = "Chat Jobs"
+        indexes = [
+            models.Index(
+                fields=["status", "available_at"], name="chatjob_status_avail_idx"
+            ),
+            models.Index(fields=["owner", "status"], name="chatjob_owner_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.id}:{self.owner}:{self.status}"
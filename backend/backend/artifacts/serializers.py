@@ -5,6 +5,9 @@ Serializers for the artifacts (graph) API.
 
 from rest_framework import serializers
 
+from backend.artifacts.services.cohort import GROUP_BY_CHOICES, GROUP_BY_KAZANIM
+from backend.artifacts.services.lookup import LOOKUP_MAX_IDS
+
 
 class NodeSerializer(serializers.Serializer):
     """Serializer for graph nodes."""
@@ -30,3 +33,58 @@ class GraphDataSerializer(serializers.Serializer):
     nodes = NodeSerializer(many=True)
     links = LinkSerializer(many=True)
     metadata = serializers.DictField()
+
+
+class ScoreIngestSerializer(serializers.Serializer):
+    """Payload for recording a student's scores on curriculum nodes."""
+
+    subject = serializers.CharField(max_length=64)
+    scores = serializers.DictField(
+        child=serializers.FloatField(min_value=0, max_value=100),
+        allow_empty=False,
+    )
+
+
+class CohortQuerySerializer(serializers.Serializer):
+    """Query parameters of the cohort analytics endpoint."""
+
+    subject = serializers.CharField(max_length=64, default="matematik")
+    grade = serializers.IntegerField(required=False, min_value=1)
+    track = serializers.CharField(max_length=10, required=False)
+    group_by = serializers.ChoiceField(
+        choices=GROUP_BY_CHOICES, default=GROUP_BY_KAZANIM
+    )
+
+
+class RankQuerySerializer(serializers.Serializer):
+    """Query parameters of the percentile rank endpoint."""
+
+    subject = serializers.CharField(max_length=64, default="matematik")
+    node_id = serializers.CharField(max_length=128, required=False)
+    konu = serializers.CharField(max_length=255, required=False)
+
+    def validate(self, attrs):
+        if bool(attrs.get("node_id")) == bool(attrs.get("konu")):
+            raise serializers.ValidationError(
+                "node_id veya konu parametrelerinden yalnızca biri gönderilmelidir."
+            )
+        return attrs
+
+
+class NodeLookupSerializer(serializers.Serializer):
+    """Body of the batch node lookup: {"ids": {"<subject>": ["<node_id>", ...]}}."""
+
+    ids = serializers.DictField(
+        child=serializers.ListField(
+            child=serializers.CharField(max_length=128), allow_empty=False
+        ),
+        allow_empty=False,
+    )
+
+    def validate_ids(self, value):
+        total = sum(len(node_ids) for node_ids in value.values())
+        if total > LOOKUP_MAX_IDS:
+            raise serializers.ValidationError(
+                f"En fazla {LOOKUP_MAX_IDS} düğüm aynı anda sorgulanabilir."
+            )
+        return value
@@ -0,0 +1,73 @@
+"""Shared cache of first-turn chatbot replies for repeated questions."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import unicodedata
+
+from django.core.cache import cache
+
+CHAT_CACHE_TIMEOUT = 60 * 60 * 6
+CHAT_CACHE_STATS_KEY = "chat-reply:stats:{outcome}"
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]|_")
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_question(text: str) -> str:
+    """Case fold with Turkish dotted/dotless i rules and drop punctuation.
+
+    ``str.lower`` maps ``I`` to ``i`` and ``İ`` to ``i̇``; in Turkish they are
+    ``ı`` and ``i``, so those two are replaced before lowering.
+    """
+    text = unicodedata.normalize("NFC", str(text))
+    text = text.replace("I", "ı").replace("İ", "i").lower()
+    return " ".join(_PUNCTUATION_RE.sub(" ", text).split())
+
+
+def reply_cache_key(question: str, context: str) -> str:
+    """Key a reply by the normalized question and the exact prompt context.
+
+    ``context`` is the text prepended to the question (graph summary and, for
+    signed-in students, their focus lists), so replies never leak between
+    students with different data.
+    """
+    digest = hashlib.sha256(
+        f"{normalize_question(question)}\0{context}".encode()
+    ).hexdigest()
+    return f"chat-reply:{digest}"
+
+
+def _count(key: str) -> None:
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:  # evicted between add() and incr()
+        cache.set(key, 1, None)
+
+
+def get_cached_reply(key: str) -> str | None:
+    entry = cache.get(key)
+    if entry is None:
+        _count(CHAT_CACHE_STATS_KEY.format(outcome="misses"))
+        return None
+    _count(CHAT_CACHE_STATS_KEY.format(outcome="hits"))
+    logger.info("chat-reply cache hit", extra={"key": key})
+    return entry
+
+
+def store_reply(key: str, reply: str) -> None:
+    cache.set(key, reply, CHAT_CACHE_TIMEOUT)
+
+
+def get_chat_cache_stats() -> dict[str, int]:
+    stats = cache.get_many(
+        [CHAT_CACHE_STATS_KEY.format(outcome=o) for o in ("hits", "misses")]
+    )
+    return {
+        outcome: int(stats.get(CHAT_CACHE_STATS_KEY.format(outcome=outcome)) or 0)
+        for outcome in ("hits", "misses")
+    }
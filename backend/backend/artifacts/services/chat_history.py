@@ -0,0 +1,163 @@
+"""Per-user chat history kept in capped Redis lists instead of the session."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import secrets
+from collections.abc import Iterable
+
+from django.core.cache import cache
+
+CHAT_HISTORY_MAX_MESSAGES = 12  # user + assistant messages kept per owner
+CHAT_HISTORY_TIMEOUT = 60 * 60 * 24 * 7
+CHAT_HISTORY_KEY = "chat-history:{owner}"
+CHAT_CONTEXT_KEY = "chat-context:{digest}"
+CHAT_SUMMARY_KEY = "chat-summary:{owner}"
+CHAT_SUMMARY_MAX_LINES = 8
+QUESTION_PREFIX = "\n\nKullanıcının sorusu:\n"
+
+# (role, text, prompt context) of one message; context is "" for assistant turns
+ChatTurn = tuple[str, str, str]
+
+
+try:
+    from django_redis import get_redis_connection  # type: ignore
+except Exception:  # pragma: no cover - defensive import
+    get_redis_connection = None  # type: ignore[assignment]
+
+
+def redis_client():
+    """Raw client of the default cache, or ``None`` for non-Redis backends."""
+    if get_redis_connection is None:
+        return None
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+def chat_history_owner(user, session) -> str:
+    """Students share one history across devices; guests get one per session."""
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+    if "chat_id" not in session:
+        # Marks the session modified so the middleware issues a cookie.
+        session["chat_id"] = secrets.token_hex(16)
+    return f"session:{session['chat_id']}"
+
+
+def build_user_message(question: str, context: str) -> str:
+    return context + QUESTION_PREFIX + question if context else question
+
+
+def _context_ref(context: str) -> str:
+    if not context:
+        return ""
+    digest = hashlib.sha1(context.encode()).hexdigest()
+    cache.set(CHAT_CONTEXT_KEY.format(digest=digest), context, CHAT_HISTORY_TIMEOUT)
+    return digest
+
+
+def _encode(role: str, text: str, context: str) -> str:
+    entry = {"r": role[0], "t": text}
+    ref = _context_ref(context)
+    if ref:
+        entry["x"] = ref
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[: limit - 1].rstrip() + "…"
+
+
+def summarize_turns(turns: Iterable[ChatTurn]) -> list[str]:
+    """One short line per question/answer pair, for the rolling summary."""
+    lines: list[str] = []
+    question = None
+    for role, text, _ in turns:
+        if role == "user":
+            if question is not None:
+                lines.append(f"- Öğrenci: {_clip(question, 120)}")
+            question = text
+            continue
+        prefix = f"- Öğrenci: {_clip(question, 120)} / " if question else "- "
+        lines.append(prefix + f"BayKoç AI: {_clip(text, 200)}")
+        question = None
+    if question is not None:
+        lines.append(f"- Öğrenci: {_clip(question, 120)}")
+    return lines
+
+
+def _decode(raw: Iterable[str | bytes]) -> list[ChatTurn]:
+    """Decode newest-first list entries into chronological turns."""
+    entries = [json.loads(item) for item in reversed(list(raw))]
+    refs = {entry["x"] for entry in entries if entry.get("x")}
+    contexts = cache.get_many([CHAT_CONTEXT_KEY.format(digest=ref) for ref in refs])
+    turns: list[ChatTurn] = []
+    for entry in entries:
+        context = ""
+        if entry.get("x"):
+            context = contexts.get(CHAT_CONTEXT_KEY.format(digest=entry["x"]), "")
+        role = "assistant" if entry["r"] == "a" else "user"
+        turns.append((role, entry["t"], context))
+    return turns
+
+
+def load_chat_turns(owner: str) -> tuple[list[ChatTurn], list[str]]:
+    """Stored turns of ``owner`` (oldest first) and the rolling summary lines."""
+    key = CHAT_HISTORY_KEY.format(owner=owner)
+    client = redis_client()
+    if client is not None:
+        raw = client.lrange(cache.make_key(key), 0, -1)
+    else:
+        raw = cache.get(key) or []
+    summary = cache.get(CHAT_SUMMARY_KEY.format(owner=owner)) or []
+    return _decode(raw), summary
+
+
+def _fold_into_summary(owner: str, dropped: list[str | bytes]) -> None:
+    if not dropped:
+        return
+    key = CHAT_SUMMARY_KEY.format(owner=owner)
+    lines = [*(cache.get(key) or []), *summarize_turns(_decode(dropped))]
+    cache.set(key, lines[-CHAT_SUMMARY_MAX_LINES:], CHAT_HISTORY_TIMEOUT)
+
+
+def append_chat_turns(owner: str, turns: Iterable[ChatTurn]) -> None:
+    """Push messages and trim the list to ``CHAT_HISTORY_MAX_MESSAGES``.
+
+    With Redis this is one ``LPUSH``/``LRANGE``/``LTRIM``/``EXPIRE`` pipeline
+    regardless of how long the conversation is; other cache backends rewrite
+    the small list. Messages trimmed off the end are folded into the owner's
+    rolling summary.
+    """
+    encoded = [_encode(role, text, context) for role, text, context in turns]
+    if not encoded:
+        return
+    key = CHAT_HISTORY_KEY.format(owner=owner)
+    client = redis_client()
+    if client is not None:
+        redis_key = cache.make_key(key)
+        pipe = client.pipeline()
+        pipe.lpush(redis_key, *encoded)
+        pipe.lrange(redis_key, CHAT_HISTORY_MAX_MESSAGES, -1)
+        pipe.ltrim(redis_key, 0, CHAT_HISTORY_MAX_MESSAGES - 1)
+        pipe.expire(redis_key, CHAT_HISTORY_TIMEOUT)
+        _, dropped, _, _ = pipe.execute()
+    else:
+        entries = [*reversed(encoded), *(cache.get(key) or [])]
+        dropped = entries[CHAT_HISTORY_MAX_MESSAGES:]
+        cache.set(key, entries[:CHAT_HISTORY_MAX_MESSAGES], CHAT_HISTORY_TIMEOUT)
+    _fold_into_summary(owner, dropped)
+
+
+def clear_chat_history(owner: str) -> None:
+    key = CHAT_HISTORY_KEY.format(owner=owner)
+    client = redis_client()
+    if client is not None:
+        client.delete(cache.make_key(key))
+    else:
+        cache.delete(key)
+    cache.delete(CHAT_SUMMARY_KEY.format(owner=owner))
@@ -0,0 +1,202 @@
+"""Database-backed queue of chat completions for the background workers."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from backend.artifacts.models import ChatJob
+from backend.artifacts.services.chat_cache import store_reply
+from backend.artifacts.services.chat_history import append_chat_turns
+from backend.artifacts.services.chat_prompt import CHAT_FALLBACK_REPLY
+from backend.artifacts.services.coalesce import complete_coalesced
+from backend.artifacts.services.llm import (
+    LLMError,
+    LLMProvider,
+    LLMUnavailable,
+    Messages,
+)
+
+CHAT_JOB_MAX_ATTEMPTS = 3
+CHAT_JOB_MAX_PENDING_PER_OWNER = 3
+CHAT_JOB_RETENTION = timedelta(days=1)
+CHAT_JOB_CLAIM_CANDIDATES = 10
+CHAT_JOB_SATURATED_DELAY = timedelta(seconds=1)
+CHAT_WORKER_MAX_BACKOFF = 30.0
+PENDING_STATUSES = (ChatJob.STATUS_QUEUED, ChatJob.STATUS_RUNNING)
+
+logger = logging.getLogger(__name__)
+
+
+class ChatQueueFull(Exception):
+    """The owner already has the maximum number of pending jobs."""
+
+
+def _stale_after() -> timedelta:
+    # A running job older than every provider attempt belongs to a dead worker.
+    return timedelta(
+        seconds=settings.LLM_TIMEOUT_SECONDS * settings.LLM_MAX_ATTEMPTS + 30
+    )
+
+
+def enqueue_chat_job(
+    owner: str, question: str, context: str, messages: Messages, reply_key: str = ""
+) -> ChatJob:
+    pending = ChatJob.objects.filter(owner=owner, status__in=PENDING_STATUSES)
+    if pending.count() >= CHAT_JOB_MAX_PENDING_PER_OWNER:
+        raise ChatQueueFull(owner)
+    return ChatJob.objects.create(
+        owner=owner,
+        question=question,
+        context=context,
+        messages=messages,
+        reply_key=reply_key or "",
+    )
+
+
+def _lock_owner(owner: str) -> bool:
+    """Take a transaction-scoped lock on ``owner``; False if another worker has it.
+
+    Only PostgreSQL needs it: other backends already serialize writers.
+    """
+    if connection.vendor != "postgresql":
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_try_advisory_xact_lock(hashtext(%s))", [f"chat-job:{owner}"]
+        )
+        return cursor.fetchone()[0]
+
+
+@transaction.atomic
+def claim_next_job() -> ChatJob | None:
+    """Mark the next runnable job as running and return it.
+
+    Owners that already have a running job are skipped, so one student's burst
+    of messages is interleaved with everybody else's instead of filling every
+    worker. ``skip_locked`` lets concurrent workers claim different rows, and a
+    per-owner advisory lock plus a re-check of the owner's running jobs keeps
+    two workers from claiming the same owner's jobs at once.
+
+    Running jobs whose worker died are requeued, or failed once they used up
+    ``CHAT_JOB_MAX_ATTEMPTS``.
+    """
+    now = timezone.now()
+    stale = ChatJob.objects.filter(
+        status=ChatJob.STATUS_RUNNING, started_at__lt=now - _stale_after()
+    )
+    stale.filter(attempts__gte=CHAT_JOB_MAX_ATTEMPTS).update(
+        status=ChatJob.STATUS_FAILED, error="Worker stopped responding", finished_at=now
+    )
+    stale.update(status=ChatJob.STATUS_QUEUED, available_at=now)
+
+    running = ChatJob.objects.filter(status=ChatJob.STATUS_RUNNING)
+    candidates = (
+        ChatJob.objects.select_for_update(skip_locked=True)
+        .filter(status=ChatJob.STATUS_QUEUED, available_at__lte=now)
+        .exclude(owner__in=running.values("owner"))
+        .order_by("available_at", "created_at")[:CHAT_JOB_CLAIM_CANDIDATES]
+    )
+    for job in candidates:
+        if not _lock_owner(job.owner) or running.filter(owner=job.owner).exists():
+            continue
+        job.status = ChatJob.STATUS_RUNNING
+        job.started_at = now
+        job.attempts += 1
+        job.save(update_fields=["status", "started_at", "attempts"])
+        return job
+    return None
+
+
+def run_chat_job(job: ChatJob, provider: LLMProvider) -> ChatJob:
+    """Complete a claimed job; failed attempts are retried with backoff."""
+    try:
+        reply = complete_coalesced(provider, job.messages)
+    except LLMUnavailable as exc:
+        # Saturation is not the job's fault: requeue without using an attempt.
+        job.status = ChatJob.STATUS_QUEUED
+        job.attempts -= 1
+        job.error = str(exc)
+        job.available_at = timezone.now() + CHAT_JOB_SATURATED_DELAY
+        job.save(update_fields=["status", "attempts", "error", "available_at"])
+        return job
+    except LLMError as exc:
+        now = timezone.now()
+        job.error = str(exc)
+        if job.attempts < CHAT_JOB_MAX_ATTEMPTS:
+            job.status = ChatJob.STATUS_QUEUED
+            job.available_at = now + timedelta(seconds=2**job.attempts)
+        else:
+            job.status = ChatJob.STATUS_FAILED
+            job.finished_at = now
+        job.save(update_fields=["status", "error", "available_at", "finished_at"])
+        logger.warning(
+            "chat job attempt failed",
+            extra={"job": str(job.pk), "attempts": job.attempts, "status": job.status},
+        )
+        return job
+
+    if reply and job.reply_key:
+        store_reply(job.reply_key, reply)
+    job.reply = reply or CHAT_FALLBACK_REPLY
+    append_chat_turns(
+        job.owner,
+        [("user", job.question, job.context), ("assistant", job.reply, "")],
+    )
+    job.status = ChatJob.STATUS_DONE
+    job.error = ""
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "reply", "error", "finished_at"])
+    return job
+
+
+def purge_finished_jobs() -> int:
+    cutoff = timezone.now() - CHAT_JOB_RETENTION
+    deleted, _ = ChatJob.objects.filter(
+        status__in=(ChatJob.STATUS_DONE, ChatJob.STATUS_FAILED),
+        finished_at__lt=cutoff,
+    ).delete()
+    return deleted
+
+
+def process_chat_jobs(provider: LLMProvider, max_jobs: int | None = None) -> int:
+    """Run runnable jobs until the queue is drained; returns how many ran."""
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        job = claim_next_job()
+        if job is None:
+            break
+        run_chat_job(job, provider)
+        processed += 1
+    return processed
+
+
+def work(
+    provider: LLMProvider, stop: threading.Event, poll_interval: float = 0.5
+) -> None:
+    """Worker thread loop: run jobs, sleep while the queue is empty.
+
+    Unexpected errors (a lost database connection, a provider bug) are logged
+    and retried with exponential backoff instead of ending the thread.
+    """
+    failures = 0
+    try:
+        while not stop.is_set():
+            close_old_connections()
+            try:
+                processed = process_chat_jobs(provider, max_jobs=50)
+            except Exception:
+                failures += 1
+                logger.exception("chat worker iteration failed")
+                stop.wait(min(poll_interval * 2**failures, CHAT_WORKER_MAX_BACKOFF))
+                continue
+            failures = 0
+            if not processed:
+                stop.wait(poll_interval)
+    finally:
+        close_old_connections()
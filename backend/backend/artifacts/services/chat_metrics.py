@@ -0,0 +1,191 @@
+"""Per-phase latency spans and histograms of the chat pipeline."""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+from backend.artifacts.services.chat_history import redis_client
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is unbounded.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+CHAT_METRICS_KEY = "chat-metrics:{phase}"
+CHAT_METRICS_PHASES_KEY = "chat-metrics:phases"
+TOTAL_PHASE = "total"
+
+logger = logging.getLogger(__name__)
+
+
+def _bucket(ms: float) -> str:
+    index = bisect.bisect_left(LATENCY_BUCKETS_MS, ms)
+    return (
+        f"le_{LATENCY_BUCKETS_MS[index]}" if index < len(LATENCY_BUCKETS_MS) else "inf"
+    )
+
+
+class ChatTimer:
+    """Collects the spans and token counts of one chat request.
+
+    ``with timer.span("context"):`` adds the block's wall time to the phase,
+    so a phase entered twice (e.g. two cache reads) is reported as one sum.
+    """
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.tokens: dict[str, int] = {}
+        self.outcome = "ok"
+
+    @contextmanager
+    def span(self, phase: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, (time.perf_counter() - started) * 1000)
+
+    def add(self, phase: str, ms: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + ms
+
+    def finish(self) -> dict[str, Any]:
+        """Log the request's spans and add them to the shared histograms."""
+        total_ms = (time.perf_counter() - self.started) * 1000
+        phases = {phase: round(ms, 2) for phase, ms in self.phases.items()}
+        slo_ms = settings.CHAT_LATENCY_SLO_MS
+        record = {
+            "endpoint": self.endpoint,
+            "outcome": self.outcome,
+            "total_ms": round(total_ms, 2),
+            "phases_ms": phases,
+            **self.tokens,
+        }
+        level = logging.WARNING if slo_ms and total_ms > slo_ms else logging.INFO
+        logger.log(
+            level,
+            "chat timings %s outcome=%s total=%.0fms",
+            self.endpoint,
+            self.outcome,
+            total_ms,
+            extra={"chat_timings": record},
+        )
+        try:
+            record_chat_timings({**self.phases, TOTAL_PHASE: total_ms}, slo_ms)
+        except Exception:  # metrics must never fail a chat request
+            logger.exception("chat metrics could not be recorded")
+        return record
+
+
+def record_chat_timings(phases: dict[str, float], slo_ms: float = 0) -> None:
+    """Increment the bucket, count and sum of every phase's histogram.
+
+    With Redis this is one pipeline of ``HINCRBY`` calls on a hash per phase,
+    so workers share the histograms; other cache backends rewrite a small dict.
+    """
+    client = redis_client()
+    if client is not None:
+        pipe = client.pipeline()
+        pipe.sadd(cache.make_key(CHAT_METRICS_PHASES_KEY), *phases)
+        for phase, ms in phases.items():
+            key = cache.make_key(CHAT_METRICS_KEY.format(phase=phase))
+            pipe.hincrby(key, _bucket(ms), 1)
+            pipe.hincrby(key, "count", 1)
+            pipe.hincrbyfloat(key, "sum_ms", ms)
+            if phase == TOTAL_PHASE and slo_ms and ms > slo_ms:
+                pipe.hincrby(key, "over_slo", 1)
+        pipe.execute()
+        return
+
+    known = cache.get(CHAT_METRICS_PHASES_KEY) or []
+    cache.set(CHAT_METRICS_PHASES_KEY, sorted({*known, *phases}), None)
+    for phase, ms in phases.items():
+        key = CHAT_METRICS_KEY.format(phase=phase)
+        histogram = cache.get(key) or {}
+        for field, delta in ((_bucket(ms), 1), ("count", 1), ("sum_ms", ms)):
+            histogram[field] = histogram.get(field, 0) + delta
+        if phase == TOTAL_PHASE and slo_ms and ms > slo_ms:
+            histogram["over_slo"] = histogram.get("over_slo", 0) + 1
+        cache.set(key, histogram, None)
+
+
+def _decode(raw: dict) -> dict[str, float]:
+    return {
+        (field.decode() if isinstance(field, bytes) else field): float(value)
+        for field, value in raw.items()
+    }
+
+
+def _quantile(buckets: list[tuple[str, int]], count: int, q: float) -> float | None:
+    """Upper bound of the bucket holding the ``q`` quantile."""
+    seen = 0
+    for bound, hits in buckets:
+        seen += hits
+        if seen >= q * count:
+            return None if bound == "inf" else float(bound)
+    return None
+
+
+def get_chat_metrics() -> dict[str, dict[str, Any]]:
+    """Histogram, mean and bucket-resolution p50/p95/p99 per phase."""
+    client = redis_client()
+    if client is not None:
+        phases = sorted(
+            p.decode() if isinstance(p, bytes) else p
+            for p in client.smembers(cache.make_key(CHAT_METRICS_PHASES_KEY))
+        )
+        pipe = client.pipeline()
+        for phase in phases:
+            pipe.hgetall(cache.make_key(CHAT_METRICS_KEY.format(phase=phase)))
+        histograms = [_decode(raw) for raw in pipe.execute()]
+    else:
+        phases = cache.get(CHAT_METRICS_PHASES_KEY) or []
+        stored = cache.get_many([CHAT_METRICS_KEY.format(phase=p) for p in phases])
+        histograms = [
+            _decode(stored.get(CHAT_METRICS_KEY.format(phase=p)) or {}) for p in phases
+        ]
+
+    metrics = {}
+    for phase, histogram in zip(phases, histograms):
+        count = int(histogram.get("count", 0))
+        if not count:
+            continue
+        buckets = [
+            (str(bound), int(histogram.get(f"le_{bound}", 0)))
+            for bound in LATENCY_BUCKETS_MS
+        ] + [("inf", int(histogram.get("inf", 0)))]
+        metrics[phase] = {
+            "count": count,
+            "mean_ms": round(histogram.get("sum_ms", 0.0) / count, 2),
+            "p50_ms": _quantile(buckets, count, 0.5),
+            "p95_ms": _quantile(buckets, count, 0.95),
+            "p99_ms": _quantile(buckets, count, 0.99),
+            "buckets": dict(buckets),
+        }
+        if phase == TOTAL_PHASE:
+            metrics[phase]["over_slo"] = int(histogram.get("over_slo", 0))
+    return metrics
+
+
+def reset_chat_metrics() -> None:
+    client = redis_client()
+    if client is not None:
+        phases = [
+            p.decode() if isinstance(p, bytes) else p
+            for p in client.smembers(cache.make_key(CHAT_METRICS_PHASES_KEY))
+        ]
+        client.delete(
+            cache.make_key(CHAT_METRICS_PHASES_KEY),
+            *(cache.make_key(CHAT_METRICS_KEY.format(phase=p)) for p in phases),
+        )
+        return
+    phases = cache.get(CHAT_METRICS_PHASES_KEY) or []
+    cache.delete_many(
+        [CHAT_METRICS_PHASES_KEY, *(CHAT_METRICS_KEY.format(phase=p) for p in phases)]
+    )
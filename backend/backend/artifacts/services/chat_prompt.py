@@ -0,0 +1,104 @@
+"""Token-budgeted chat prompts built from the stored history."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Sequence
+from typing import Any
+
+from backend.artifacts.services.chat_history import (
+    ChatTurn,
+    build_user_message,
+    summarize_turns,
+)
+
+CHAT_PROMPT_TOKEN_BUDGET = 3000
+MESSAGE_TOKEN_OVERHEAD = 4  # role markers and separators of the chat format
+SUMMARY_HEADER = "Önceki konuşmanın özeti:\n"
+CHAT_FALLBACK_REPLY = "Şu anda net bir yanıt oluşturamadım, sorunu biraz daha ayrıntılı anlatabilir misin?"
+
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count without a tokenizer download.
+
+    Every punctuation mark counts as one token and words as one token per four
+    characters, which slightly over-estimates Llama tokenizers on Turkish text.
+    """
+    return sum(
+        (len(piece) + 3) // 4 if piece[0].isalnum() or piece[0] == "_" else 1
+        for piece in _PIECE_RE.findall(text)
+    )
+
+
+def _message(role: str, content: str) -> dict[str, Any]:
+    return {"role": role, "content": content}
+
+
+def _cost(message: dict[str, Any]) -> int:
+    return estimate_tokens(message["content"]) + MESSAGE_TOKEN_OVERHEAD
+
+
+def prompt_tokens(messages: Sequence[dict[str, Any]]) -> int:
+    """Estimated prompt size of provider ``messages``."""
+    return sum(map(_cost, messages))
+
+
+def build_chat_prompt(
+    system_prompt: str,
+    turns: Sequence[ChatTurn],
+    summary: Sequence[str] = (),
+    budget: int = CHAT_PROMPT_TOKEN_BUDGET,
+) -> list[dict[str, Any]]:
+    """Provider messages for ``turns`` (the last one is the new question).
+
+    Steps, applied until the prompt fits ``budget``:
+
+    1. older user turns drop a graph/focus context that a later turn repeats;
+    2. older user turns drop their remaining contexts;
+    3. the oldest turns are folded into the rolling summary;
+    4. the oldest summary lines are dropped.
+
+    The system prompt and the new question (with its context) always stay.
+    """
+    turns = [list(turn) for turn in turns]
+    later_contexts: set[str] = set()
+    for turn in reversed(turns):
+        if turn[0] != "user":
+            continue
+        if turn is not turns[-1] and turn[2] in later_contexts:
+            turn[2] = ""
+        later_contexts.add(turn[2])
+
+    summary = list(summary)
+    system = _message("system", system_prompt)
+
+    def _messages() -> list[dict[str, Any]]:
+        messages = [system]
+        if summary:
+            messages.append(_message("system", SUMMARY_HEADER + "\n".join(summary)))
+        for role, text, context in turns:
+            content = build_user_message(text, context) if role == "user" else text
+            messages.append(_message(role, content))
+        return messages
+
+    messages = _messages()
+    if prompt_tokens(messages) <= budget:
+        return messages
+
+    for turn in turns[:-1]:
+        turn[2] = ""
+    messages = _messages()
+
+    while prompt_tokens(messages) > budget and len(turns) > 1:
+        dropped = [turns.pop(0)]
+        if dropped[0][0] == "user" and len(turns) > 1 and turns[0][0] == "assistant":
+            dropped.append(turns.pop(0))
+        summary.extend(summarize_turns(tuple(turn) for turn in dropped))
+        messages = _messages()
+
+    while prompt_tokens(messages) > budget and summary:
+        summary.pop(0)
+        messages = _messages()
+    return messages
@@ -0,0 +1,217 @@
+"""Share one provider call between identical in-flight chat prompts.
+
+Within a worker, followers wait on the leader's future. Across workers the
+leader holds a short cache lease and publishes the reply; followers block on
+a Redis list the leader pushes to when it finishes (other cache backends are
+polled with exponential backoff). If the lease disappears without a reply
+(the leader failed or died) a follower makes the call itself. At most
+``LLM_MAX_WAITING_FOLLOWERS`` requests per process wait on other workers;
+the rest get ``LLMUnavailable`` like callers that find no provider slot.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator
+from concurrent.futures import Future
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from backend.artifacts.services.llm import LLMProvider, LLMUnavailable, Messages
+
+try:
+    from django_redis import get_redis_connection  # type: ignore
+except Exception:  # pragma: no cover - defensive import
+    get_redis_connection = None  # type: ignore[assignment]
+
+INFLIGHT_LEASE_KEY = "llm-inflight:{key}"
+INFLIGHT_RESULT_KEY = "llm-inflight-result:{key}"
+INFLIGHT_DONE_KEY = "llm-inflight-done:{key}"
+INFLIGHT_RESULT_TIMEOUT = 30  # long enough for every waiting follower to read it
+WAIT_SLICE_SECONDS = 1  # BLPOP timeout between checks of the leader's lease
+# Without Redis followers poll, doubling the delay after every check
+POLL_INTERVAL_SECONDS = 0.05
+POLL_MAX_INTERVAL_SECONDS = 1.0
+
+_local: dict[str, Future] = {}
+_local_lock = threading.Lock()
+_followers: threading.BoundedSemaphore | None = None
+
+logger = logging.getLogger(__name__)
+
+
+def prompt_key(provider: LLMProvider, messages: Messages) -> str:
+    payload = [provider.name, getattr(provider, "model", ""), messages]
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()
+    ).hexdigest()
+
+
+def _lease_seconds() -> float:
+    return settings.LLM_TIMEOUT_SECONDS * settings.LLM_MAX_ATTEMPTS + 5
+
+
+def _redis():
+    if get_redis_connection is None:
+        return None
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+def _follower_slots() -> threading.BoundedSemaphore:
+    global _followers
+    with _local_lock:
+        if _followers is None:
+            _followers = threading.BoundedSemaphore(settings.LLM_MAX_WAITING_FOLLOWERS)
+        return _followers
+
+
+def _done_key(key: str) -> str:
+    return cache.make_key(INFLIGHT_DONE_KEY.format(key=key))
+
+
+def _claim(key: str) -> bool:
+    claimed = cache.add(INFLIGHT_LEASE_KEY.format(key=key), 1, _lease_seconds())
+    client = _redis()
+    if claimed and client is not None:
+        client.delete(_done_key(key))  # a wake-up left by a previous leader
+    return claimed
+
+
+def _notify(key: str) -> None:
+    """Wake one follower blocked on ``key``; each woken follower wakes the next."""
+    client = _redis()
+    if client is None:
+        return
+    done = _done_key(key)
+    with client.pipeline() as pipe:
+        pipe.delete(done)
+        pipe.rpush(done, 1)
+        pipe.expire(done, INFLIGHT_RESULT_TIMEOUT)
+        pipe.execute()
+
+
+def _publish(key: str, reply: str) -> None:
+    cache.set(INFLIGHT_RESULT_KEY.format(key=key), reply, INFLIGHT_RESULT_TIMEOUT)
+    cache.delete(INFLIGHT_LEASE_KEY.format(key=key))
+    _notify(key)
+
+
+def _release(key: str) -> None:
+    cache.delete(INFLIGHT_LEASE_KEY.format(key=key))
+    _notify(key)
+
+
+def _poll(key: str) -> tuple[str | None, bool]:
+    """``(reply, still_running)`` for the leader of ``key``."""
+    reply = cache.get(INFLIGHT_RESULT_KEY.format(key=key))
+    if reply is not None:
+        return reply, False
+    if cache.get(INFLIGHT_LEASE_KEY.format(key=key)) is not None:
+        return None, True
+    # The lease may have been dropped right after publishing.
+    return cache.get(INFLIGHT_RESULT_KEY.format(key=key)), False
+
+
+def _wait_for_leader(key: str) -> str | None:
+    """Block until the leader of ``key`` finishes; its reply, or None if it failed.
+
+    Raises ``LLMUnavailable`` when ``LLM_MAX_WAITING_FOLLOWERS`` requests of
+    this process are already waiting.
+    """
+    slots = _follower_slots()
+    if not slots.acquire(blocking=False):
+        raise LLMUnavailable("Too many requests waiting for identical prompts")
+    try:
+        client = _redis()
+        deadline = time.monotonic() + _lease_seconds()
+        delay = POLL_INTERVAL_SECONDS
+        while True:
+            reply, running = _poll(key)
+            if not running:
+                return reply
+            if time.monotonic() >= deadline:
+                return None
+            if client is None:
+                time.sleep(delay)
+                delay = min(delay * 2, POLL_MAX_INTERVAL_SECONDS)
+            elif client.blpop([_done_key(key)], timeout=WAIT_SLICE_SECONDS):
+                reply, running = _poll(key)
+                if not running:
+                    _notify(key)  # pass the wake-up on to the next follower
+                    return reply
+    finally:
+        slots.release()
+
+
+def _complete_shared(provider: LLMProvider, key: str, messages: Messages) -> str:
+    if not _claim(key):
+        reply = _wait_for_leader(key)
+        if reply is not None:
+            logger.info("llm call coalesced across workers", extra={"key": key})
+            return reply
+        _claim(key)  # best effort; the previous leader is gone
+    try:
+        reply = provider.complete(messages)
+    except BaseException:
+        _release(key)
+        raise
+    _publish(key, reply)
+    return reply
+
+
+def complete_coalesced(provider: LLMProvider, messages: Messages) -> str:
+    """``provider.complete`` shared by identical concurrent prompts."""
+    key = prompt_key(provider, messages)
+    with _local_lock:
+        future = _local.get(key)
+        leader = future is None
+        if leader:
+            future = _local[key] = Future()
+    if not leader:
+        logger.info("llm call coalesced in worker", extra={"key": key})
+        return future.result()
+
+    try:
+        reply = _complete_shared(provider, key, messages)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(reply)
+        return reply
+    finally:
+        with _local_lock:
+            _local.pop(key, None)
+
+
+async def stream_coalesced(
+    provider: LLMProvider, messages: Messages
+) -> AsyncIterator[str]:
+    """``provider.stream`` for the leader; followers get the reply in one piece."""
+    key = prompt_key(provider, messages)
+    if not await sync_to_async(_claim)(key):
+        reply = await sync_to_async(_wait_for_leader, thread_sensitive=False)(key)
+        if reply is not None:
+            logger.info("llm stream coalesced", extra={"key": key})
+            yield reply
+            return
+        await sync_to_async(_claim)(key)
+
+    parts: list[str] = []
+    try:
+        async for delta in provider.stream(messages):
+            parts.append(delta)
+            yield delta
+    except BaseException:
+        await sync_to_async(_release)(key)
+        raise
+    await sync_to_async(_publish)(key, "".join(parts))
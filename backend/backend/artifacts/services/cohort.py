@@ -0,0 +1,97 @@
+"""Cohort (grade/track) level score aggregation with versioned caching."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from django.core.cache import cache
+from django.db.models import Avg, Count
+
+from backend.artifacts.graph import CACHE_TIMEOUT_SECONDS, get_subject_nodes
+from backend.artifacts.models import KazanimScore
+from backend.artifacts.services.scores import get_scores_version
+
+GROUP_BY_KAZANIM = "kazanim"
+GROUP_BY_KONU = "konu"
+GROUP_BY_CHOICES = (GROUP_BY_KAZANIM, GROUP_BY_KONU)
+
+logger = logging.getLogger(__name__)
+
+
+def _cohort_cache_key(
+    subject: str, grade: int, track: str | None, group_by: str, version: int
+) -> str:
+    return f"analytics-cohort:{subject}:v{version}:{grade}:{track or '-'}:{group_by}"
+
+
+def get_cohort_averages(
+    subject: str, grade: int, track: str | None, group_by: str = GROUP_BY_KAZANIM
+) -> dict[str, Any]:
+    """Average scores of every student in a grade/track, per kazanım or konu.
+
+    The aggregation runs as a single ``GROUP BY`` in the database; only one row
+    per group reaches Python. Results are cached until the subject's scores
+    version changes.
+    """
+    if group_by not in GROUP_BY_CHOICES:
+        raise ValueError(f"Unsupported group_by value: {group_by}")
+
+    version = get_scores_version(subject)
+    cache_key = _cohort_cache_key(subject, grade, track, group_by, version)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        logger.info("analytics-cohort cache hit", extra={"cache_key": cache_key})
+        return cached
+
+    queryset = KazanimScore.objects.filter(subject=subject, user__grade=grade)
+    if track:
+        queryset = queryset.filter(user__track=track)
+
+    if group_by == GROUP_BY_KONU:
+        rows = (
+            queryset.values("konu")
+            .annotate(average=Avg("score"), student_count=Count("user", distinct=True))
+            .order_by("konu")
+        )
+        items = [
+            {
+                "konu": row["konu"],
+                "label": row["konu"] or "-",
+                "average": round(row["average"], 2),
+                "student_count": row["student_count"],
+            }
+            for row in rows
+        ]
+    else:
+        rows = (
+            queryset.values("node_id")
+            .annotate(average=Avg("score"), student_count=Count("id"))
+            .order_by("node_id")
+        )
+        nodes = get_subject_nodes(subject)
+        items = [
+            {
+                "id": row["node_id"],
+                "label": (nodes.get(row["node_id"]) or {}).get("label")
+                or row["node_id"],
+                "average": round(row["average"], 2),
+                "student_count": row["student_count"],
+            }
+            for row in rows
+        ]
+
+    payload = {
+        "subject": subject,
+        "grade": grade,
+        "track": track,
+        "group_by": group_by,
+        "student_count": queryset.values("user").distinct().count(),
+        "items": items,
+    }
+    cache.set(cache_key, payload, CACHE_TIMEOUT_SECONDS)
+    logger.info(
+        "analytics-cohort cache miss — rebuilt",
+        extra={"cache_key": cache_key, "group_count": len(items)},
+    )
+    return payload
@@ -0,0 +1,215 @@
+"""Precomputed peer score distributions and percentile ranks."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Avg
+from django.utils import timezone
+
+from backend.artifacts.models import KazanimScore, ScoreDistribution
+
+BIN_COUNT = 100
+# Upper bin edges in the 0-100 score range; the last bin also holds 100.
+BIN_EDGES = tuple(100.0 * i / BIN_COUNT for i in range(1, BIN_COUNT))
+
+# (node id or konu label, previous score, new score); None means "no score".
+ScoreChange = tuple[str, float | None, float | None]
+
+
+def bin_index(score: float) -> int:
+    return bisect_right(BIN_EDGES, score)
+
+
+def percentile_rank(counts: list[int], total: int, score: float) -> float:
+    """Percentage of peers scoring below ``score`` (ties count as half)."""
+    if not total or not counts:
+        return 0.0
+    idx = bin_index(score)
+    below = sum(counts[:idx])
+    return round(100.0 * (below + 0.5 * counts[idx]) / total, 1)
+
+
+def konu_averages(user, subject: str, konular: Iterable[str]) -> dict[str, float]:
+    """Average score of a student per konu, computed with one GROUP BY."""
+    konular = [konu for konu in konular if konu]
+    if not konular:
+        return {}
+    rows = (
+        KazanimScore.objects.filter(user=user, subject=subject, konu__in=konular)
+        .values("konu")
+        .annotate(average=Avg("score"))
+        .values_list("konu", "average")
+    )
+    return dict(rows)
+
+
+def _apply_changes(
+    subject: str, scope: str, grade: int, track: str, changes: list[ScoreChange]
+) -> None:
+    changes = [change for change in changes if change[1] != change[2]]
+    if not changes:
+        return
+
+    keys = sorted({key for key, _, _ in changes})
+    lookup = {"subject": subject, "scope": scope, "grade": grade, "track": track}
+
+    def _locked_rows(selected_keys: list[str]) -> dict[str, ScoreDistribution]:
+        # Lock in a stable order so concurrent ingests cannot deadlock.
+        queryset = (
+            ScoreDistribution.objects.select_for_update()
+            .filter(key__in=selected_keys, **lookup)
+            .order_by("key")
+        )
+        return {row.key: row for row in queryset}
+
+    rows = _locked_rows(keys)
+    missing = [key for key in keys if key not in rows]
+    if missing:
+        ScoreDistribution.objects.bulk_create(
+            [
+                ScoreDistribution(key=key, counts=[0] * BIN_COUNT, **lookup)
+                for key in missing
+            ],
+            ignore_conflicts=True,
+        )
+        rows.update(_locked_rows(missing))
+
+    now = timezone.now()
+    for key, previous, current in changes:
+        row = rows[key]
+        counts = row.counts if len(row.counts) == BIN_COUNT else [0] * BIN_COUNT
+        if previous is not None:
+            idx = bin_index(previous)
+            if counts[idx] > 0:
+                counts[idx] -= 1
+                row.total = max(0, row.total - 1)
+        if current is not None:
+            counts[bin_index(current)] += 1
+            row.total += 1
+        row.counts = counts
+        row.updated_at = now
+
+    ScoreDistribution.objects.bulk_update(
+        list(rows.values()), ["counts", "total", "updated_at"]
+    )
+
+
+@transaction.atomic
+def record_score_changes(
+    user,
+    subject: str,
+    node_changes: list[ScoreChange],
+    konu_changes: list[ScoreChange],
+) -> None:
+    """Move a student's changed scores between bins of their cohort histograms.
+
+    Students without a grade do not belong to any cohort and are skipped.
+    """
+    if user.grade is None:
+        return
+    track = user.track or ""
+    _apply_changes(
+        subject, ScoreDistribution.SCOPE_KAZANIM, user.grade, track, node_changes
+    )
+    _apply_changes(
+        subject, ScoreDistribution.SCOPE_KONU, user.grade, track, konu_changes
+    )
+
+
+def get_student_rank(
+    user, subject: str, node_id: str | None = None, konu: str | None = None
+) -> dict[str, Any] | None:
+    """Percentile of a student among peers of the same grade and track.
+
+    Returns ``None`` when the student has no score for the requested node/konu.
+    """
+    if node_id:
+        scope, key = ScoreDistribution.SCOPE_KAZANIM, node_id
+        score = (
+            KazanimScore.objects.filter(user=user, subject=subject, node_id=node_id)
+            .values_list("score", flat=True)
+            .first()
+        )
+    else:
+        scope, key = ScoreDistribution.SCOPE_KONU, konu
+        score = konu_averages(user, subject, [konu]).get(konu)
+    if score is None:
+        return None
+
+    distribution = (
+        ScoreDistribution.objects.filter(
+            subject=subject,
+            scope=scope,
+            key=key,
+            grade=user.grade,
+            track=user.track or "",
+        )
+        .only("counts", "total")
+        .first()
+    )
+    counts = distribution.counts if distribution else []
+    total = distribution.total if distribution else 0
+    return {
+        "subject": subject,
+        "scope": scope,
+        "key": key,
+        "grade": user.grade,
+        "track": user.track,
+        "score": round(score, 2),
+        "percentile": percentile_rank(counts, total, score),
+        "peer_count": total,
+    }
+
+
+@transaction.atomic
+def rebuild_distributions(subject: str) -> int:
+    """Recompute every histogram of a subject from the stored scores.
+
+    Used for backfills and to reconcile students who changed grade or track.
+    Returns the number of distributions written.
+    """
+    histograms: dict[tuple[str, str, int, str], list[int]] = defaultdict(
+        lambda: [0] * BIN_COUNT
+    )
+    scores = KazanimScore.objects.filter(subject=subject, user__grade__isnull=False)
+
+    node_rows = scores.values_list(
+        "node_id", "user__grade", "user__track", "score"
+    ).iterator(chunk_size=2000)
+    for node_id, grade, track, score in node_rows:
+        key = (ScoreDistribution.SCOPE_KAZANIM, node_id, grade, track or "")
+        histograms[key][bin_index(score)] += 1
+
+    konu_rows = (
+        scores.exclude(konu="")
+        .values("user", "konu", "user__grade", "user__track")
+        .annotate(average=Avg("score"))
+        .values_list("konu", "user__grade", "user__track", "average")
+        .iterator(chunk_size=2000)
+    )
+    for konu, grade, track, average in konu_rows:
+        key = (ScoreDistribution.SCOPE_KONU, konu, grade, track or "")
+        histograms[key][bin_index(average)] += 1
+
+    ScoreDistribution.objects.filter(subject=subject).delete()
+    ScoreDistribution.objects.bulk_create(
+        [
+            ScoreDistribution(
+                subject=subject,
+                scope=scope,
+                key=key,
+                grade=grade,
+                track=track,
+                counts=counts,
+                total=sum(counts),
+            )
+            for (scope, key, grade, track), counts in histograms.items()
+        ],
+        batch_size=500,
+    )
+    return len(histograms)
@@ -0,0 +1,181 @@
+"""Bounded-memory export of kazanım scores to CSV and Parquet."""
+
+from __future__ import annotations
+
+import csv
+import io
+from collections.abc import AsyncIterator, Iterable, Iterator
+from itertools import islice
+from typing import Any
+
+from asgiref.sync import sync_to_async
+
+from backend.artifacts.graph import get_subject_nodes
+from backend.artifacts.models import KazanimScore
+
+# Parquet output is an optional extra (see requirements.txt); callers get a
+# RuntimeError from write_parquet when pyarrow is missing.
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except Exception:  # pragma: no cover - defensive import
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_COLUMNS = (
+    "user_id",
+    "email",
+    "name",
+    "grade",
+    "track",
+    "subject",
+    "konu",
+    "node_id",
+    "label",
+    "score",
+    "updated_at",
+)
+
+
+def iter_export_rows(
+    subject: str | None = None,
+    grade: int | None = None,
+    track: str | None = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[tuple[Any, ...]]:
+    """Yield one tuple per stored score, in ``EXPORT_COLUMNS`` order.
+
+    Rows are fetched with a server-side cursor in chunks and node labels are
+    joined from the cached curriculum graph, so memory use does not grow with
+    the number of students or kazanımlar exported.
+    """
+    queryset = KazanimScore.objects.order_by("pk")
+    if subject:
+        queryset = queryset.filter(subject=subject)
+    if grade:
+        queryset = queryset.filter(user__grade=grade)
+    if track:
+        queryset = queryset.filter(user__track=track)
+
+    labels: dict[str, dict[str, Any]] = {}
+    rows = queryset.values_list(
+        "user_id",
+        "user__email",
+        "user__name",
+        "user__grade",
+        "user__track",
+        "subject",
+        "konu",
+        "node_id",
+        "score",
+        "updated_at",
+    ).iterator(chunk_size=chunk_size)
+    for (
+        user_id,
+        email,
+        name,
+        grade_,
+        track_,
+        subject_,
+        konu,
+        node_id,
+        score,
+        ts,
+    ) in rows:
+        if subject_ not in labels:
+            try:
+                labels[subject_] = get_subject_nodes(subject_)
+            except FileNotFoundError:
+                labels[subject_] = {}
+        node = labels[subject_].get(node_id) or {}
+        yield (
+            str(user_id),
+            email,
+            name,
+            grade_,
+            track_ or "",
+            subject_,
+            konu,
+            node_id,
+            node.get("label") or node_id,
+            score,
+            ts.isoformat() if ts else "",
+        )
+
+
+def _chunked(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def iter_csv(
+    rows: Iterable[tuple], chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[str]:
+    """Render rows as CSV text, one string per chunk (header first)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue()
+    for chunk in _chunked(rows, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+
+
+async def aiter_csv(
+    rows: Iterable[tuple], chunk_size: int = EXPORT_CHUNK_SIZE
+) -> AsyncIterator[str]:
+    """Async counterpart of :func:`iter_csv` for responses served over ASGI.
+
+    Django buffers a sync iterator into a list before sending it on ASGI, so
+    each chunk is rendered on the sync thread instead and sent once it is
+    ready. The server-side cursor stays on the thread that opened it.
+    """
+    chunks = iter_csv(rows, chunk_size=chunk_size)
+    next_chunk = sync_to_async(next)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close)()
+
+
+def write_parquet(
+    rows: Iterable[tuple], destination, row_group_size: int = EXPORT_CHUNK_SIZE
+) -> int:
+    """Write rows to a Parquet file, one row group per chunk.
+
+    Raises ``RuntimeError`` when pyarrow is not installed. Returns the number
+    of rows written.
+    """
+    if pa is None or pq is None:
+        raise RuntimeError("Parquet export requires the 'pyarrow' package.")
+
+    schema = pa.schema(
+        [
+            ("user_id", pa.string()),
+            ("email", pa.string()),
+            ("name", pa.string()),
+            ("grade", pa.int16()),
+            ("track", pa.string()),
+            ("subject", pa.string()),
+            ("konu", pa.string()),
+            ("node_id", pa.string()),
+            ("label", pa.string()),
+            ("score", pa.float64()),
+            ("updated_at", pa.string()),
+        ]
+    )
+    written = 0
+    with pq.ParquetWriter(destination, schema) as writer:
+        for chunk in _chunked(rows, row_group_size):
+            arrays = [
+                pa.array(column, type=field.type)
+                for column, field in zip(zip(*chunk), schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            written += len(chunk)
+    return written
@@ -0,0 +1,153 @@
+"""Per-student weakest/strongest kazanımlar across all subjects (top-k)."""
+
+from __future__ import annotations
+
+import heapq
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from django.core.cache import cache
+from django.db import transaction
+
+from backend.artifacts.graph import get_subject_nodes
+from backend.artifacts.models import KazanimScore
+
+FOCUS_HEAP_SIZE = 10  # entries kept per side; endpoints may ask for fewer
+FOCUS_CACHE_TIMEOUT = 60 * 60 * 24
+FocusEntry = dict[str, Any]
+
+logger = logging.getLogger(__name__)
+
+
+def _focus_cache_key(user_id) -> str:
+    return f"analytics-focus:{user_id}"
+
+
+def _entry(subject: str, node_id: str, score: float, labels: dict) -> FocusEntry:
+    if subject not in labels:
+        try:
+            labels[subject] = get_subject_nodes(subject)
+        except FileNotFoundError:
+            labels[subject] = {}
+    node = labels[subject].get(node_id) or {}
+    return {
+        "subject": subject,
+        "node_id": node_id,
+        "label": node.get("label") or node_id,
+        "konu": node.get("konu") or "",
+        "score": score,
+    }
+
+
+def _score(entry: FocusEntry) -> float:
+    return entry["score"]
+
+
+def _build_focus(user) -> dict[str, Any]:
+    labels: dict[str, dict] = {}
+    scores = KazanimScore.objects.filter(user=user).values_list(
+        "subject", "node_id", "score"
+    )
+    weakest = scores.order_by("score", "pk")[:FOCUS_HEAP_SIZE]
+    strongest = scores.order_by("-score", "pk")[:FOCUS_HEAP_SIZE]
+    return {
+        "weakest": [_entry(*row, labels) for row in weakest],
+        "strongest": [_entry(*row, labels) for row in strongest],
+    }
+
+
+def get_focus(user, k: int = 5) -> dict[str, list[FocusEntry]]:
+    """Return the ``k`` weakest and strongest kazanımlar of a student.
+
+    Served from the cached bounded lists; the database is only queried (two
+    ``LIMIT`` queries) when the cache entry is missing.
+    """
+    cache_key = _focus_cache_key(user.pk)
+    focus = cache.get(cache_key)
+    if focus is None:
+        focus = _build_focus(user)
+        cache.set(cache_key, focus, FOCUS_CACHE_TIMEOUT)
+        logger.info("analytics-focus cache miss — rebuilt", extra={"user": user.pk})
+    return {"weakest": focus["weakest"][:k], "strongest": focus["strongest"][:k]}
+
+
+def _merge(
+    entries: list[FocusEntry], changed: list[FocusEntry], weakest: bool
+) -> list[FocusEntry] | None:
+    """Merge changed scores into a bounded list, or ``None`` if it must be rebuilt.
+
+    A kept entry that moves away from the list's end (a weak node improving, a
+    strong node dropping) may have to be replaced by a node that is not in the
+    list; only a full list can be missing such candidates.
+    """
+    merged = {(e["subject"], e["node_id"]): e for e in entries}
+    full = len(entries) >= FOCUS_HEAP_SIZE
+    for entry in changed:
+        key = (entry["subject"], entry["node_id"])
+        kept = merged.get(key)
+        if kept is not None and full:
+            moved_out = (
+                entry["score"] > kept["score"]
+                if weakest
+                else entry["score"] < kept["score"]
+            )
+            if moved_out:
+                return None
+        merged[key] = entry
+    select = heapq.nsmallest if weakest else heapq.nlargest
+    return select(FOCUS_HEAP_SIZE, merged.values(), key=_score)
+
+
+def refresh_focus(user, subject: str, scores: Iterable[tuple[str, float]]) -> None:
+    """Fold freshly ingested ``(node_id, score)`` pairs into the cached lists.
+
+    The read-modify-write runs under a lock on the user row, and the scores are
+    re-read inside it, so refreshes racing for one student apply one after the
+    other with the committed values whatever order they run in.
+    """
+    cache_key = _focus_cache_key(user.pk)
+    node_ids = [node_id for node_id, _ in scores]
+    with transaction.atomic():
+        list(
+            type(user)
+            .objects.select_for_update()
+            .filter(pk=user.pk)
+            .values_list("pk", flat=True)
+        )
+        focus = cache.get(cache_key)
+        if focus is None:
+            return  # built lazily on the next read
+
+        current = KazanimScore.objects.filter(
+            user=user, subject=subject, node_id__in=node_ids
+        ).values_list("node_id", "score")
+        labels: dict[str, dict] = {}
+        changed = [
+            _entry(subject, node_id, score, labels) for node_id, score in current
+        ]
+        weakest = _merge(focus["weakest"], changed, weakest=True)
+        strongest = _merge(focus["strongest"], changed, weakest=False)
+        if weakest is None or strongest is None:
+            cache.delete(cache_key)
+            return
+        cache.set(
+            cache_key,
+            {"weakest": weakest, "strongest": strongest},
+            FOCUS_CACHE_TIMEOUT,
+        )
+
+
+def focus_to_text(focus: dict[str, list[FocusEntry]]) -> str:
+    def _fmt(entries: list[FocusEntry]) -> str:
+        if not entries:
+            return "-"
+        return ", ".join(
+            f"{e['label']} ({e['subject']}, başarı: {e['score']:.2f})" for e in entries
+        )
+
+    return (
+        "Öğrencinin tüm derslerdeki durumu:\n"
+        f"- En zayıf kazanımları: {_fmt(focus.get('weakest', []))}\n"
+        f"- En güçlü kazanımları: {_fmt(focus.get('strongest', []))}\n"
+    )
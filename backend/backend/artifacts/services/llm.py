@@ -0,0 +1,341 @@
+"""Chat LLM providers with bounded concurrency, timeouts and hedged retries."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+import weakref
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from backend.artifacts.services.chat_history import QUESTION_PREFIX
+
+# Groq (and its httpx dependency) is optional; without it only the stub works
+try:
+    import groq  # type: ignore
+    import httpx  # type: ignore
+except Exception:  # pragma: no cover - defensive import
+    groq = None  # type: ignore[assignment]
+    httpx = None  # type: ignore[assignment]
+
+CHAT_COMPLETION_OPTIONS = {"temperature": 0.4, "top_p": 0.9, "max_tokens": 500}
+
+Messages = list[dict[str, Any]]
+
+logger = logging.getLogger(__name__)
+
+
+class LLMError(Exception):
+    """The provider failed or timed out after all allowed attempts."""
+
+
+class LLMUnavailable(LLMError):
+    """Every provider slot of this worker stayed busy for the queue timeout."""
+
+
+class RetryBudget:
+    """Allow retries/hedges for at most ``ratio`` of the requests.
+
+    Each request deposits ``ratio`` tokens (capped at ``max_tokens``); a retry
+    spends one. A slow or failing provider therefore sees at most
+    ``1 + ratio`` times the normal load instead of ``max_attempts`` times.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class LLMProvider:
+    """Base class: concurrency slots shared by sync and async callers.
+
+    ``max_concurrency`` bounds in-flight provider calls per worker process;
+    callers that cannot get a slot within ``queue_timeout`` seconds get
+    ``LLMUnavailable`` instead of piling up behind a slow provider.
+    """
+
+    name = "base"
+
+    def __init__(self, max_concurrency: int = 8, queue_timeout: float = 5.0):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    @contextmanager
+    def _slot(self):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise LLMUnavailable("LLM provider is saturated")
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def _async_slot(self):
+        # Same semaphore as ``_slot``: one bound for sync and async callers.
+        # A busy provider is waited for on a thread so the event loop is free.
+        if not self._slots.acquire(blocking=False):
+            waiter = asyncio.ensure_future(
+                sync_to_async(self._slots.acquire, thread_sensitive=False)(
+                    timeout=self.queue_timeout
+                )
+            )
+            try:
+                acquired = await asyncio.shield(waiter)
+            except asyncio.CancelledError:
+                # The thread may still get the slot after the caller is gone.
+                waiter.add_done_callback(self._release_abandoned)
+                raise
+            if not acquired:
+                raise LLMUnavailable("LLM provider is saturated")
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def _release_abandoned(self, waiter: asyncio.Future) -> None:
+        if not waiter.cancelled() and waiter.exception() is None and waiter.result():
+            self._slots.release()
+
+    def complete(self, messages: Messages) -> str:
+        with self._slot():
+            return self._complete(messages)
+
+    async def stream(self, messages: Messages) -> AsyncIterator[str]:
+        async with self._async_slot():
+            async for delta in self._stream(messages):
+                yield delta
+
+    def _complete(self, messages: Messages) -> str:
+        raise NotImplementedError
+
+    def _stream(self, messages: Messages) -> AsyncIterator[str]:
+        raise NotImplementedError
+
+
+class StubProvider(LLMProvider):
+    """Offline provider with deterministic replies derived from the prompt.
+
+    ``delay`` simulates provider latency (spread over the streamed words), so
+    load tests can exercise the concurrency limits without network access.
+    """
+
+    name = "stub"
+
+    def __init__(self, delay: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+
+    @staticmethod
+    def reply_for(messages: Messages) -> str:
+        digest = hashlib.sha1(
+            json.dumps(messages, sort_keys=True, ensure_ascii=False).encode()
+        ).hexdigest()[:8]
+        question = next(
+            (m["content"] for m in reversed(messages) if m["role"] == "user"), ""
+        ).rsplit(QUESTION_PREFIX, 1)[-1]
+        question = " ".join(question.split())[:80]
+        return (
+            f"[stub {digest}] “{question}” sorusu için önce en zayıf "
+            "kazanımlarını tekrar etmeni, sonra kısa testlerle ilerlemeni öneririm."
+        )
+
+    def _complete(self, messages: Messages) -> str:
+        if self.delay:
+            time.sleep(self.delay)
+        return self.reply_for(messages)
+
+    async def _stream(self, messages: Messages) -> AsyncIterator[str]:
+        words = self.reply_for(messages).split(" ")
+        for index, word in enumerate(words):
+            if self.delay:
+                await asyncio.sleep(self.delay / len(words))
+            yield word if index == 0 else " " + word
+
+
+class GroqProvider(LLMProvider):
+    """Groq chat completions over pooled keep-alive connections.
+
+    Non-streaming calls are hedged: if no answer arrived after ``hedge_after``
+    seconds (or the attempt failed with a retryable error) another attempt is
+    started and the first successful one wins, up to ``max_attempts`` and
+    within the shared ``RetryBudget``. Streams are only retried when they fail
+    before the first token.
+    """
+
+    name = "groq"
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "llama-3.3-70b-versatile",
+        base_url: str | None = None,
+        timeout: float = 30.0,
+        hedge_after: float | None = 8.0,
+        max_attempts: int = 2,
+        **kwargs,
+    ):
+        if groq is None:
+            raise RuntimeError("The Groq provider requires the 'groq' package.")
+        super().__init__(**kwargs)
+        self.model = model
+        self.hedge_after = hedge_after
+        self.max_attempts = max(1, max_attempts)
+        self.budget = RetryBudget()
+        self._client_options = {
+            "api_key": api_key,
+            "base_url": base_url,
+            "timeout": httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+            "max_retries": 0,  # retries are handled (and budgeted) here
+        }
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency * self.max_attempts,
+            max_keepalive_connections=self.max_concurrency,
+        )
+        self._limits = limits
+        self._client = groq.Groq(
+            http_client=httpx.Client(limits=limits), **self._client_options
+        )
+        self._async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency * self.max_attempts,
+            thread_name_prefix="llm-hedge",
+        )
+
+    def _async_client(self):
+        # httpx async pools are bound to the event loop that created them
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = groq.AsyncGroq(
+                http_client=httpx.AsyncClient(limits=self._limits),
+                **self._client_options,
+            )
+        return client
+
+    @staticmethod
+    def _retryable(exc: BaseException) -> bool:
+        if isinstance(exc, groq.APIConnectionError):  # includes timeouts
+            return True
+        return isinstance(exc, groq.APIStatusError) and exc.status_code >= 500
+
+    def _complete_once(self, messages: Messages) -> str:
+        response = self._client.chat.completions.create(
+            model=self.model, messages=messages, **CHAT_COMPLETION_OPTIONS
+        )
+        return response.choices[0].message.content or ""
+
+    def _complete(self, messages: Messages) -> str:
+        self.budget.deposit()
+        return self._hedged(lambda: self._complete_once(messages))
+
+    def _hedged(self, call: Callable[[], str]) -> str:
+        pending = {self._executor.submit(call)}
+        attempts, error = 1, None
+        while pending:
+            can_spawn = attempts < self.max_attempts
+            done, pending = wait(
+                pending,
+                timeout=self.hedge_after if can_spawn else None,
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as exc:
+                    error = exc
+            # Nothing succeeded yet: a slow attempt (hedge) or a failed one (retry)
+            failed = bool(done)
+            if not can_spawn or (failed and not self._retryable(error)):
+                continue
+            if (failed or self.hedge_after is not None) and self.budget.spend():
+                logger.info(
+                    "llm %s attempt %d", "retry" if failed else "hedge", attempts + 1
+                )
+                pending.add(self._executor.submit(call))
+                attempts += 1
+        raise LLMError(str(error)) from error
+
+    async def _stream(self, messages: Messages) -> AsyncIterator[str]:
+        self.budget.deposit()
+        client = self._async_client()
+        for attempt in range(1, self.max_attempts + 1):
+            started = False
+            try:
+                stream = await client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    stream=True,
+                    **CHAT_COMPLETION_OPTIONS,
+                )
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        started = True
+                        yield delta
+                return
+            except Exception as exc:
+                if (
+                    started
+                    or attempt == self.max_attempts
+                    or not self._retryable(exc)
+                    or not self.budget.spend()
+                ):
+                    raise LLMError(str(exc)) from exc
+                logger.info("llm stream retry attempt %d", attempt + 1)
+
+
+_provider: LLMProvider | None = None
+_provider_lock = threading.Lock()
+
+
+def build_llm_provider() -> LLMProvider | None:
+    """Provider configured by the ``LLM_*`` settings, or ``None`` if disabled."""
+    limits = {
+        "max_concurrency": settings.LLM_MAX_CONCURRENCY,
+        "queue_timeout": settings.LLM_QUEUE_TIMEOUT_SECONDS,
+    }
+    if settings.LLM_PROVIDER == "stub":
+        return StubProvider(delay=settings.LLM_STUB_DELAY_SECONDS, **limits)
+    if settings.LLM_PROVIDER != "groq" or groq is None or not settings.GROQ_API_KEY:
+        return None
+    return GroqProvider(
+        api_key=settings.GROQ_API_KEY,
+        model=settings.LLM_MODEL,
+        timeout=settings.LLM_TIMEOUT_SECONDS,
+        hedge_after=settings.LLM_HEDGE_AFTER_SECONDS or None,
+        max_attempts=settings.LLM_MAX_ATTEMPTS,
+        **limits,
+    )
+
+
+def get_llm_provider() -> LLMProvider | None:
+    """Process-wide provider, so slots and connection pools are shared."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = build_llm_provider()
+    return _provider
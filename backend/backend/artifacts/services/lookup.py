@@ -0,0 +1,62 @@
+"""Batch lookup of curriculum nodes and student scores by id."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from backend.artifacts.graph import get_subject_nodes
+from backend.artifacts.models import KazanimScore
+
+LOOKUP_MAX_IDS = 5000
+
+
+def lookup_nodes(
+    ids_by_subject: Mapping[str, Sequence[str]], user=None
+) -> dict[str, Any]:
+    """Return label, konu, curriculum success and the student's score per id.
+
+    Every id is resolved with a dict lookup on the per-version node map, and the
+    student's scores are fetched with one indexed query per subject, so the work
+    is proportional to the number of requested ids.
+    Unknown subjects or ids are reported under ``missing``.
+    """
+    results: dict[str, dict[str, Any]] = {}
+    missing: dict[str, list[str]] = {}
+    for subject, ids in ids_by_subject.items():
+        try:
+            nodes = get_subject_nodes(subject)
+        except FileNotFoundError:
+            missing[subject] = list(ids)
+            continue
+
+        found = [node_id for node_id in dict.fromkeys(ids) if node_id in nodes]
+        absent = [node_id for node_id in ids if node_id not in nodes]
+        if absent:
+            missing[subject] = absent
+
+        scores: dict[str, float] = {}
+        if user is not None and user.is_authenticated and found:
+            scores = dict(
+                KazanimScore.objects.filter(
+                    user=user, subject=subject, node_id__in=found
+                ).values_list("node_id", "score")
+            )
+
+        subject_results = {}
+        for node_id in found:
+            node = nodes[node_id]
+            try:
+                success = float(node.get("basari_puani") or 0)
+            except (TypeError, ValueError):
+                success = 0.0
+            subject_results[node_id] = {
+                "label": node.get("label") or node_id,
+                "type": node.get("type"),
+                "konu": node.get("konu") or "",
+                "success": max(0.0, min(100.0, success)),
+                "score": scores.get(node_id),
+            }
+        results[subject] = subject_results
+
+    return {"results": results, "missing": missing}
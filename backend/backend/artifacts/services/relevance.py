@@ -0,0 +1,174 @@
+"""Inverted index over kazanım texts for question-relevant chat context."""
+
+from __future__ import annotations
+
+import heapq
+import html
+import math
+import re
+from collections.abc import Collection, Iterable
+from pathlib import Path
+from typing import Any
+
+from backend.artifacts.graph import (
+    curriculum_file_signature,
+    get_cached_graph_data,
+    resolve_curriculum_file,
+)
+from backend.artifacts.models import KazanimScore
+
+RELEVANT_NODE_LIMIT = 6
+MIN_STEM_LENGTH = 4
+STEM_PREFIX_LENGTH = 5  # fixed-prefix stems work well for Turkish retrieval
+KONU_WEIGHT = 0.5  # a konu match is weaker evidence than a kazanım text match
+
+_FOLD = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+_WORD_RE = re.compile(r"\w+")
+_BASLIK_RE = re.compile(r"<b>(.*?)</b>")
+_SUFFIXES = sorted(
+    (
+        "lerinden larindan lerinde larinda leri lari ler lar inden indan inde "
+        "inda nden ndan nde nda den dan ten tan de da te ta nin nun in un yi yu "
+        "ye ya si su i u e a"
+    ).split(),
+    key=len,
+    reverse=True,
+)
+_STOPWORDS = frozenset(
+    "ve veya ile ya bir bu su o icin nasil ne neden nedir niye mi mu da de "
+    "gibi daha cok en hangi ben beni bana benim sen sana senin biz nerede "
+    "kadar sonra once ama fakat her bazi".split()
+)
+
+# Per-process indexes keyed by curriculum file path -> (file signature, index)
+_INDEXES: dict[str, tuple[str, KazanimIndex]] = {}
+
+
+def fold_turkish(text: str) -> str:
+    """Lower-case with Turkish İ/I rules, then drop diacritics.
+
+    Students often type without Turkish characters ("olasilik"), so both the
+    index and the queries are folded to plain ASCII letters.
+    """
+    text = str(text).replace("İ", "i").replace("I", "ı").lower()
+    return text.translate(_FOLD)
+
+
+def stem(token: str) -> str:
+    """Strip inflectional suffixes, then keep a fixed-length prefix."""
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in _SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+                token = token[: -len(suffix)]
+                stripped = True
+                break
+    return token[:STEM_PREFIX_LENGTH]
+
+
+def stems(text: str) -> list[str]:
+    return [
+        stem(word)
+        for word in _WORD_RE.findall(fold_turkish(text))
+        if len(word) >= 3 and word not in _STOPWORDS and not word.isdigit()
+    ]
+
+
+def node_baslik(node: dict[str, Any]) -> str:
+    """Full kazanım text; ``label`` is trimmed, the tooltip keeps the whole one."""
+    match = _BASLIK_RE.search(node.get("title") or "")
+    return html.unescape(match.group(1)) if match else node.get("label") or ""
+
+
+class KazanimIndex:
+    """Stem -> ``{node_id: weight}`` postings over the kazanım nodes of a file."""
+
+    def __init__(self, nodes: Iterable[dict[str, Any]]):
+        self.nodes: dict[str, dict[str, Any]] = {}
+        self.postings: dict[str, dict[str, float]] = {}
+        for node in nodes:
+            if (node.get("type") or node.get("node_type")) != "kazanım":
+                continue
+            node_id = str(node["id"])
+            self.nodes[node_id] = node
+            text = f"{node.get('label') or ''} {node_baslik(node)}"
+            weights = dict.fromkeys(stems(node.get("konu") or ""), KONU_WEIGHT)
+            weights.update(dict.fromkeys(stems(text), 1.0))
+            for token, weight in weights.items():
+                self.postings.setdefault(token, {})[node_id] = weight
+        count = len(self.nodes) or 1
+        self.idf = {
+            token: math.log(1 + count / len(posting))
+            for token, posting in self.postings.items()
+        }
+
+    def search(
+        self,
+        question: str,
+        limit: int = RELEVANT_NODE_LIMIT,
+        allowed: Collection[str] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Best ``(node_id, relevance)`` pairs, optionally within ``allowed`` ids."""
+        scores: dict[str, float] = {}
+        for token in set(stems(question)):
+            idf = self.idf.get(token)
+            if idf is None:
+                continue
+            for node_id, weight in self.postings[token].items():
+                if allowed is None or node_id in allowed:
+                    scores[node_id] = scores.get(node_id, 0.0) + weight * idf
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+
+def get_kazanim_index(subject: str | None, file: str | None = None) -> KazanimIndex:
+    """Index of a curriculum file, rebuilt only when the file version changes.
+
+    Raises ``FileNotFoundError`` for unknown subjects or files.
+    """
+    data_file = resolve_curriculum_file(subject, file)
+    signature = curriculum_file_signature(Path(data_file))
+    cached = _INDEXES.get(str(data_file))
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    nodes, _ = get_cached_graph_data(str(data_file))
+    index = KazanimIndex(nodes)
+    _INDEXES[str(data_file)] = (signature, index)
+    return index
+
+
+def relevant_nodes(
+    question: str,
+    subject: str | None,
+    file: str | None = None,
+    allowed: Collection[str] | None = None,
+    user=None,
+    limit: int = RELEVANT_NODE_LIMIT,
+) -> list[dict[str, Any]]:
+    """Kazanımlar matching ``question`` with curriculum and student scores."""
+    index = get_kazanim_index(subject, file)
+    hits = index.search(question, limit, allowed)
+    if not hits:
+        return []
+
+    scores: dict[str, float] = {}
+    if user is not None and user.is_authenticated:
+        scores = dict(
+            KazanimScore.objects.filter(
+                user=user,
+                subject=subject or "matematik",
+                node_id__in=[node_id for node_id, _ in hits],
+            ).values_list("node_id", "score")
+        )
+    return [
+        {
+            "node_id": node_id,
+            "label": node_baslik(index.nodes[node_id]),
+            "konu": index.nodes[node_id].get("konu") or "",
+            "success": index.nodes[node_id].get("basari_puani") or 0,
+            "score": scores.get(node_id),
+            "relevance": relevance,
+        }
+        for node_id, relevance in hits
+    ]
@@ -0,0 +1,108 @@
+"""Ingestion of per-student kazanım scores and analytics cache versioning."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Mapping
+
+from django.core.cache import cache
+from django.db import transaction
+
+from backend.artifacts.graph import get_subject_nodes
+from backend.artifacts.models import KazanimScore
+from backend.artifacts.services.distributions import konu_averages, record_score_changes
+from backend.artifacts.services.focus import refresh_focus
+
+SCORES_VERSION_KEY = "analytics:scores-version:{subject}"
+
+
+def get_scores_version(subject: str) -> int:
+    """Return the current analytics version for a subject.
+
+    Derived analytics (cohort averages, distributions, ...) embed this number in
+    their cache keys, so bumping it invalidates all of them at once.
+    """
+    key = SCORES_VERSION_KEY.format(subject=subject)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), None)
+        version = cache.get(key) or 1
+    return int(version)
+
+
+def _initial_version() -> int:
+    # Time based so a re-created (evicted) counter never reuses an old version.
+    return int(time.time() * 1000)
+
+
+def bump_scores_version(subject: str) -> int:
+    key = SCORES_VERSION_KEY.format(subject=subject)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _initial_version()
+        cache.set(key, version, None)
+        return version
+
+
+@transaction.atomic
+def ingest_scores(
+    user, subject: str, scores: Mapping[str, float]
+) -> list[KazanimScore]:
+    """Upsert a student's scores for the given subject's nodes.
+
+    Unknown node ids raise ``ValueError``; the konu of every node is copied from
+    the curriculum graph so cohort queries can group by it in SQL. The peer
+    score distributions are moved along in the same transaction.
+    """
+    nodes = get_subject_nodes(subject)
+    unknown = sorted(node_id for node_id in scores if node_id not in nodes)
+    if unknown:
+        raise ValueError(f"Unknown curriculum node ids: {', '.join(unknown[:10])}")
+
+    rows = [
+        KazanimScore(
+            user=user,
+            subject=subject,
+            node_id=node_id,
+            konu=str(nodes[node_id].get("konu") or ""),
+            score=max(0.0, min(100.0, float(score))),
+        )
+        for node_id, score in scores.items()
+    ]
+    # Concurrent submissions of one student must not compute their deltas
+    # against the same baseline. Row locks only cover scores that already
+    # exist, so the user row is locked first to serialize first submissions.
+    list(
+        type(user)
+        .objects.select_for_update()
+        .filter(pk=user.pk)
+        .values_list("pk", flat=True)
+    )
+    previous = dict(
+        KazanimScore.objects.select_for_update()
+        .filter(user=user, subject=subject, node_id__in=list(scores))
+        .values_list("node_id", "score")
+    )
+    konular = {row.konu for row in rows if row.konu}
+    previous_konu = konu_averages(user, subject, konular)
+
+    KazanimScore.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["user", "subject", "node_id"],
+        update_fields=["konu", "score", "updated_at"],
+    )
+
+    current_konu = konu_averages(user, subject, konular)
+    record_score_changes(
+        user,
+        subject,
+        [(row.node_id, previous.get(row.node_id), row.score) for row in rows],
+        [(konu, previous_konu.get(konu), current_konu.get(konu)) for konu in konular],
+    )
+    transaction.on_commit(lambda: bump_scores_version(subject))
+    transaction.on_commit(
+        lambda: refresh_focus(user, subject, [(r.node_id, r.score) for r in rows])
+    )
+    return rows
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Local OpenAI-compatible chat completion server used by the chat tests."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubLLMServer:
+    """Serve canned completions on ``/openai/v1/chat/completions``.
+
+    Streamed requests receive ``chunks`` as separate SSE deltas; plain requests
+    receive them joined into one message. Request bodies are kept in
+    ``requests``; ``status`` simulates provider failures and ``delays`` (one
+    entry per upcoming request, in seconds) slow requests down.
+    """
+
+    def __init__(self, chunks=("Merhaba", ", ", "dünya!")):
+        self.chunks = list(chunks)
+        self.status = 200
+        self.delays = []
+        self.requests = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def provider(self, **kwargs):
+        from backend.artifacts.services.llm import GroqProvider
+
+        kwargs.setdefault("hedge_after", None)
+        return GroqProvider(api_key="test", base_url=self.base_url, **kwargs)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):  # keep test output quiet
+                pass
+
+            def _json(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                stub.requests.append(payload)
+                if stub.delays:
+                    time.sleep(stub.delays.pop(0))
+                if stub.status != 200:
+                    self._json(stub.status, {"error": {"message": "stub failure"}})
+                    return
+                if not payload.get("stream"):
+                    self._json(
+                        200,
+                        {
+                            "id": "stub",
+                            "object": "chat.completion",
+                            "created": 0,
+                            "model": payload.get("model", "stub"),
+                            "choices": [
+                                {
+                                    "index": 0,
+                                    "message": {
+                                        "role": "assistant",
+                                        "content": "".join(stub.chunks),
+                                    },
+                                    "finish_reason": "stop",
+                                }
+                            ],
+                        },
+                    )
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                for text in stub.chunks:
+                    chunk = {
+                        "id": "stub",
+                        "object": "chat.completion.chunk",
+                        "created": 0,
+                        "model": payload.get("model", "stub"),
+                        "choices": [
+                            {
+                                "index": 0,
+                                "delta": {"content": text},
+                                "finish_reason": None,
+                            }
+                        ],
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+        return Handler
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Tests for score ingestion and cohort-level analytics."""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from backend.artifacts.models import KazanimScore
+
+
+class CohortAnalyticsAPITest(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.students = [
+            User.objects.create_user(
+                email=f"student{i}@example.com",
+                name=f"Student {i}",
+                password="StrongPass123!",
+                is_active=True,
+                grade=10,
+                track="sayisal",
+            )
+            for i in range(3)
+        ]
+        self.other = User.objects.create_user(
+            email="other@example.com",
+            name="Other",
+            password="StrongPass123!",
+            is_active=True,
+            grade=11,
+            track="sayisal",
+        )
+
+    def _headers(self, user):
+        token, _ = Token.objects.get_or_create(user=user)
+        return {"HTTP_AUTHORIZATION": f"Token {token.key}"}
+
+    def _ingest(self, user, scores, subject="matematik"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                reverse("artifacts:analytics-scores"),
+                {"subject": subject, "scores": scores},
+                content_type="application/json",
+                **self._headers(user),
+            )
+
+    def test_ingest_upserts_scores_with_konu(self):
+        resp = self._ingest(self.students[0], {"kznm_9_1_1_1": 40})
+        self.assertEqual(resp.status_code, 200)
+        resp = self._ingest(self.students[0], {"kznm_9_1_1_1": 70})
+        self.assertEqual(resp.status_code, 200)
+
+        row = KazanimScore.objects.get(user=self.students[0])
+        self.assertEqual(row.score, 70)
+        self.assertEqual(row.konu, "SAYILAR VE CEBİR")
+
+    def test_ingest_rejects_unknown_nodes(self):
+        resp = self._ingest(self.students[0], {"does-not-exist": 50})
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(KazanimScore.objects.exists())
+
+    def test_cohort_averages_per_kazanim_and_konu(self):
+        for student, value in zip(self.students, (30, 60, 90)):
+            self._ingest(student, {"kznm_9_1_1_1": value, "kznm_9_4_1_1": 50})
+        self._ingest(self.other, {"kznm_9_1_1_1": 0})
+
+        url = reverse("artifacts:analytics-cohort")
+        resp = self.client.get(
+            url, {"subject": "matematik"}, **self._headers(self.students[0])
+        )
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual((data["grade"], data["track"]), (10, "sayisal"))
+        self.assertEqual(data["student_count"], 3)
+        by_id = {item["id"]: item for item in data["items"]}
+        self.assertEqual(by_id["kznm_9_1_1_1"]["average"], 60)
+        self.assertEqual(by_id["kznm_9_1_1_1"]["student_count"], 3)
+
+        resp = self.client.get(
+            url,
+            {"subject": "matematik", "group_by": "konu"},
+            **self._headers(self.students[0]),
+        )
+        by_konu = {item["konu"]: item for item in resp.json()["items"]}
+        self.assertEqual(by_konu["GEOMETRİ"]["average"], 50)
+        self.assertEqual(by_konu["SAYILAR VE CEBİR"]["student_count"], 3)
+
+    def test_cohort_cache_is_invalidated_on_ingest(self):
+        self._ingest(self.students[0], {"kznm_9_1_1_1": 20})
+        url = reverse("artifacts:analytics-cohort")
+        headers = self._headers(self.students[1])
+
+        with self.assertNumQueries(3):  # token auth + aggregation + cohort size
+            first = self.client.get(url, {"subject": "matematik"}, **headers).json()
+        with self.assertNumQueries(0):  # token and payload both served from cache
+            self.client.get(url, {"subject": "matematik"}, **headers)
+
+        self._ingest(self.students[1], {"kznm_9_1_1_1": 80})
+        second = self.client.get(url, {"subject": "matematik"}, **headers).json()
+        self.assertEqual(first["items"][0]["average"], 20)
+        self.assertEqual(second["items"][0]["average"], 50)
+
+    def test_cohort_requires_authentication(self):
+        resp = self.client.get(reverse("artifacts:analytics-cohort"))
+        self.assertEqual(resp.status_code, 401)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""Tests for streaming analytics exports."""
+
+import csv
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from backend.artifacts.services import export
+from backend.artifacts.services.scores import ingest_scores
+
+
+class AnalyticsExportTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.staff = User.objects.create_user(
+            email="teacher@example.com",
+            name="Teacher",
+            password="StrongPass123!",
+            is_active=True,
+            is_staff=True,
+        )
+        for i in range(3):
+            student = User.objects.create_user(
+                email=f"export{i}@example.com",
+                name=f"Export {i}",
+                password="StrongPass123!",
+                is_active=True,
+                grade=10,
+                track="sayisal",
+            )
+            ingest_scores(
+                student, "matematik", {"kznm_9_1_1_1": 10 * i, "kznm_9_4_1_1": 50}
+            )
+
+    def _get(self, user, **params):
+        token, _ = Token.objects.get_or_create(user=user)
+        return self.client.get(
+            reverse("artifacts:analytics-export"),
+            params,
+            HTTP_AUTHORIZATION=f"Token {token.key}",
+        )
+
+    def test_csv_export_streams_rows_with_labels(self):
+        resp = self._get(self.staff, subject="matematik")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        body = b"".join(resp.streaming_content).decode("utf-8")
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(tuple(rows[0].keys()), export.EXPORT_COLUMNS)
+        first = next(r for r in rows if r["node_id"] == "kznm_9_1_1_1")
+        self.assertEqual(first["konu"], "SAYILAR VE CEBİR")
+        self.assertNotEqual(first["label"], first["node_id"])
+
+    async def test_asgi_export_streams_asynchronously(self):
+        token, _ = await Token.objects.aget_or_create(user=self.staff)
+        resp = await self.async_client.get(
+            reverse("artifacts:analytics-export"),
+            {"subject": "matematik"},
+            headers={"authorization": f"Token {token.key}"},
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.is_async)
+        body = b"".join([chunk async for chunk in resp.streaming_content])
+        rows = list(csv.DictReader(io.StringIO(body.decode("utf-8"))))
+        self.assertEqual(len(rows), 6)
+
+    def test_filename_is_sanitized(self):
+        resp = self._get(self.staff, subject='Türkçe"\r\nSet-Cookie: x=1')
+        self.assertEqual(resp.status_code, 200)
+        disposition = resp["Content-Disposition"]
+        self.assertRegex(
+            disposition,
+            r'^attachment; filename="kazanim-scores-turkce-set-cookie-x1-[\d-]+\.csv"$',
+        )
+        self.assertRegex(
+            self._get(self.staff)["Content-Disposition"], r"kazanim-scores-all-"
+        )
+
+    def test_export_is_staff_only(self):
+        student = get_user_model().objects.get(email="export0@example.com")
+        self.assertEqual(self._get(student).status_code, 403)
+
+    def test_chunks_are_bounded(self):
+        chunks = list(export.iter_csv(export.iter_export_rows(), chunk_size=2))
+        # header + ceil(6 / 2) row chunks
+        self.assertEqual(len(chunks), 4)
+
+    def test_command_writes_csv_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "scores.csv"
+            call_command(
+                "export_analytics", output=str(target), grade=10, stderr=io.StringIO()
+            )
+            lines = target.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 7)
+
+    @unittest.skipIf(export.pq is None, "pyarrow is not installed")
+    def test_command_writes_parquet_row_groups(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "scores.parquet"
+            call_command(
+                "export_analytics",
+                fmt="parquet",
+                output=str(target),
+                chunk_size=4,
+                stderr=io.StringIO(),
+            )
+            metadata = export.pq.ParquetFile(target).metadata
+        self.assertEqual(metadata.num_rows, 6)
+        self.assertEqual(metadata.num_row_groups, 2)
+
+    def test_command_fails_cleanly_without_pyarrow(self):
+        with mock.patch.object(export, "pa", None), mock.patch.object(
+            export, "pq", None
+        ):
+            with self.assertRaisesMessage(CommandError, "pyarrow"):
+                call_command(
+                    "export_analytics",
+                    fmt="parquet",
+                    output="unused.parquet",
+                    stderr=io.StringIO(),
+                )
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Tests for the cross-subject weakest/strongest kazanım selector."""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from backend.artifacts.services import focus
+from backend.artifacts.services.scores import ingest_scores
+from backend.artifacts.views import _summarize_graph_payload
+
+MATH_NODES = [f"kznm_9_1_1_{i}" for i in range(1, 5)]
+TURKCE_NODES = ["kznm_9_1_1", "kznm_9_1_2", "kznm_9_1_3"]
+
+
+class AnalyticsFocusTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="focus@example.com",
+            name="Focus",
+            password="StrongPass123!",
+            is_active=True,
+            grade=9,
+            track="sayisal",
+        )
+        self.token, _ = Token.objects.get_or_create(user=self.user)
+
+    def _ingest(self, subject, scores):
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest_scores(self.user, subject, scores)
+
+    def _focus(self, **params):
+        return self.client.get(
+            reverse("artifacts:analytics-focus"),
+            params,
+            HTTP_AUTHORIZATION=f"Token {self.token.key}",
+        )
+
+    def test_focus_spans_subjects(self):
+        self._ingest("matematik", dict(zip(MATH_NODES, (80, 15, 60, 95))))
+        self._ingest("turk_dili_ve_edebiyati", dict(zip(TURKCE_NODES, (5, 70, 99))))
+
+        resp = self._focus(k=2)
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(
+            [(e["subject"], e["score"]) for e in data["weakest"]],
+            [("turk_dili_ve_edebiyati", 5), ("matematik", 15)],
+        )
+        self.assertEqual([e["score"] for e in data["strongest"]], [99, 95])
+
+    def test_cached_lists_follow_incremental_updates(self):
+        self._ingest("matematik", dict(zip(MATH_NODES, (80, 15, 60, 95))))
+        self._focus()  # warm the cache
+
+        self._ingest("matematik", {MATH_NODES[0]: 1})
+        with self.assertNumQueries(0):  # cached token authentication and focus lists
+            data = self._focus(k=1).json()
+        self.assertEqual(data["weakest"][0]["node_id"], MATH_NODES[0])
+
+    def test_late_refresh_uses_committed_scores(self):
+        self._ingest("matematik", dict(zip(MATH_NODES, (80, 15, 60, 95))))
+        self._focus()  # warm the cache
+        self._ingest("matematik", {MATH_NODES[0]: 1})
+
+        # A refresh from an earlier submission that ran last must not bring
+        # its stale score back.
+        focus.refresh_focus(self.user, "matematik", [(MATH_NODES[0], 80)])
+        data = self._focus(k=1).json()
+        self.assertEqual(data["weakest"][0]["node_id"], MATH_NODES[0])
+        self.assertEqual(data["weakest"][0]["score"], 1)
+
+    def test_full_list_is_rebuilt_when_kept_entry_moves_out(self):
+        entries = [
+            {"subject": "s", "node_id": str(i), "score": float(i)}
+            for i in range(focus.FOCUS_HEAP_SIZE)
+        ]
+        improved = [{"subject": "s", "node_id": "0", "score": 50.0}]
+        self.assertIsNone(focus._merge(entries, improved, weakest=True))
+        worse = [{"subject": "s", "node_id": "3", "score": -1.0}]
+        self.assertEqual(focus._merge(entries, worse, weakest=True)[0]["node_id"], "3")
+
+    def test_invalid_k_is_rejected(self):
+        self.assertEqual(self._focus(k=0).status_code, 400)
+        self.assertEqual(self._focus(k="x").status_code, 400)
+
+    def test_summary_picks_best_and_worst_nodes(self):
+        nodes = [{"id": str(i), "label": str(i), "basari_puani": i} for i in range(8)]
+        summary = _summarize_graph_payload({"nodes": nodes, "links": []})
+        self.assertEqual([n["score"] for n in summary["best_nodes"]], [7, 6, 5, 4, 3])
+        self.assertEqual([n["score"] for n in summary["worst_nodes"]], [0, 1, 2, 3, 4])
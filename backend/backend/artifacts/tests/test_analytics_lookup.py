@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Tests for the batch node lookup endpoint and the per-version node map."""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from backend.artifacts.graph import get_subject_nodes
+from backend.artifacts.services.lookup import LOOKUP_MAX_IDS
+from backend.artifacts.services.scores import ingest_scores
+
+
+class AnalyticsLookupTest(TestCase):
+    url = reverse("artifacts:analytics-lookup")
+
+    def _post(self, ids, **headers):
+        return self.client.post(
+            self.url, {"ids": ids}, content_type="application/json", **headers
+        )
+
+    def test_lookup_returns_requested_nodes_only(self):
+        resp = self._post(
+            {
+                "matematik": ["kznm_9_1_1_1", "nope"],
+                "turk_dili_ve_edebiyati": ["kznm_9_1_1"],
+                "unknown_subject": ["x"],
+            }
+        )
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(list(data["results"]["matematik"]), ["kznm_9_1_1_1"])
+        self.assertIn("kznm_9_1_1", data["results"]["turk_dili_ve_edebiyati"])
+        self.assertIsNone(data["results"]["matematik"]["kznm_9_1_1_1"]["score"])
+        self.assertEqual(
+            data["missing"], {"matematik": ["nope"], "unknown_subject": ["x"]}
+        )
+
+    def test_lookup_includes_student_scores(self):
+        user = get_user_model().objects.create_user(
+            email="lookup@example.com",
+            name="Lookup",
+            password="StrongPass123!",
+            is_active=True,
+        )
+        ingest_scores(user, "matematik", {"kznm_9_1_1_1": 42})
+        token, _ = Token.objects.get_or_create(user=user)
+
+        resp = self._post(
+            {"matematik": ["kznm_9_1_1_1"]},
+            HTTP_AUTHORIZATION=f"Token {token.key}",
+        )
+        self.assertEqual(
+            resp.json()["results"]["matematik"]["kznm_9_1_1_1"]["score"], 42
+        )
+
+    def test_lookup_limits_request_size(self):
+        resp = self._post({"matematik": ["kznm_9_1_1_1"] * (LOOKUP_MAX_IDS + 1)})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_node_map_is_reused_per_curriculum_version(self):
+        self.assertIs(get_subject_nodes("matematik"), get_subject_nodes("matematik"))
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Tests for precomputed score distributions and percentile ranks."""
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from backend.artifacts.models import ScoreDistribution
+from backend.artifacts.services.distributions import percentile_rank
+from backend.artifacts.services.scores import ingest_scores
+
+
+class PercentileRankTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.students = [
+            User.objects.create_user(
+                email=f"rank{i}@example.com",
+                name=f"Rank {i}",
+                password="StrongPass123!",
+                is_active=True,
+                grade=9,
+                track="sayisal",
+            )
+            for i in range(4)
+        ]
+        for student, value in zip(self.students, (10, 40, 70, 95)):
+            ingest_scores(
+                student, "matematik", {"kznm_9_1_1_1": value, "kznm_9_1_1_2": 50}
+            )
+
+    def _rank(self, user, **params):
+        token, _ = Token.objects.get_or_create(user=user)
+        return self.client.get(
+            reverse("artifacts:analytics-rank"),
+            {"subject": "matematik", **params},
+            HTTP_AUTHORIZATION=f"Token {token.key}",
+        )
+
+    def test_percentile_rank_counts_ties_as_half(self):
+        counts = [0] * 100
+        counts[10], counts[50], counts[90] = 1, 2, 1
+        self.assertEqual(percentile_rank(counts, 4, 50), 50.0)
+        self.assertEqual(percentile_rank(counts, 4, 99), 100.0)
+        self.assertEqual(percentile_rank([], 0, 50), 0.0)
+
+    def test_rank_endpoint_for_kazanim_and_konu(self):
+        resp = self._rank(self.students[2], node_id="kznm_9_1_1_1")
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(data["peer_count"], 4)
+        self.assertEqual(data["percentile"], 62.5)
+
+        resp = self._rank(self.students[0], konu="SAYILAR VE CEBİR")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["percentile"], 12.5)
+
+    def test_rescoring_moves_student_between_bins(self):
+        ingest_scores(self.students[0], "matematik", {"kznm_9_1_1_1": 99})
+        distribution = ScoreDistribution.objects.get(
+            scope=ScoreDistribution.SCOPE_KAZANIM, key="kznm_9_1_1_1"
+        )
+        self.assertEqual(distribution.total, 4)
+        self.assertEqual(distribution.counts[10], 0)
+        self.assertEqual(distribution.counts[99], 1)
+        self.assertEqual(
+            self._rank(self.students[0], node_id="kznm_9_1_1_1").json()["percentile"],
+            87.5,
+        )
+
+    def test_rebuild_command_matches_incremental_state(self):
+        before = {d.key: (d.counts, d.total) for d in ScoreDistribution.objects.all()}
+        call_command(
+            "rebuild_score_distributions", subjects=["matematik"], stdout=StringIO()
+        )
+        after = {d.key: (d.counts, d.total) for d in ScoreDistribution.objects.all()}
+        self.assertEqual(before, after)
+
+    def test_rank_without_score_returns_404(self):
+        resp = self._rank(self.students[0], node_id="kznm_9_4_1_1")
+        self.assertEqual(resp.status_code, 404)
+
+    def test_rank_requires_exactly_one_target(self):
+        resp = self._rank(self.students[0])
+        self.assertEqual(resp.status_code, 400)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""Tests for the first-turn chatbot reply cache."""
+
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from backend.artifacts import views
+from backend.artifacts.services.chat_cache import (
+    get_chat_cache_stats,
+    normalize_question,
+)
+from backend.artifacts.services.chat_history import load_chat_turns
+from backend.artifacts.services.scores import ingest_scores
+from backend.artifacts.tests.stub_llm import StubLLMServer
+
+GRAPH = {
+    "filters": {"subject": "matematik"},
+    "stats": {"node_count": 2, "link_count": 1},
+    "best_nodes": [{"label": "Kümeler", "score": 90}],
+    "worst_nodes": [{"label": "Üslü ifadeler", "score": 20}],
+}
+
+
+class ChatReplyCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.stub = StubLLMServer(chunks=["Üslü ifadelere odaklan."]).__enter__()
+        self.addCleanup(self.stub.__exit__, None, None, None)
+        patcher = mock.patch.object(
+            views, "get_llm_provider", return_value=self.stub.provider()
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _ask(self, message, client=None, graph=GRAPH, **extra):
+        return (client or Client()).post(
+            reverse("artifacts:graph-chat"),
+            data=json.dumps({"message": message, "graph": graph}),
+            content_type="application/json",
+            **extra,
+        )
+
+    def test_turkish_normalization(self):
+        self.assertEqual(
+            normalize_question("  Hangi KONUDA zayıfım?! "), "hangi konuda zayıfım"
+        )
+        self.assertEqual(normalize_question("IŞIK İYİ"), "ışık iyi")
+
+    def test_repeated_first_turn_question_is_served_from_cache(self):
+        first = self._ask("Hangi konuda zayıfım?")
+        second = self._ask("hangi konuda ZAYIFIM ?")
+        self.assertEqual(first.json(), {"reply": "Üslü ifadelere odaklan."})
+        self.assertEqual(
+            second.json(), {"reply": "Üslü ifadelere odaklan.", "cached": True}
+        )
+        self.assertEqual(len(self.stub.requests), 1)
+        self.assertEqual(get_chat_cache_stats(), {"hits": 1, "misses": 1})
+
+        # A different graph view is a different question.
+        self._ask("Hangi konuda zayıfım?", graph={**GRAPH, "worst_nodes": []})
+        self.assertEqual(len(self.stub.requests), 2)
+
+    def test_follow_up_turns_are_not_cached(self):
+        client = Client()
+        self._ask("Hangi konuda zayıfım?", client=client)
+        self._ask("Hangi konuda zayıfım?", client=client)
+        self.assertEqual(len(self.stub.requests), 2)
+        owner = f"session:{client.session['chat_id']}"
+        history, _ = load_chat_turns(owner)
+        self.assertEqual(
+            [role for role, _, _ in history], ["user", "assistant", "user", "assistant"]
+        )
+
+    def test_replies_are_not_shared_between_students(self):
+        tokens = []
+        for i, score in enumerate((10, 90)):
+            user = get_user_model().objects.create_user(
+                email=f"cache{i}@example.com",
+                name=f"Cache {i}",
+                password="StrongPass123!",
+                is_active=True,
+                grade=9,
+            )
+            with self.captureOnCommitCallbacks(execute=True):
+                ingest_scores(user, "matematik", {"kznm_9_1_1_1": score})
+            tokens.append(Token.objects.create(user=user).key)
+
+        for key in tokens:
+            self._ask("Hangi konuda zayıfım?", HTTP_AUTHORIZATION=f"Token {key}")
+        self.assertEqual(len(self.stub.requests), 2)
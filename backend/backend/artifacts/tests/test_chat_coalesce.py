@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""Tests for coalescing identical in-flight chat prompts."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from backend.artifacts.services import coalesce
+from backend.artifacts.services.llm import LLMUnavailable, StubProvider
+
+MESSAGES = [{"role": "user", "content": "Öğretmenin önerdiği soru"}]
+
+
+class FakeRedisLists:
+    """The list commands ``coalesce`` uses, with a blocking ``blpop``."""
+
+    def __init__(self):
+        self.lists = {}
+        self.blpops = 0
+        self._changed = threading.Condition()
+
+    def delete(self, key):
+        with self._changed:
+            self.lists.pop(key, None)
+
+    def rpush(self, key, value):
+        with self._changed:
+            self.lists.setdefault(key, []).append(value)
+            self._changed.notify_all()
+
+    def expire(self, key, seconds):
+        pass
+
+    def pipeline(self):
+        client = self
+
+        class Pipeline:
+            def __enter__(self):
+                self.calls = []
+                return self
+
+            def __exit__(self, *exc_info):
+                pass
+
+            def __getattr__(self, name):
+                return lambda *args: self.calls.append((name, args))
+
+            def execute(self):
+                for name, args in self.calls:
+                    getattr(client, name)(*args)
+
+        return Pipeline()
+
+    def blpop(self, keys, timeout):
+        with self._changed:
+            self.blpops += 1
+            self._changed.wait_for(lambda: self.lists.get(keys[0]), timeout)
+            if self.lists.get(keys[0]):
+                return keys[0], self.lists[keys[0]].pop(0)
+            return None
+
+
+class ChatCoalescingTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.provider = StubProvider(delay=0.3)
+        self.calls = mock.patch.object(
+            self.provider, "_complete", wraps=self.provider._complete
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+        self.key = coalesce.prompt_key(self.provider, MESSAGES)
+
+    def test_concurrent_identical_prompts_share_one_call(self):
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            replies = list(
+                pool.map(
+                    lambda _: coalesce.complete_coalesced(self.provider, MESSAGES),
+                    range(5),
+                )
+            )
+        self.assertEqual(self.calls.call_count, 1)
+        self.assertEqual(set(replies), {StubProvider.reply_for(MESSAGES)})
+
+        other = [{"role": "user", "content": "Başka bir soru"}]
+        coalesce.complete_coalesced(self.provider, other)
+        self.assertEqual(self.calls.call_count, 2)
+
+    def test_follower_reuses_reply_of_another_worker(self):
+        self.assertTrue(coalesce._claim(self.key))  # leader in another worker
+        timer = threading.Timer(0.1, coalesce._publish, args=(self.key, "Paylaşılan"))
+        timer.start()
+        self.assertEqual(
+            coalesce.complete_coalesced(self.provider, MESSAGES), "Paylaşılan"
+        )
+        timer.join()
+        self.calls.assert_not_called()
+
+    def test_follower_takes_over_when_leader_fails(self):
+        self.assertTrue(coalesce._claim(self.key))
+        timer = threading.Timer(0.1, coalesce._release, args=(self.key,))
+        timer.start()
+        reply = coalesce.complete_coalesced(self.provider, MESSAGES)
+        timer.join()
+        self.assertEqual(reply, StubProvider.reply_for(MESSAGES))
+        self.assertEqual(self.calls.call_count, 1)
+
+    async def test_stream_follower_receives_published_reply(self):
+        coalesce._claim(self.key)
+        timer = threading.Timer(0.1, coalesce._publish, args=(self.key, "Tek parça"))
+        timer.start()
+        parts = [
+            part async for part in coalesce.stream_coalesced(self.provider, MESSAGES)
+        ]
+        timer.join()
+        self.assertEqual(parts, ["Tek parça"])
+
+    def test_followers_block_on_redis_until_the_leader_finishes(self):
+        redis = FakeRedisLists()
+        mock.patch.object(coalesce, "_redis", return_value=redis).start()
+        self.assertTrue(coalesce._claim(self.key))
+        timer = threading.Timer(0.2, coalesce._publish, args=(self.key, "Hazır"))
+        timer.start()
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            replies = list(
+                pool.map(lambda _: coalesce._wait_for_leader(self.key), range(3))
+            )
+        timer.join()
+        self.assertEqual(replies, ["Hazır"] * 3)
+        # One wake-up each, instead of a cache poll every few milliseconds.
+        self.assertLessEqual(redis.blpops, 3)
+
+    def test_waiting_followers_are_bounded(self):
+        mock.patch.object(coalesce, "_followers", threading.BoundedSemaphore(1)).start()
+        self.assertTrue(coalesce._claim(self.key))
+        coalesce._followers.acquire()  # another request is already waiting
+        with self.assertRaises(LLMUnavailable):
+            coalesce.complete_coalesced(self.provider, MESSAGES)
+        coalesce._followers.release()
+        self.calls.assert_not_called()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""Tests for the server-computed graph context of chat messages."""
+
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from backend.artifacts import views
+from backend.artifacts.services import relevance
+from backend.artifacts.services.scores import ingest_scores
+from backend.artifacts.tests.stub_llm import StubLLMServer
+
+GEOMETRI = views._slugify("GEOMETRİ")
+SAYILAR = views._slugify("SAYILAR VE CEBİR")
+
+
+class ChatGraphContextTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.stub = StubLLMServer(chunks=["Tamam."]).__enter__()
+        self.addCleanup(self.stub.__exit__, None, None, None)
+        patcher = mock.patch.object(
+            views, "get_llm_provider", return_value=self.stub.provider()
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _ask(self, message, **payload):
+        return self.client.post(
+            reverse("artifacts:graph-chat"),
+            data=json.dumps({"message": message, **payload}),
+            content_type="application/json",
+        )
+
+    def _prompt(self, index=-1):
+        return self.stub.requests[index]["messages"][-1]["content"]
+
+    def test_summary_is_built_from_filters(self):
+        graph = self.client.get(
+            reverse("artifacts:graph-data"), {"subject": "matematik", "konu": GEOMETRI}
+        ).json()["data"]
+
+        resp = self._ask(
+            "Ne çalışayım?", filters={"subject": "matematik", "konu": GEOMETRI}
+        )
+        self.assertEqual(resp.status_code, 200)
+        prompt = self._prompt()
+        self.assertIn("Ders (subject): matematik", prompt)
+        self.assertIn(
+            f"Toplam node sayısı: {len(graph['nodes'])}, "
+            f"bağlantı sayısı: {len(graph['links'])}",
+            prompt,
+        )
+
+    def test_summary_is_memoized_per_filter(self):
+        filters = {"subject": "matematik", "konu": GEOMETRI, "grade": "9"}
+        self._ask("Birinci soru", filters=filters)
+        with mock.patch.object(views, "_get_graph_payload", side_effect=AssertionError):
+            self._ask("İkinci soru", filters=filters)
+        self.assertEqual(
+            self._prompt(0).split("\n\n")[0], self._prompt(1).split("\n\n")[0]
+        )
+
+    def test_raw_graph_payloads_are_not_summarized(self):
+        nodes = [{"id": "a", "label": "A", "basari_puani": 40}]
+        self._ask("Soru", graph={"nodes": nodes, "links": []})
+        self.assertEqual(self._prompt(), "Soru")
+
+    def test_unknown_subject_and_invalid_filters(self):
+        resp = self._ask("Soru", filters={"subject": "yok"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self._prompt(), "Soru")
+        self.assertEqual(self._ask("Soru", filters=["matematik"]).status_code, 400)
+
+    def test_prompt_lists_kazanimlar_relevant_to_the_question(self):
+        filters = {"subject": "matematik", "konu": SAYILAR}
+        self._ask("Önermelerin doğruluk tablosunu anlamadım", filters=filters)
+        prompt = self._prompt()
+        self.assertIn("Soruyla ilgili kazanımlar:", prompt)
+        self.assertIn("Bileşik önermeyi örneklerle açıklar", prompt)
+        self.assertNotIn("En yüksek başarı puanına sahip konular", prompt)
+
+    def test_relevant_kazanimlar_include_the_students_score(self):
+        user = get_user_model().objects.create_user(
+            email="relevance@example.com",
+            name="Relevance",
+            password="StrongPass123!",
+            is_active=True,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest_scores(user, "matematik", {"kznm_9_1_1_2": 12})
+        self.client.force_login(user)
+        self._ask(
+            "Bileşik önerme nedir?",
+            filters={"subject": "matematik", "konu": SAYILAR},
+        )
+        self.assertIn("öğrencinin puanı: 12.00", self._prompt())
+
+    def test_relevant_kazanimlar_stay_within_the_visible_graph(self):
+        # Olasılık belongs to another konu, so the view's extremes are used.
+        self._ask(
+            "Olasılık nasıl çalışılır?",
+            filters={"subject": "matematik", "konu": GEOMETRI},
+        )
+        prompt = self._prompt()
+        self.assertNotIn("Soruyla ilgili kazanımlar:", prompt)
+        self.assertIn("En düşük başarı puanına sahip konular", prompt)
+
+
+class KazanimIndexTest(SimpleTestCase):
+    def test_turkish_folding_and_suffix_tolerant_stems(self):
+        self.assertEqual(
+            relevance.fold_turkish("İKİ KÜMENİN IŞIĞI"), "iki kumenin isigi"
+        )
+        self.assertEqual(
+            relevance.stems("Kümeler, kümelerde ve kumeye"), ["kume", "kume", "kume"]
+        )
+        self.assertEqual(relevance.stems("olasılığı olasilik"), ["olasi", "olasi"])
+
+    def test_search_ranks_by_matched_terms(self):
+        index = relevance.KazanimIndex(
+            [
+                {
+                    "id": "a",
+                    "type": "kazanım",
+                    "label": "Kümelerde birleşim",
+                    "konu": "SAYILAR",
+                },
+                {
+                    "id": "b",
+                    "type": "kazanım",
+                    "label": "Kümelerde kesişim",
+                    "konu": "SAYILAR",
+                },
+                {
+                    "id": "c",
+                    "type": "kazanım",
+                    "label": "Üçgende açılar",
+                    "konu": "GEOMETRİ",
+                },
+                {"id": "g", "type": "grup", "label": "Kümeler", "konu": "SAYILAR"},
+            ]
+        )
+        self.assertEqual(
+            [node_id for node_id, _ in index.search("kümelerin birleşimi")], ["a", "b"]
+        )
+        self.assertEqual(index.search("kümeler", allowed={"b"})[0][0], "b")
+        self.assertEqual(index.search("türev"), [])
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Tests for the capped per-user chat history store and prompt compaction."""
+
+import hashlib
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from backend.artifacts.services import chat_history
+from backend.artifacts.services.chat_history import (
+    CHAT_CONTEXT_KEY,
+    CHAT_HISTORY_KEY,
+    append_chat_turns,
+    clear_chat_history,
+    load_chat_turns,
+)
+from backend.artifacts.services.chat_prompt import (
+    SUMMARY_HEADER,
+    build_chat_prompt,
+    estimate_tokens,
+)
+
+CONTEXT = "Öğrencinin şu an ekranda gördüğü grafik bağlamı:\n- Ders: matematik\n"
+
+
+class ChatHistoryStoreTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_turns_are_rebuilt_with_referenced_context(self):
+        append_chat_turns(
+            "user:1", [("user", "Soru 1", CONTEXT), ("assistant", "Yanıt 1", "")]
+        )
+        append_chat_turns(
+            "user:1", [("user", "Soru 2", CONTEXT), ("assistant", "Yanıt 2", "")]
+        )
+
+        turns, summary = load_chat_turns("user:1")
+        self.assertEqual(turns[2], ("user", "Soru 2", CONTEXT))
+        self.assertEqual([text for _, text, _ in turns[1::2]], ["Yanıt 1", "Yanıt 2"])
+        self.assertEqual(summary, [])
+
+        # Stored entries hold a reference to the context, not a copy.
+        stored = cache.get(CHAT_HISTORY_KEY.format(owner="user:1"))
+        self.assertTrue(all(CONTEXT not in entry for entry in stored))
+
+    def test_trimmed_turns_are_folded_into_the_summary(self):
+        for i in range(10):
+            append_chat_turns(
+                "user:2", [("user", f"S{i}", ""), ("assistant", f"Y{i}", "")]
+            )
+        turns, summary = load_chat_turns("user:2")
+        self.assertEqual(len(turns), chat_history.CHAT_HISTORY_MAX_MESSAGES)
+        self.assertEqual(turns[0][1], "S4")
+        self.assertEqual(turns[-1][1], "Y9")
+        self.assertEqual(summary[0], "- Öğrenci: S0 / BayKoç AI: Y0")
+        self.assertEqual(len(summary), 4)
+
+    def test_expired_context_falls_back_to_the_question(self):
+        append_chat_turns("user:3", [("user", "Soru", CONTEXT)])
+        digest = hashlib.sha1(CONTEXT.encode()).hexdigest()
+        cache.delete(CHAT_CONTEXT_KEY.format(digest=digest))
+        self.assertEqual(load_chat_turns("user:3")[0], [("user", "Soru", "")])
+
+        clear_chat_history("user:3")
+        self.assertEqual(load_chat_turns("user:3"), ([], []))
+
+
+class ChatPromptCompactionTest(SimpleTestCase):
+    def _tokens(self, messages):
+        return sum(estimate_tokens(m["content"]) + 4 for m in messages)
+
+    def test_small_prompt_is_unchanged_except_repeated_contexts(self):
+        turns = [
+            ("user", "Soru 1", CONTEXT),
+            ("assistant", "Yanıt 1", ""),
+            ("user", "Soru 2", CONTEXT),
+        ]
+        messages = build_chat_prompt("SYSTEM", turns)
+        self.assertEqual(
+            [m["content"] for m in messages[:3]], ["SYSTEM", "Soru 1", "Yanıt 1"]
+        )
+        self.assertTrue(messages[-1]["content"].startswith(CONTEXT))
+
+    def test_long_history_is_summarized_under_budget(self):
+        long_reply = "Uzun bir açıklama cümlesi. " * 60
+        turns = []
+        for i in range(6):
+            turns += [
+                ("user", f"Soru {i}", f"Bağlam {i}\n" * 20),
+                ("assistant", long_reply, ""),
+            ]
+        turns.append(("user", "Son soru", CONTEXT))
+
+        messages = build_chat_prompt("SYSTEM", turns, summary=["- eski"], budget=800)
+        self.assertLessEqual(self._tokens(messages), 800)
+        self.assertEqual(messages[0]["content"], "SYSTEM")
+        self.assertTrue(messages[1]["content"].startswith(SUMMARY_HEADER))
+        self.assertIn("- Öğrenci: Soru 0 / BayKoç AI: Uzun", messages[1]["content"])
+        self.assertTrue(messages[-1]["content"].startswith(CONTEXT))
+        self.assertFalse(any("Bağlam" in m["content"] for m in messages))
+
+    def test_estimate_counts_words_and_punctuation(self):
+        self.assertEqual(estimate_tokens("Merhaba, dünya!"), 2 + 1 + 2 + 1)
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""Tests for the asynchronous chat mode and its background job queue."""
+
+import json
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from backend.artifacts import views
+from backend.artifacts.models import ChatJob
+from backend.artifacts.services import chat_jobs
+from backend.artifacts.services.chat_history import load_chat_turns
+from backend.artifacts.services.llm import LLMError, LLMUnavailable, StubProvider
+
+
+class FailingProvider(StubProvider):
+    def _complete(self, messages):
+        raise LLMError("provider down")
+
+
+class SaturatedProvider(StubProvider):
+    def _complete(self, messages):
+        raise LLMUnavailable("LLM provider is saturated")
+
+
+class ChatJobTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="jobs@example.com",
+            name="Jobs",
+            password="StrongPass123!",
+            is_active=True,
+        )
+        self.token, _ = Token.objects.get_or_create(user=self.user)
+        self.provider = StubProvider()
+        patcher = mock.patch.object(
+            views, "get_llm_provider", return_value=self.provider
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _enqueue(self, message, token=None):
+        return self.client.post(
+            reverse("artifacts:graph-chat"),
+            data=json.dumps({"message": message, "async": True}),
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Token {(token or self.token).key}",
+        )
+
+    def _poll(self, job_id, token=None, **params):
+        return self.client.get(
+            reverse("artifacts:graph-chat-job", args=[job_id]),
+            params,
+            HTTP_AUTHORIZATION=f"Token {(token or self.token).key}",
+        )
+
+    def test_enqueue_run_and_poll(self):
+        response = self._enqueue("Türev nasıl çalışılır?")
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["job_id"]
+        self.assertEqual(response.json()["status"], ChatJob.STATUS_QUEUED)
+        self.assertEqual(
+            response.json()["poll_url"],
+            reverse("artifacts:graph-chat-job", args=[job_id]),
+        )
+        self.assertEqual(self._poll(job_id).json()["status"], "queued")
+
+        self.assertEqual(chat_jobs.process_chat_jobs(self.provider), 1)
+        payload = self._poll(job_id).json()
+        self.assertEqual(payload["status"], "done")
+        self.assertTrue(payload["reply"].startswith("[stub "))
+        turns, _ = load_chat_turns(f"user:{self.user.pk}")
+        self.assertEqual(
+            [(role, text) for role, text, _ in turns],
+            [("user", "Türev nasıl çalışılır?"), ("assistant", payload["reply"])],
+        )
+
+    async def test_long_poll_returns_when_job_finishes(self):
+        response = await sync_to_async(self._enqueue)("Limit nedir?")
+        job_id = response.json()["job_id"]
+        await sync_to_async(chat_jobs.process_chat_jobs)(self.provider)
+        response = await self.async_client.get(
+            reverse("artifacts:graph-chat-job", args=[job_id]),
+            {"wait": "5"},
+            headers={"Authorization": f"Token {self.token.key}"},
+        )
+        self.assertEqual(response.json()["status"], "done")
+
+    def test_invalid_wait_is_rejected(self):
+        job_id = self._enqueue("Limit nedir?").json()["job_id"]
+        for wait in ("nan", "inf", "-inf", "soon"):
+            response = self._poll(job_id, wait=wait)
+            self.assertEqual(response.status_code, 400, wait)
+        self.assertEqual(self._poll(job_id, wait="-3").json()["status"], "queued")
+
+    def test_jobs_of_other_owners_are_hidden(self):
+        job_id = self._enqueue("Gizli soru").json()["job_id"]
+        other = get_user_model().objects.create_user(
+            email="other@example.com",
+            name="Other",
+            password="StrongPass123!",
+            is_active=True,
+        )
+        other_token, _ = Token.objects.get_or_create(user=other)
+        self.assertEqual(self._poll(job_id, token=other_token).status_code, 404)
+        self.assertEqual(
+            self.client.get(
+                reverse("artifacts:graph-chat-job", args=[job_id])
+            ).status_code,
+            404,
+        )
+
+    def test_pending_jobs_per_owner_are_capped(self):
+        for index in range(chat_jobs.CHAT_JOB_MAX_PENDING_PER_OWNER):
+            self.assertEqual(self._enqueue(f"Soru {index}").status_code, 202)
+        self.assertEqual(self._enqueue("Bir soru daha").status_code, 429)
+
+    def test_owners_are_served_fairly(self):
+        busy = [
+            chat_jobs.enqueue_chat_job("user:busy", f"q{i}", "", []) for i in (1, 2)
+        ]
+        other = chat_jobs.enqueue_chat_job("user:other", "q", "", [])
+
+        first = chat_jobs.claim_next_job()
+        self.assertEqual(first.pk, busy[0].pk)
+        # ``user:busy`` already has a running job, so the next worker serves
+        # the other owner even though its job was queued later.
+        self.assertEqual(chat_jobs.claim_next_job().pk, other.pk)
+        self.assertIsNone(chat_jobs.claim_next_job())
+
+        chat_jobs.run_chat_job(first, self.provider)
+        self.assertEqual(chat_jobs.claim_next_job().pk, busy[1].pk)
+
+    def test_owner_locked_by_another_worker_is_skipped(self):
+        busy = chat_jobs.enqueue_chat_job("user:busy", "q", "", [])
+        other = chat_jobs.enqueue_chat_job("user:other", "q", "", [])
+        with mock.patch.object(
+            chat_jobs, "_lock_owner", side_effect=lambda owner: owner != busy.owner
+        ):
+            self.assertEqual(chat_jobs.claim_next_job().pk, other.pk)
+        self.assertEqual(chat_jobs.claim_next_job().pk, busy.pk)
+
+    def test_stale_jobs_are_requeued_until_the_attempt_limit(self):
+        job = chat_jobs.enqueue_chat_job("user:stale", "q", "", [])
+        long_ago = timezone.now() - timedelta(hours=1)
+        for attempt in range(1, chat_jobs.CHAT_JOB_MAX_ATTEMPTS + 1):
+            self.assertEqual(chat_jobs.claim_next_job().attempts, attempt)
+            ChatJob.objects.filter(pk=job.pk).update(started_at=long_ago)
+        self.assertIsNone(chat_jobs.claim_next_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, ChatJob.STATUS_FAILED)
+        self.assertEqual(job.error, "Worker stopped responding")
+
+    def test_saturated_provider_does_not_use_an_attempt(self):
+        job = chat_jobs.enqueue_chat_job("user:saturated", "q", "", [])
+        job = chat_jobs.run_chat_job(chat_jobs.claim_next_job(), SaturatedProvider())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (ChatJob.STATUS_QUEUED, 0))
+        self.assertGreater(job.available_at, timezone.now())
+
+    def test_worker_survives_unexpected_errors(self):
+        stop = threading.Event()
+        calls = []
+
+        def process(provider, max_jobs):
+            calls.append(max_jobs)
+            if len(calls) == 1:
+                raise RuntimeError("connection lost")
+            stop.set()
+            return 0
+
+        with mock.patch.object(chat_jobs, "process_chat_jobs", side_effect=process):
+            with self.assertLogs(chat_jobs.logger, "ERROR"):
+                chat_jobs.work(self.provider, stop, poll_interval=0.001)
+        self.assertEqual(len(calls), 2)
+
+    def test_failed_attempts_are_retried_then_marked_failed(self):
+        job = chat_jobs.enqueue_chat_job("user:retry", "q", "", [])
+        provider = FailingProvider()
+        for attempt in range(1, chat_jobs.CHAT_JOB_MAX_ATTEMPTS + 1):
+            ChatJob.objects.filter(pk=job.pk).update(available_at=job.created_at)
+            claimed = chat_jobs.claim_next_job()
+            self.assertEqual(claimed.attempts, attempt)
+            job = chat_jobs.run_chat_job(claimed, provider)
+        self.assertEqual(job.status, ChatJob.STATUS_FAILED)
+        self.assertEqual(job.error, "provider down")
+        self.assertIsNone(chat_jobs.claim_next_job())
+
+    def test_worker_command_drains_the_queue(self):
+        job_id = self._enqueue("Olasılık").json()["job_id"]
+        with mock.patch(
+            "backend.artifacts.management.commands.run_chat_workers"
+            ".get_llm_provider",
+            return_value=self.provider,
+        ):
+            call_command("run_chat_workers", "--once", stdout=mock.MagicMock())
+        self.assertEqual(ChatJob.objects.get(pk=job_id).status, ChatJob.STATUS_DONE)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Tests for the chat latency spans and per-phase histograms."""
+
+import json
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from backend.artifacts import views
+from backend.artifacts.services import chat_metrics
+from backend.artifacts.services.llm import StubProvider
+
+
+class ChatMetricsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(
+            views, "get_llm_provider", return_value=StubProvider()
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.staff = get_user_model().objects.create_user(
+            email="staff@example.com",
+            name="Staff",
+            password="StrongPass123!",
+            is_active=True,
+            is_staff=True,
+        )
+
+    def _ask(self, message):
+        return self.client.post(
+            reverse("artifacts:graph-chat"),
+            data=json.dumps({"message": message}),
+            content_type="application/json",
+        )
+
+    def test_chat_request_logs_phase_spans_and_token_counts(self):
+        with self.assertLogs("backend.artifacts.services.chat_metrics") as logs:
+            self.assertEqual(self._ask("Türev nedir?").status_code, 200)
+        record = logs.records[-1].chat_timings
+        self.assertEqual(record["endpoint"], "graph-chat")
+        self.assertEqual(record["outcome"], "ok")
+        self.assertLessEqual(
+            {"parse", "history_read", "context", "prompt", "llm", "history_write"},
+            set(record["phases_ms"]),
+        )
+        self.assertGreater(record["prompt_tokens"], 0)
+        self.assertGreater(record["completion_tokens"], 0)
+
+    def test_failed_requests_are_recorded(self):
+        with self.assertLogs("backend.artifacts.services.chat_metrics") as logs:
+            self.assertEqual(self._ask("").status_code, 400)
+            with mock.patch.object(
+                views, "load_chat_turns", side_effect=RuntimeError("store down")
+            ):
+                with self.assertRaises(RuntimeError):
+                    self._ask("Türev nedir?")
+        outcomes = [record.chat_timings["outcome"] for record in logs.records]
+        self.assertEqual(outcomes, ["invalid", "error"])
+        self.assertEqual(chat_metrics.get_chat_metrics()["total"]["count"], 2)
+
+    def test_histograms_are_served_to_staff_only(self):
+        self._ask("Türev nedir?")
+        self.client.cookies.clear()  # another guest's first turn: cached reply
+        self._ask("Türev nedir?")
+
+        url = reverse("artifacts:graph-chat-metrics")
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.client.force_login(self.staff)
+        payload = self.client.get(url).json()
+        self.assertEqual(payload["phases"]["total"]["count"], 2)
+        self.assertEqual(payload["phases"]["llm"]["count"], 1)
+        self.assertEqual(sum(payload["phases"]["llm"]["buckets"].values()), 1)
+        self.assertEqual(payload["reply_cache"], {"hits": 1, "misses": 1})
+
+    @override_settings(CHAT_LATENCY_SLO_MS=1)
+    def test_slow_requests_count_against_the_slo(self):
+        with mock.patch.object(StubProvider, "_complete", side_effect=_slow_reply):
+            with self.assertLogs("backend.artifacts.services.chat_metrics", "WARNING"):
+                self._ask("Yavaş soru")
+        self.assertEqual(chat_metrics.get_chat_metrics()["total"]["over_slo"], 1)
+
+    def test_quantiles_use_bucket_bounds(self):
+        for ms in (3, 40, 40, 40, 900):
+            chat_metrics.record_chat_timings({"llm": ms})
+        llm = chat_metrics.get_chat_metrics()["llm"]
+        self.assertEqual((llm["p50_ms"], llm["p99_ms"]), (50.0, 1000.0))
+        self.assertEqual(llm["mean_ms"], 204.6)
+        chat_metrics.reset_chat_metrics()
+        self.assertEqual(chat_metrics.get_chat_metrics(), {})
+
+
+def _slow_reply(messages):
+    time.sleep(0.01)
+    return "Tamam."
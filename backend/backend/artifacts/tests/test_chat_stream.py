@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""Tests for the async server-sent events chat endpoint."""
+
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from backend.artifacts import views
+from backend.artifacts.services.scores import ingest_scores
+from backend.artifacts.tests.stub_llm import StubLLMServer
+
+
+def _events(body: bytes):
+    events = []
+    for block in body.decode().strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class ChatStreamTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="stream@example.com",
+            name="Stream",
+            password="StrongPass123!",
+            is_active=True,
+            grade=9,
+            track="sayisal",
+        )
+        self.token, _ = Token.objects.get_or_create(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest_scores(self.user, "matematik", {"kznm_9_1_1_1": 12})
+
+    async def _post(self, payload, headers=None):
+        response = await self.async_client.post(
+            reverse("artifacts:graph-chat-stream"),
+            data=json.dumps(payload),
+            content_type="application/json",
+            headers=headers,
+        )
+        body = b""
+        if response.streaming:
+            body = b"".join([chunk async for chunk in response.streaming_content])
+        return response, body
+
+    async def test_streams_tokens_and_keeps_history(self):
+        with StubLLMServer() as stub, mock.patch.object(
+            views, "get_llm_provider", return_value=stub.provider()
+        ):
+            response, body = await self._post(
+                {"message": "Nerede zayıfım?"},
+                headers={"Authorization": f"Token {self.token.key}"},
+            )
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            self.assertEqual(
+                _events(body),
+                [
+                    ("token", {"text": "Merhaba"}),
+                    ("token", {"text": ", "}),
+                    ("token", {"text": "dünya!"}),
+                    ("done", {"reply": "Merhaba, dünya!"}),
+                ],
+            )
+            messages = stub.requests[0]["messages"]
+            self.assertEqual(messages[0]["content"], views.SYSTEM_PROMPT)
+            self.assertIn("başarı: 12.00", messages[1]["content"])
+
+            # The follow-up turn sees the streamed answer in the stored history.
+            await self._post(
+                {"message": "Peki sonra?"},
+                headers={"Authorization": f"Token {self.token.key}"},
+            )
+            roles = [m["role"] for m in stub.requests[1]["messages"]]
+            self.assertEqual(roles, ["system", "user", "assistant", "user"])
+            self.assertEqual(
+                stub.requests[1]["messages"][2]["content"], "Merhaba, dünya!"
+            )
+
+    async def test_provider_failure_yields_error_event(self):
+        with StubLLMServer() as stub, mock.patch.object(
+            views, "get_llm_provider", return_value=stub.provider()
+        ):
+            stub.status = 500
+            _, body = await self._post({"message": "Merhaba"})
+        self.assertEqual([event for event, _ in _events(body)], ["error"])
+
+    async def test_validation_and_disabled_service(self):
+        with mock.patch.object(views, "get_llm_provider", return_value=None):
+            response, _ = await self._post({"message": "Merhaba"})
+            self.assertEqual(response.status_code, 503)
+        with mock.patch.object(views, "get_llm_provider", return_value=object()):
+            response, _ = await self._post({})
+            self.assertEqual(response.status_code, 400)
+
+    async def test_bad_token_is_rejected(self):
+        with mock.patch.object(views, "get_llm_provider", return_value=object()):
+            response, _ = await self._post(
+                {"message": "Merhaba"}, headers={"Authorization": "Token nope"}
+            )
+        self.assertEqual(response.status_code, 401)
+
+    async def test_session_user_needs_csrf_token(self):
+        client = AsyncClient(enforce_csrf_checks=True)
+        await client.aforce_login(self.user)
+        with mock.patch.object(views, "get_llm_provider", return_value=object()):
+            response = await client.post(
+                reverse("artifacts:graph-chat-stream"),
+                data=json.dumps({"message": "Merhaba"}),
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 403)
+        self.assertIn("CSRF", response.json()["detail"])
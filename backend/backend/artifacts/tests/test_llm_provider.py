@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""Tests for the LLM provider layer (stub provider, slots, hedging, retries)."""
+
+import json
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from backend.artifacts import views
+from backend.artifacts.services.llm import (
+    LLMError,
+    LLMUnavailable,
+    RetryBudget,
+    StubProvider,
+    build_llm_provider,
+)
+from backend.artifacts.tests.stub_llm import StubLLMServer
+
+MESSAGES = [{"role": "user", "content": "Türev nedir?"}]
+
+
+class StubProviderTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(LLM_PROVIDER="stub", LLM_STUB_DELAY_SECONDS=0)
+    def test_chat_runs_offline_with_the_stub(self):
+        provider = build_llm_provider()
+        self.assertIsInstance(provider, StubProvider)
+        with mock.patch.object(views, "get_llm_provider", return_value=provider):
+            resp = self.client.post(
+                reverse("artifacts:graph-chat"),
+                data=json.dumps({"message": "Türev nedir?"}),
+                content_type="application/json",
+            )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            resp.json()["reply"],
+            StubProvider.reply_for(
+                MESSAGES[:0]
+                or [
+                    {"role": "system", "content": views.SYSTEM_PROMPT},
+                    *MESSAGES,
+                ]
+            ),
+        )
+
+    def test_saturated_provider_rejects_instead_of_queueing(self):
+        provider = StubProvider(delay=0.5, max_concurrency=1, queue_timeout=0.05)
+        worker = threading.Thread(target=provider.complete, args=(MESSAGES,))
+        worker.start()
+        time.sleep(0.05)
+        try:
+            with mock.patch.object(views, "get_llm_provider", return_value=provider):
+                resp = self.client.post(
+                    reverse("artifacts:graph-chat"),
+                    data=json.dumps({"message": "Türev nedir?"}),
+                    content_type="application/json",
+                )
+            self.assertEqual(resp.status_code, 503)
+            with self.assertRaises(LLMUnavailable):
+                provider.complete(MESSAGES)
+        finally:
+            worker.join()
+        self.assertTrue(provider.complete(MESSAGES).startswith("[stub "))
+
+    async def test_sync_and_async_callers_share_the_slots(self):
+        provider = StubProvider(delay=0.5, max_concurrency=1, queue_timeout=0.05)
+        worker = threading.Thread(target=provider.complete, args=(MESSAGES,))
+        worker.start()
+        time.sleep(0.05)
+        try:
+            with self.assertRaises(LLMUnavailable):
+                async for _ in provider.stream(MESSAGES):
+                    pass
+        finally:
+            worker.join()
+        deltas = [delta async for delta in provider.stream(MESSAGES)]
+        self.assertTrue("".join(deltas).startswith("[stub "))
+        with provider._slot():  # the streamed call released its slot
+            pass
+
+
+class GroqProviderTest(SimpleTestCase):
+    def test_slow_attempt_is_hedged(self):
+        with StubLLMServer(chunks=["Hızlı yanıt"]) as stub:
+            stub.delays = [1.0]
+            provider = stub.provider(hedge_after=0.1, max_attempts=2)
+            started = time.monotonic()
+            self.assertEqual(provider.complete(MESSAGES), "Hızlı yanıt")
+            self.assertLess(time.monotonic() - started, 0.8)
+            self.assertEqual(len(stub.requests), 2)
+            provider._executor.shutdown(wait=True)  # let the slow attempt finish
+
+    def test_server_errors_are_retried_then_reported(self):
+        with StubLLMServer() as stub:
+            stub.status = 500
+            provider = stub.provider(max_attempts=3)
+            with self.assertRaises(LLMError):
+                provider.complete(MESSAGES)
+            self.assertEqual(len(stub.requests), 3)
+
+    def test_retry_budget_limits_extra_attempts(self):
+        budget = RetryBudget(ratio=0.5, max_tokens=1)
+        self.assertTrue(budget.spend())
+        self.assertFalse(budget.spend())
+        budget.deposit()
+        budget.deposit()
+        self.assertTrue(budget.spend())
@@ -6,8 +6,17 @@ URL configuration for the artifacts (graph) API.
 from django.urls import path
 
 from .views import (
+    AnalyticsCohortAPIView,
+    AnalyticsExportAPIView,
+    AnalyticsFocusAPIView,
+    AnalyticsLookupAPIView,
     AnalyticsProgressAPIView,
+    AnalyticsRankAPIView,
+    AnalyticsScoresAPIView,
     ChatbotAPIView,
+    ChatbotStreamView,
+    ChatJobView,
+    ChatMetricsAPIView,
     GraphDataAPIView,
     GraphLinksAPIView,
     GraphNodesAPIView,
@@ -29,6 +38,37 @@ urlpatterns = [
         AnalyticsProgressAPIView.as_view(),
         name="analytics-progress",
     ),
+    path(
+        "analytics/scores/",
+        AnalyticsScoresAPIView.as_view(),
+        name="analytics-scores",
+    ),
+    path(
+        "analytics/cohort/",
+        AnalyticsCohortAPIView.as_view(),
+        name="analytics-cohort",
+    ),
+    path("analytics/rank/", AnalyticsRankAPIView.as_view(), name="analytics-rank"),
+    path("analytics/focus/", AnalyticsFocusAPIView.as_view(), name="analytics-focus"),
+    path(
+        "analytics/lookup/",
+        AnalyticsLookupAPIView.as_view(),
+        name="analytics-lookup",
+    ),
+    path(
+        "analytics/export/",
+        AnalyticsExportAPIView.as_view(),
+        name="analytics-export",
+    ),
     # Graph AI chat endpoint
     path("graph/chat/", ChatbotAPIView.as_view(), name="graph-chat"),
+    path("graph/chat/stream/", ChatbotStreamView.as_view(), name="graph-chat-stream"),
+    path(
+        "graph/chat/jobs/<uuid:job_id>/",
+        ChatJobView.as_view(),
+        name="graph-chat-job",
+    ),
+    path(
+        "graph/chat/metrics/", ChatMetricsAPIView.as_view(), name="graph-chat-metrics"
+    ),
 ]
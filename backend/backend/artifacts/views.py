@@ -4,68 +4,93 @@ API Views for BayKoç curriculum graph visualization.
 """
 from __future__ import annotations
 
+import asyncio
+import heapq
 import json
 import logging
-import os
-from collections.abc import Iterable
+import math
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
 from typing import Any
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.cache import cache
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.utils.decorators import method_decorator
+from django.utils.text import slugify
+from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import status
-from rest_framework.permissions import AllowAny
+from rest_framework.authentication import CSRFCheck
+from rest_framework.exceptions import AuthenticationFailed, Throttled
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from src.utils import create_graph_data, load_curriculum_data
 
-# Try to import Groq client; if missing, disable chat gracefully
-try:
-    from groq import Groq  # type: ignore
-except Exception:  # pragma: no cover - defensive import
-    Groq = None  # type: ignore[misc,assignment]
+from backend.artifacts.graph import (
+    CACHE_TIMEOUT_SECONDS,
+    CURRICULUM_ROOT,
+    GraphData,
+    curriculum_file_signature,
+    get_cached_graph_data,
+    resolve_curriculum_file,
+)
+from backend.artifacts.models import ChatJob
+from backend.artifacts.serializers import (
+    CohortQuerySerializer,
+    NodeLookupSerializer,
+    RankQuerySerializer,
+    ScoreIngestSerializer,
+)
+from backend.artifacts.services.chat_cache import (
+    get_cached_reply,
+    get_chat_cache_stats,
+    reply_cache_key,
+    store_reply,
+)
+from backend.artifacts.services.chat_history import (
+    append_chat_turns,
+    chat_history_owner,
+    load_chat_turns,
+)
+from backend.artifacts.services.chat_jobs import ChatQueueFull, enqueue_chat_job
+from backend.artifacts.services.chat_metrics import ChatTimer, get_chat_metrics
+from backend.artifacts.services.chat_prompt import (
+    CHAT_FALLBACK_REPLY,
+    build_chat_prompt,
+    estimate_tokens,
+    prompt_tokens,
+)
+from backend.artifacts.services.coalesce import complete_coalesced, stream_coalesced
+from backend.artifacts.services.cohort import get_cohort_averages
+from backend.artifacts.services.distributions import get_student_rank
+from backend.artifacts.services.export import aiter_csv, iter_csv, iter_export_rows
+from backend.artifacts.services.focus import FOCUS_HEAP_SIZE, focus_to_text, get_focus
+from backend.artifacts.services.llm import (
+    LLMError,
+    LLMProvider,
+    LLMUnavailable,
+    get_llm_provider,
+)
+from backend.artifacts.services.lookup import lookup_nodes
+from backend.artifacts.services.relevance import relevant_nodes
+from backend.artifacts.services.scores import ingest_scores
+from backend.throttling import SlidingWindowThrottle, hit, request_idents
+from backend.users.authentication import CachedTokenAuthentication
 
-CURRICULUM_ROOT = Path(settings.CURRICULUM_DIR)
-CACHE_TIMEOUT_SECONDS = 60 * 60  # 1 hour caching window per curriculum file
 SOURCES_CACHE_KEY = "graph-sources:data"
 SOURCES_SIG_KEY = "graph-sources:sig"
-MAX_CHAT_MESSAGES = 12  # keep history small to avoid bloated sessions
-GraphData = tuple[list[dict[str, Any]], list[dict[str, Any]]]
 
 logger = logging.getLogger(__name__)
 
 
-def get_cached_graph_data(file_path: str) -> GraphData:
-    """Load graph data from cache or rebuild from disk when missing."""
-
-    cache_key = f"graph-data:{file_path}"
-    cached: GraphData | None = cache.get(cache_key)
-    if cached is not None:
-        logger.info(
-            "graph-data cache hit", extra={"file": file_path, "cache_key": cache_key}
-        )
-        return cached
-
-    records = load_curriculum_data(file_path)
-    graph_data = create_graph_data(records)
-    cache.set(cache_key, graph_data, CACHE_TIMEOUT_SECONDS)
-    logger.info(
-        "graph-data cache miss — rebuilt",
-        extra={
-            "file": file_path,
-            "cache_key": cache_key,
-            "node_count": len(graph_data[0]),
-            "link_count": len(graph_data[1]),
-        },
-    )
-    return graph_data
-
-
 def _slugify(label: str) -> str:
     return str(label).strip().lower().replace(" ", "-").replace("/", "-")
 
@@ -92,11 +117,7 @@ def _graph_payload_cache_key(
     filter_type: str | None,
     filter_slug: str | None,
 ) -> str:
-    try:
-        stat = data_file.stat()
-        file_sig = f"{int(stat.st_mtime)}:{stat.st_size}"
-    except OSError:
-        file_sig = "unknown"
+    file_sig = curriculum_file_signature(data_file)
     subject_sig = subject or "matematik"
     grade_sig = ",".join(str(g) for g in sorted(grades)) if grades else "-"
     filter_sig = f"{filter_type or 'all'}:{filter_slug or '-'}"
@@ -182,45 +203,6 @@ def _discover_graph_sources() -> dict[str, list[dict[str, str]]]:
     return sources
 
 
-def _resolve_curriculum_file(
-    subject: str | None = None, filename: str | None = None
-) -> Path:
-    """Resolve curriculum JSON path based on subject and konu.
-
-    If no subject is provided, defaults to "matematik".
-    If no konu is provided, we fall back to the legacy
-    matematik_kazanimlari_124_154.json if present or the first JSON file.
-
-    For now, konu is not used to select a specific file; the file-level layout
-    remains the same. Filtering by konu is done after loading the nodes.
-    """
-
-    base = CURRICULUM_ROOT
-    subject = subject or "matematik"
-    subject_dir = base / subject
-    if not subject_dir.exists() or not subject_dir.is_dir():
-        raise FileNotFoundError(f"Curriculum subject '{subject}' not found")
-
-    if filename:
-        candidate = subject_dir / filename
-        if candidate.exists():
-            return candidate
-        raise FileNotFoundError(
-            f"Curriculum file '{filename}' not found for subject '{subject}'"
-        )
-
-    # Legacy default for matematik
-    legacy = subject_dir / "matematik_kazanimlari.json"
-    if legacy.exists():
-        return legacy
-
-    # Otherwise pick the first json file
-    for path in subject_dir.glob("*.json"):
-        return path
-
-    raise FileNotFoundError(f"No curriculum JSON found for subject '{subject}'")
-
-
 def _collect_descendants(
     nodes: list[dict[str, Any]],
     links: list[dict[str, Any]],
@@ -342,8 +324,8 @@ def _summarize_graph_payload(payload: dict[str, Any] | None) -> dict[str, Any] |
     if not isinstance(nodes, list) or not isinstance(links, list):
         return None
 
-    best_nodes = sorted(nodes, key=lambda n: _extract_score(n), reverse=True)[:5]
-    worst_nodes = sorted(nodes, key=_extract_score)[:5]
+    best_nodes = heapq.nlargest(5, nodes, key=_extract_score)
+    worst_nodes = heapq.nsmallest(5, nodes, key=_extract_score)
 
     return {
         "filters": payload.get("filters", {}),
@@ -368,7 +350,9 @@ def _summarize_graph_payload(payload: dict[str, Any] | None) -> dict[str, Any] |
     }
 
 
-def _graph_summary_to_text(summary: dict[str, Any]) -> str:
+def _graph_summary_to_text(
+    summary: dict[str, Any], relevant: list[dict[str, Any]] | None = None
+) -> str:
     filters = summary.get("filters") or {}
     stats = summary.get("stats") or {}
     subject = filters.get("subject") or "(seçilmemiş)"
@@ -386,24 +370,153 @@ def _graph_summary_to_text(summary: dict[str, Any]) -> str:
             parts.append(f"{label} (başarı: {score:.2f})")
         return ", ".join(parts)
 
-    return (
+    text = (
         "Öğrencinin şu an ekranda gördüğü grafik bağlamı:\n"
         f"- Ders (subject): {subject}\n"
         f"- Konu filtresi (konu): {konu}\n"
         f"- Toplam node sayısı: {node_count}, bağlantı sayısı: {link_count}\n"
-        f"- En yüksek başarı puanına sahip konular: {_fmt(summary.get('best_nodes', []))}\n"
-        f"- En düşük başarı puanına sahip konular: {_fmt(summary.get('worst_nodes', []))}\n"
+    )
+    if relevant:
+        lines = []
+        for node in relevant:
+            scores = f"başarı: {float(node['success']):.2f}"
+            if node.get("score") is not None:
+                scores += f", öğrencinin puanı: {node['score']:.2f}"
+            lines.append(f"  - {node['label']} ({scores})\n")
+        return text + "- Soruyla ilgili kazanımlar:\n" + "".join(lines)
+    return (
+        text
+        + f"- En yüksek başarı puanına sahip konular: {_fmt(summary.get('best_nodes', []))}\n"
+        + f"- En düşük başarı puanına sahip konular: {_fmt(summary.get('worst_nodes', []))}\n"
     )
 
 
-def _trim_chat_history(history: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    if not history:
-        return history
-    system_prompt = history[0]
-    tail = history[1:]
-    if len(tail) > MAX_CHAT_MESSAGES:
-        tail = tail[-MAX_CHAT_MESSAGES:]
-    return [system_prompt, *tail]
+def _graph_filter(params: Mapping[str, Any]) -> tuple[str | None, str | None]:
+    """Most specific konu/grup/alt_grup filter as ``(filter_type, slug)``."""
+    for filter_type in ("alt_grup", "grup", "konu"):
+        if params.get(filter_type):
+            return filter_type, str(params[filter_type])
+    return None, None
+
+
+def _graph_request_key(params: Mapping[str, Any]) -> str:
+    """Payload cache key of a graph request (includes the file signature).
+
+    Raises ``FileNotFoundError`` for unknown subjects or files.
+    """
+    subject = params.get("subject")
+    data_file = resolve_curriculum_file(subject, params.get("file"))
+    filter_type, filter_slug = _graph_filter(params)
+    return _graph_payload_cache_key(
+        data_file,
+        subject,
+        _parse_grade_param(params.get("grade")),
+        filter_type,
+        filter_slug,
+    )
+
+
+def _get_graph_payload(params: Mapping[str, Any]) -> dict[str, Any]:
+    """Filtered graph payload for ``/graph/data/`` query parameters, cached."""
+    subject = params.get("subject")
+    cache_key = _graph_request_key(params)
+    cached_payload = cache.get(cache_key)
+    if cached_payload is not None:
+        logger.info(
+            "graph-payload cache hit",
+            extra={"cache_key": cache_key, "subject": subject or "matematik"},
+        )
+        return cached_payload
+
+    data_file = resolve_curriculum_file(subject, params.get("file"))
+    allowed = _parse_grade_param(params.get("grade"))
+    filter_type, filter_slug = _graph_filter(params)
+    nodes, links = get_cached_graph_data(str(data_file))
+
+    if allowed:
+        nodes, links = _filter_by_grade(nodes, links, allowed)
+
+    konular = [
+        {
+            "id": n["id"],
+            "label": n.get("label") or n.get("name") or "",
+            "slug": _slugify(n.get("label") or n.get("name") or ""),
+        }
+        for n in nodes
+        if n.get("type") == "konu" or n.get("node_type") == "konu"
+    ]
+
+    if filter_slug:
+        root_ids = [
+            n["id"]
+            for n in nodes
+            if (
+                (n.get("type") == filter_type or n.get("node_type") == filter_type)
+                and _slugify(n.get("label") or n.get("name") or "") == filter_slug
+            )
+        ]
+        if root_ids:
+            nodes, links = _collect_descendants(nodes, links, root_ids)
+
+    node_types: dict[str, int] = {}
+    for node in nodes:
+        t = node.get("type") or node.get("node_type") or "unknown"
+        node_types[t] = node_types.get(t, 0) + 1
+
+    # Backwards-compatible response shape for existing clients/tests:
+    # top-level data{} with subject, file, nodes, links, node_types, konular
+    payload = {
+        "subject": subject,
+        "file": data_file.name,
+        "nodes": nodes,
+        "links": links,
+        "node_types": node_types,
+        "konular": konular,
+    }
+    cache.set(cache_key, payload, CACHE_TIMEOUT_SECONDS)
+    logger.info(
+        "graph-payload cache miss — rebuilt",
+        extra={
+            "cache_key": cache_key,
+            "subject": subject or "matematik",
+            "node_count": len(nodes),
+            "link_count": len(links),
+            "grades": sorted(list(allowed)) if allowed else [],
+            "filter_type": filter_type,
+            "filter_slug": filter_slug,
+        },
+    )
+    return payload
+
+
+def _get_graph_summary(params: Mapping[str, Any]) -> dict[str, Any] | None:
+    """Chat summary of the graph a client sees for the given filters.
+
+    Memoized next to the payload under the same key, so it follows curriculum
+    file changes; the payload itself is only loaded on a summary cache miss.
+    """
+    cache_key = "graph-summary:" + _graph_request_key(params)
+    summary = cache.get(cache_key)
+    if summary is None:
+        payload = _get_graph_payload(params)
+        summary = _summarize_graph_payload(
+            {
+                "filters": {
+                    "subject": params.get("subject") or "matematik",
+                    "konu": params.get("konu"),
+                },
+                "nodes": payload["nodes"],
+                "links": payload["links"],
+            }
+        )
+        # Restricts the question-relevant kazanımlar to the visible graph.
+        summary["kazanim_ids"] = [
+            node["id"]
+            for node in payload["nodes"]
+            if (node.get("type") or node.get("node_type")) == "kazanım"
+        ]
+        cache.set(cache_key, summary, CACHE_TIMEOUT_SECONDS)
+    return summary
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -439,7 +552,7 @@ class GraphSourcesAPIView(APIView):
             )
 
         try:
-            data_file = _resolve_curriculum_file(subject, None)
+            data_file = resolve_curriculum_file(subject, None)
             nodes, links = get_cached_graph_data(str(data_file))
 
             # Grade filter (same logic as GraphDataAPIView)
@@ -532,100 +645,8 @@ class GraphDataAPIView(APIView):
     permission_classes = (AllowAny,)
 
     def get(self, request: Request) -> Response:
-        subject = request.query_params.get("subject")
-        konu = request.query_params.get("konu")  # slug or empty
-        grup = request.query_params.get("grup")  # slug or empty
-        alt_grup = request.query_params.get("alt_grup")  # slug or empty
-        grade_param = request.query_params.get("grade")  # "9,10,11" gibi olabilir
-
-        filter_slug = None
-        filter_type = None
-        if alt_grup:
-            filter_slug = alt_grup
-            filter_type = "alt_grup"
-        elif grup:
-            filter_slug = grup
-            filter_type = "grup"
-        elif konu:
-            filter_slug = konu
-            filter_type = "konu"
-
         try:
-            data_file = _resolve_curriculum_file(
-                subject, request.query_params.get("file")
-            )
-            allowed = _parse_grade_param(grade_param)
-            cache_key = _graph_payload_cache_key(
-                data_file, subject, allowed, filter_type, filter_slug
-            )
-
-            cached_payload = cache.get(cache_key)
-            if cached_payload is not None:
-                logger.info(
-                    "graph-payload cache hit",
-                    extra={"cache_key": cache_key, "subject": subject or "matematik"},
-                )
-                return Response({"data": cached_payload}, status=status.HTTP_200_OK)
-
-            nodes, links = get_cached_graph_data(str(data_file))
-
-            if allowed:
-                nodes, links = _filter_by_grade(nodes, links, allowed)
-
-            konular = [
-                {
-                    "id": n["id"],
-                    "label": n.get("label") or n.get("name") or "",
-                    "slug": _slugify(n.get("label") or n.get("name") or ""),
-                }
-                for n in nodes
-                if n.get("type") == "konu" or n.get("node_type") == "konu"
-            ]
-
-            if filter_slug:
-                root_ids = [
-                    n["id"]
-                    for n in nodes
-                    if (
-                        (
-                            n.get("type") == filter_type
-                            or n.get("node_type") == filter_type
-                        )
-                        and _slugify(n.get("label") or n.get("name") or "")
-                        == filter_slug
-                    )
-                ]
-                if root_ids:
-                    nodes, links = _collect_descendants(nodes, links, root_ids)
-
-            node_types: dict[str, int] = {}
-            for node in nodes:
-                t = node.get("type") or node.get("node_type") or "unknown"
-                node_types[t] = node_types.get(t, 0) + 1
-
-            # Backwards-compatible response shape for existing clients/tests:
-            # top-level data{} with subject, file, nodes, links, node_types, konular
-            payload = {
-                "subject": subject,
-                "file": data_file.name,
-                "nodes": nodes,
-                "links": links,
-                "node_types": node_types,
-                "konular": konular,
-            }
-            cache.set(cache_key, payload, CACHE_TIMEOUT_SECONDS)
-            logger.info(
-                "graph-payload cache miss — rebuilt",
-                extra={
-                    "cache_key": cache_key,
-                    "subject": subject or "matematik",
-                    "node_count": len(nodes),
-                    "link_count": len(links),
-                    "grades": sorted(list(allowed)) if allowed else [],
-                    "filter_type": filter_type,
-                    "filter_slug": filter_slug,
-                },
-            )
+            payload = _get_graph_payload(request.query_params)
             return Response({"data": payload}, status=status.HTTP_200_OK)
 
         except FileNotFoundError as e:
@@ -649,7 +670,7 @@ class GraphNodesAPIView(APIView):
         filename = request.query_params.get("file")
         node_type_filter = request.query_params.get("type")
         try:
-            data_file = _resolve_curriculum_file(subject, filename)
+            data_file = resolve_curriculum_file(subject, filename)
             nodes, _ = get_cached_graph_data(str(data_file))
             if node_type_filter:
                 nodes = [n for n in nodes if n.get("type") == node_type_filter]
@@ -674,7 +695,7 @@ class GraphLinksAPIView(APIView):
         subject = request.query_params.get("subject")
         filename = request.query_params.get("file")
         try:
-            data_file = _resolve_curriculum_file(subject, filename)
+            data_file = resolve_curriculum_file(subject, filename)
             _, links = get_cached_graph_data(str(data_file))
             return Response(links, status=status.HTTP_200_OK)
         except FileNotFoundError as e:
@@ -697,7 +718,7 @@ class GraphStatsAPIView(APIView):
         subject = request.query_params.get("subject")
         filename = request.query_params.get("file")
         try:
-            data_file = _resolve_curriculum_file(subject, filename)
+            data_file = resolve_curriculum_file(subject, filename)
             nodes, links = get_cached_graph_data(str(data_file))
             node_count = len(nodes)
             link_count = len(links)
@@ -734,99 +755,405 @@ SYSTEM_PROMPT = (
 )
 
 
-# Groq istemcisini sadece paket ve API anahtarı mevcutsa başlat
-if Groq is not None and os.getenv("GROQ_API_KEY"):
-    groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-else:
-    groq_client = None
+CHAT_DISABLED_MESSAGE = (
+    "AI sohbet servisi şu anda etkin değil. Lütfen daha sonra tekrar deneyin."
+)
+CHAT_BUSY_MESSAGE = (
+    "AI sohbet servisi şu anda çok yoğun. Lütfen biraz sonra tekrar dene."
+)
+CHAT_PROVIDER_ERROR = "AI servisiyle iletişim kurulurken bir hata oluştu."
+CHAT_QUEUE_FULL_MESSAGE = (
+    "Önceki soruların hâlâ yanıtlanıyor. Lütfen onlar bitince tekrar dene."
+)
+CHAT_RATE_LIMITED_MESSAGE = "Çok sık soru gönderdin. Lütfen biraz bekleyip tekrar dene."
+CHAT_JOB_MAX_WAIT_SECONDS = 25.0
+CHAT_JOB_POLL_INTERVAL = 0.25
+
+
+def _parse_chat_body(raw: bytes) -> tuple[dict[str, Any] | None, JsonResponse | None]:
+    try:
+        body = json.loads(raw or b"{}")
+    except json.JSONDecodeError:
+        return None, JsonResponse({"error": "Invalid JSON body"}, status=400)
+    if not isinstance(body, dict) or not body.get("message"):
+        return None, JsonResponse({"error": "Message field is required"}, status=400)
+    filters = body.get("filters")
+    if filters is not None and (
+        not isinstance(filters, dict)
+        or any(not isinstance(value, (str, int)) for value in filters.values())
+    ):
+        return None, JsonResponse(
+            {"error": "filters must be an object of graph query parameters"},
+            status=400,
+        )
+    return body, None
+
+
+def _chat_filter_params(body: dict[str, Any]) -> dict[str, str] | None:
+    filters = body.get("filters")
+    if not filters:
+        return None
+    return {key: str(value) for key, value in filters.items() if value}
+
+
+def _chat_graph_summary(body: dict[str, Any]) -> dict[str, Any] | None:
+    """Graph summary for a chat message.
+
+    Clients send the ``/graph/data/`` query parameters as ``filters`` and the
+    summary is built from the server-side graph cache. A ``graph`` object is
+    still accepted from older clients, but only in its summarized form.
+    """
+    params = _chat_filter_params(body)
+    if params is not None:
+        try:
+            return _get_graph_summary(params)
+        except FileNotFoundError as exc:
+            logger.warning("Chat graph context unavailable: %s", exc)
+            return None
+    graph = body.get("graph")
+    if isinstance(graph, dict) and {"stats", "best_nodes", "worst_nodes"} <= set(graph):
+        return graph
+    return None
+
+
+def _relevant_chat_nodes(
+    user, body: dict[str, Any], summary: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """Kazanımlar of the visible graph that match the question, if any.
+
+    Only for server-built summaries; without a match the prompt falls back to
+    the best/worst nodes of the view.
+    """
+    params = _chat_filter_params(body)
+    if params is None:
+        return []
+    allowed = summary.get("kazanim_ids")
+    try:
+        return relevant_nodes(
+            str(body["message"]),
+            params.get("subject"),
+            params.get("file"),
+            allowed=None if allowed is None else set(allowed),
+            user=user,
+        )
+    except FileNotFoundError:
+        return []
+
+
+def _build_chat_context(user, body: dict[str, Any]) -> str:
+    """Graph summary and (for signed-in students) focus lists for the prompt."""
+    context_parts = []
+    summary = _chat_graph_summary(body)
+    if summary:
+        relevant = _relevant_chat_nodes(user, body, summary)
+        context_parts.append(_graph_summary_to_text(summary, relevant))
+    if user is not None and user.is_authenticated:
+        focus = get_focus(user)
+        if focus["weakest"]:
+            context_parts.append(focus_to_text(focus))
+    return "\n".join(context_parts)
+
+
+@dataclass
+class _ChatTurn:
+    owner: str
+    question: str
+    context: str
+    messages: list[dict[str, Any]]
+    timer: ChatTimer
+    reply_key: str | None = None
+    cached_reply: str | None = None
+
+
+def _start_chat_turn(
+    session, user, body: dict[str, Any], timer: ChatTimer
+) -> _ChatTurn:
+    """Build the token-budgeted prompt of the stored history plus the question.
+
+    First turns also get a reply cache key (later turns depend on the
+    conversation) and the cached reply if there is one.
+    """
+    with timer.span("history_read"):
+        owner = chat_history_owner(user, session)
+        history, summary = load_chat_turns(owner)
+        first_turn = not history
+        session.pop("chat_history", None)  # pre-store session histories
+
+    question = str(body["message"])
+    with timer.span("context"):
+        context = _build_chat_context(user, body)
+    with timer.span("prompt"):
+        messages = build_chat_prompt(
+            SYSTEM_PROMPT, [*history, ("user", question, context)], summary
+        )
+    timer.tokens["prompt_tokens"] = prompt_tokens(messages)
+    turn = _ChatTurn(owner, question, context, messages, timer)
+    if first_turn:
+        with timer.span("reply_cache"):
+            turn.reply_key = reply_cache_key(question, context)
+            turn.cached_reply = get_cached_reply(turn.reply_key)
+    return turn
+
+
+def _finish_chat_turn(turn: _ChatTurn, reply: str) -> None:
+    turn.timer.tokens["completion_tokens"] = estimate_tokens(reply)
+    with turn.timer.span("history_write"):
+        append_chat_turns(
+            turn.owner,
+            [("user", turn.question, turn.context), ("assistant", reply, "")],
+        )
 
 
 @method_decorator(csrf_exempt, name="dispatch")
 class ChatbotAPIView(APIView):
-    """Kullanıcının sorusunu ve o anki grafik görünümünü Groq modeline ileten sohbet endpoint'i.
+    """Kullanıcının sorusunu ve o anki grafik görünümünü LLM sağlayıcısına ileten sohbet endpoint'i.
 
-    groq paketi veya API anahtarı yoksa, HTTP 503 ile zarifçe devre dışı kalır.
+    Sağlayıcı yapılandırılmamışsa (groq paketi veya API anahtarı yoksa) ya da
+    bütün sağlayıcı slotları doluysa HTTP 503 ile zarifçe reddeder.
     """
 
     permission_classes = (AllowAny,)
+    throttle_classes = (SlidingWindowThrottle,)
+    throttle_scope = "chat"
 
     def post(self, request):
-        if groq_client is None:
+        provider = get_llm_provider()
+        if provider is None:
+            return JsonResponse({"error": CHAT_DISABLED_MESSAGE}, status=503)
+
+        timer = ChatTimer("graph-chat")
+        try:
+            with timer.span("parse"):
+                body, error = _parse_chat_body(request.body)
+            if error is not None:
+                timer.outcome = "invalid"
+                return error
+
+            turn = _start_chat_turn(request.session, request.user, body, timer)
+            return self._respond(provider, turn, body)
+        except BaseException:
+            timer.outcome = "error"
+            raise
+        finally:
+            timer.finish()
+
+    def throttled(self, request, wait):
+        raise Throttled(wait, detail=CHAT_RATE_LIMITED_MESSAGE)
+
+    def _respond(
+        self, provider: LLMProvider, turn: _ChatTurn, body: dict[str, Any]
+    ) -> JsonResponse:
+        timer = turn.timer
+        if turn.cached_reply is not None:
+            timer.outcome = "cached"
+            _finish_chat_turn(turn, turn.cached_reply)
+            return JsonResponse({"reply": turn.cached_reply, "cached": True})
+
+        if body.get("async"):
+            timer.outcome = "queued"
+            return self._enqueue(turn)
+
+        try:
+            with timer.span("llm"):
+                assistant_reply = complete_coalesced(provider, turn.messages)
+        except LLMUnavailable:
+            timer.outcome = "busy"
+            return JsonResponse({"error": CHAT_BUSY_MESSAGE}, status=503)
+        except LLMError as exc:  # sağlayıcı tarafındaki hata
+            timer.outcome = "error"
             return JsonResponse(
-                {
-                    "error": "AI sohbet servisi şu anda etkin değil. Lütfen daha sonra tekrar deneyin.",
-                },
-                status=503,
+                {"error": CHAT_PROVIDER_ERROR, "detail": str(exc)}, status=502
             )
 
+        if not assistant_reply:
+            assistant_reply = CHAT_FALLBACK_REPLY
+        elif turn.reply_key:
+            with timer.span("reply_cache"):
+                store_reply(turn.reply_key, assistant_reply)
+
+        # Soru ve yanıtı geçmişe ekle
+        _finish_chat_turn(turn, assistant_reply)
+
+        return JsonResponse({"reply": assistant_reply})
+
+    def _enqueue(self, turn: _ChatTurn) -> JsonResponse:
+        """Queue the completion for ``run_chat_workers`` and return its id."""
         try:
-            body = json.loads(request.body or b"{}")
-        except json.JSONDecodeError:
-            return JsonResponse({"error": "Invalid JSON body"}, status=400)
+            job = enqueue_chat_job(
+                turn.owner,
+                turn.question,
+                turn.context,
+                turn.messages,
+                turn.reply_key or "",
+            )
+        except ChatQueueFull:
+            return JsonResponse({"error": CHAT_QUEUE_FULL_MESSAGE}, status=429)
+        return JsonResponse(
+            {
+                "job_id": str(job.pk),
+                "status": job.status,
+                "poll_url": reverse("artifacts:graph-chat-job", args=[job.pk]),
+            },
+            status=202,
+        )
 
-        user_message = body.get("message")
-        graph_payload = body.get("graph")  # summarized graph context from frontend
+    def get(self, request):
+        return JsonResponse({"error": "Only POST allowed"}, status=405)
 
-        if not user_message:
-            return JsonResponse({"error": "Message field is required"}, status=400)
 
-        # Session'da mesaj geçmişi yoksa oluştur
-        if "chat_history" not in request.session:
-            request.session["chat_history"] = [
-                {"role": "system", "content": SYSTEM_PROMPT}
-            ]
+def _sse_event(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-        chat_history = request.session["chat_history"]
 
-        # Grafiği özetleyip kullanıcı mesajına ek context olarak işliyoruz
-        enriched_user_message = user_message
-        summary = _summarize_graph_payload(graph_payload)
-        if summary:
-            graph_text = _graph_summary_to_text(summary)
-            enriched_user_message = (
-                graph_text + "\n\nKullanıcının sorusu:\n" + str(user_message)
-            )
+def _chat_rate_limit_wait(request, user) -> float:
+    """Apply the ``chat`` limits that ``ChatbotAPIView`` gets from its throttle."""
+    return hit("chat", request_idents(request, user))
 
-        # Yeni kullanıcı mesajını ekle
-        chat_history.append({"role": "user", "content": enriched_user_message})
-        chat_history = _trim_chat_history(chat_history)
 
-        try:
-            response = groq_client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=chat_history,
-                temperature=0.4,
-                top_p=0.9,
-                max_tokens=500,
-            )
-        except Exception as exc:  # Groq tarafındaki hata
-            return JsonResponse(
-                {
-                    "error": "AI servisiyle iletişim kurulurken bir hata oluştu.",
-                    "detail": str(exc),
-                },
-                status=502,
-            )
+async def _resolve_token_user(request):
+    """Mirror the API's token authentication for the plain async views.
 
-        choice = response.choices[0]
-        content = getattr(choice, "message", None)
-        if isinstance(content, dict):
-            assistant_reply = content.get("content", "")
-        else:
-            assistant_reply = getattr(content, "content", "") or ""
+    Returns ``None`` when no token is sent. A malformed or unknown token raises
+    ``AuthenticationFailed`` instead of falling back to the session user.
+    """
+    auth = request.headers.get("Authorization", "").split()
+    if not auth or auth[0].lower() != "token":
+        return None
+    if len(auth) != 2:
+        raise AuthenticationFailed("Invalid token header.")
+    authenticate = CachedTokenAuthentication().authenticate_credentials
+    user, _ = await sync_to_async(authenticate)(auth[1])
+    return user
 
-        if not assistant_reply:
-            assistant_reply = "Şu anda net bir yanıt oluşturamadım, sorunu biraz daha ayrıntılı anlatabilir misin?"
 
-        # Yanıtı geçmişe ekle
-        chat_history.append({"role": "assistant", "content": assistant_reply})
-        chat_history = _trim_chat_history(chat_history)
-        request.session["chat_history"] = chat_history
+def _csrf_failure(request) -> str | None:
+    """Run Django's CSRF check the way DRF's ``SessionAuthentication`` does."""
+    check = CSRFCheck(lambda request: None)
+    check.process_request(request)
+    return check.process_view(request, None, (), {})
 
-        return JsonResponse({"reply": assistant_reply})
 
-    def get(self, request):
-        return JsonResponse({"error": "Only POST allowed"}, status=405)
+async def _authenticate_async_view(request):
+    """Resolve the user of a plain async view as the API views would.
+
+    Returns ``(user, None)`` or ``(None, error_response)``: 401 for a bad token
+    and 403 when a logged-in session sends an unsafe request without a valid
+    CSRF token.
+    """
+    try:
+        user = await _resolve_token_user(request)
+    except AuthenticationFailed as exc:
+        return None, JsonResponse({"detail": str(exc.detail)}, status=401)
+    if user is not None:
+        return user, None
+
+    user = await request.auser()
+    if user.is_authenticated:
+        reason = await sync_to_async(_csrf_failure)(request)
+        if reason:
+            return None, JsonResponse({"detail": f"CSRF Failed: {reason}"}, status=403)
+    return user, None
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class ChatbotStreamView(View):
+    """Async chat endpoint streaming the model's answer as server-sent events.
+
+    Emits ``token`` events with text deltas, then a single ``done`` event with
+    the full reply (or an ``error`` event). The provider call is awaited, so a
+    slow completion does not hold a worker thread when served over ASGI.
+    """
+
+    http_method_names = ["post"]
+
+    async def post(self, request):
+        provider = get_llm_provider()
+        if provider is None:
+            return JsonResponse({"error": CHAT_DISABLED_MESSAGE}, status=503)
+
+        timer = ChatTimer("graph-chat-stream")
+        streaming = False  # from then on ``_stream`` finishes the timer
+        try:
+            user, error = await _authenticate_async_view(request)
+            if error is not None:
+                timer.outcome = "unauthorized"
+                return error
+
+            with timer.span("parse"):
+                body, error = _parse_chat_body(request.body)
+            if error is not None:
+                timer.outcome = "invalid"
+                return error
+
+            wait = await sync_to_async(_chat_rate_limit_wait)(request, user)
+            if wait:
+                timer.outcome = "throttled"
+                response = JsonResponse(
+                    {"error": CHAT_RATE_LIMITED_MESSAGE}, status=429
+                )
+                response["Retry-After"] = str(math.ceil(wait))
+                return response
+            turn = await sync_to_async(_start_chat_turn)(
+                request.session, user, body, timer
+            )
+
+            response = StreamingHttpResponse(
+                self._stream(provider, turn),
+                content_type="text/event-stream",
+            )
+            response["Cache-Control"] = "no-cache"
+            response["X-Accel-Buffering"] = "no"
+            streaming = True
+            return response
+        except BaseException:
+            timer.outcome = "error"
+            raise
+        finally:
+            if not streaming:
+                await sync_to_async(timer.finish)()
+
+    async def _stream(self, provider: LLMProvider, turn: _ChatTurn):
+        try:
+            async for event in self._events(provider, turn):
+                yield event
+        finally:
+            await sync_to_async(turn.timer.finish)()
+
+    async def _events(self, provider: LLMProvider, turn: _ChatTurn):
+        timer = turn.timer
+        if turn.cached_reply is not None:
+            timer.outcome = "cached"
+            await sync_to_async(_finish_chat_turn)(turn, turn.cached_reply)
+            yield _sse_event("token", {"text": turn.cached_reply})
+            yield _sse_event("done", {"reply": turn.cached_reply, "cached": True})
+            return
+
+        parts: list[str] = []
+        started = time.perf_counter()
+        try:
+            async for delta in stream_coalesced(provider, turn.messages):
+                if not parts:
+                    timer.add("llm_first_token", (time.perf_counter() - started) * 1000)
+                parts.append(delta)
+                yield _sse_event("token", {"text": delta})
+        except LLMUnavailable:
+            timer.outcome = "busy"
+            yield _sse_event("error", {"error": CHAT_BUSY_MESSAGE})
+            return
+        except LLMError as exc:  # sağlayıcı tarafındaki hata
+            timer.outcome = "error"
+            logger.warning("Chat stream failed: %s", exc)
+            yield _sse_event("error", {"error": CHAT_PROVIDER_ERROR})
+            return
+        finally:
+            timer.add("llm", (time.perf_counter() - started) * 1000)
+
+        assistant_reply = "".join(parts) or CHAT_FALLBACK_REPLY
+        await sync_to_async(_finish_chat_turn)(turn, assistant_reply)
+        if parts and turn.reply_key:
+            with timer.span("reply_cache"):
+                await sync_to_async(store_reply)(turn.reply_key, assistant_reply)
+        yield _sse_event("done", {"reply": assistant_reply})
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -846,7 +1173,7 @@ class AnalyticsProgressAPIView(APIView):
         konu = request.query_params.get("konu")  # slug or empty
 
         try:
-            data_file = _resolve_curriculum_file(
+            data_file = resolve_curriculum_file(
                 subject, request.query_params.get("file")
             )
             nodes, links = get_cached_graph_data(str(data_file))
@@ -923,3 +1250,249 @@ class AnalyticsProgressAPIView(APIView):
             "kazanims": kazanims,
         }
         return Response(payload, status=status.HTTP_200_OK)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AnalyticsScoresAPIView(APIView):
+    """Record the authenticated student's scores on curriculum nodes.
+
+    Body: {"subject": "matematik", "scores": {"<node_id>": 0-100, ...}}
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request: Request) -> Response:
+        serializer = ScoreIngestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        subject = serializer.validated_data["subject"]
+        scores = serializer.validated_data["scores"]
+        try:
+            rows = ingest_scores(request.user, subject, scores)
+        except FileNotFoundError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {"subject": subject, "updated": len(rows)}, status=status.HTTP_200_OK
+        )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AnalyticsCohortAPIView(APIView):
+    """Average scores of a grade/track cohort per kazanım or konu.
+
+    Query params: subject, grade, track (default to the requesting user's
+    profile) and group_by=kazanim|konu.
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request: Request) -> Response:
+        serializer = CohortQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        params = serializer.validated_data
+        grade = params.get("grade") or request.user.grade
+        track = params.get("track") or request.user.track
+        if not grade:
+            return Response(
+                {"detail": "grade parametresi zorunludur."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            payload = get_cohort_averages(
+                params["subject"], grade, track, params["group_by"]
+            )
+        except FileNotFoundError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        return Response(payload, status=status.HTTP_200_OK)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AnalyticsRankAPIView(APIView):
+    """Percentile of the requesting student among peers of the same grade/track.
+
+    Query params: subject and either node_id (kazanım) or konu (konu label).
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request: Request) -> Response:
+        serializer = RankQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        if request.user.grade is None:
+            return Response(
+                {"detail": "Sıralama için profilde sınıf bilgisi bulunmalıdır."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        params = serializer.validated_data
+        rank = get_student_rank(
+            request.user,
+            params["subject"],
+            node_id=params.get("node_id"),
+            konu=params.get("konu"),
+        )
+        if rank is None:
+            return Response(
+                {"detail": "Bu kazanım veya konu için henüz puanınız yok."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(rank, status=status.HTTP_200_OK)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AnalyticsExportAPIView(APIView):
+    """Stream every stored kazanım score as CSV (staff only).
+
+    Optional query params: subject, grade, track. Rows are produced in chunks,
+    so the response never materializes the full export in memory.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request: Request) -> StreamingHttpResponse | Response:
+        grade_param = request.query_params.get("grade")
+        try:
+            grade = int(grade_param) if grade_param else None
+        except ValueError:
+            return Response(
+                {"detail": "grade parametresi sayı olmalıdır."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        subject = request.query_params.get("subject")
+        rows = iter_export_rows(
+            subject=subject, grade=grade, track=request.query_params.get("track")
+        )
+        # Under ASGI a sync iterator would be collected in full before sending.
+        is_asgi = isinstance(request._request, ASGIRequest)
+        response = StreamingHttpResponse(
+            aiter_csv(rows) if is_asgi else iter_csv(rows),
+            content_type="text/csv; charset=utf-8",
+        )
+        # Client input: quotes, CR/LF or non-ASCII must not reach the header.
+        label = slugify(subject or "") or "all"
+        filename = f"kazanim-scores-{label}-{date.today().isoformat()}.csv"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AnalyticsFocusAPIView(APIView):
+    """Weakest and strongest kazanımlar of the requesting student, all subjects.
+
+    Query params: k (1-10, default 5).
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request: Request) -> Response:
+        try:
+            k = int(request.query_params.get("k") or 5)
+        except ValueError:
+            k = 0
+        if not 1 <= k <= FOCUS_HEAP_SIZE:
+            return Response(
+                {
+                    "detail": f"k parametresi 1 ile {FOCUS_HEAP_SIZE} arasında olmalıdır."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(get_focus(request.user, k), status=status.HTTP_200_OK)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AnalyticsLookupAPIView(APIView):
+    """Labels and success values for an explicit list of node ids.
+
+    Body: {"ids": {"matematik": ["kznm_9_1_1_1", ...], ...}}. The student's own
+    score is included when the request is authenticated.
+    """
+
+    permission_classes = (AllowAny,)
+
+    def post(self, request: Request) -> Response:
+        serializer = NodeLookupSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        payload = lookup_nodes(serializer.validated_data["ids"], user=request.user)
+        return Response(payload, status=status.HTTP_200_OK)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class ChatMetricsAPIView(APIView):
+    """Latency histograms of the chat pipeline per phase (staff only).
+
+    Phases are the spans logged as ``chat timings`` (parse, history_read,
+    context, prompt, reply_cache, llm, llm_first_token, history_write) plus
+    ``total``, which also counts the requests slower than the latency SLO.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request: Request) -> Response:
+        return Response(
+            {
+                "slo_ms": settings.CHAT_LATENCY_SLO_MS,
+                "phases": get_chat_metrics(),
+                "reply_cache": get_chat_cache_stats(),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+def _job_payload(job: ChatJob) -> dict[str, Any]:
+    payload = {"job_id": str(job.pk), "status": job.status, "attempts": job.attempts}
+    if job.status == ChatJob.STATUS_DONE:
+        payload["reply"] = job.reply
+    elif job.status == ChatJob.STATUS_FAILED:
+        payload["error"] = CHAT_PROVIDER_ERROR
+    return payload
+
+
+class ChatJobView(View):
+    """Status and reply of a queued chat job (``"async": true`` chat requests).
+
+    ``?wait=<seconds>`` long-polls until the job finishes, up to
+    ``CHAT_JOB_MAX_WAIT_SECONDS``; the wait is an ``asyncio.sleep`` loop so it
+    does not hold a worker thread when served over ASGI. Jobs are only visible
+    to the chat owner that queued them.
+    """
+
+    http_method_names = ["get"]
+
+    async def get(self, request, job_id):
+        user, error = await _authenticate_async_view(request)
+        if error is not None:
+            return error
+        if user.is_authenticated:
+            owner = f"user:{user.pk}"
+        else:
+            chat_id = await sync_to_async(request.session.get)("chat_id")
+            owner = f"session:{chat_id}" if chat_id else None
+
+        try:
+            wait = float(request.GET.get("wait", 0))
+        except ValueError:
+            wait = math.nan
+        if not math.isfinite(wait):
+            return JsonResponse({"error": "wait must be a number"}, status=400)
+        deadline = time.monotonic() + min(max(wait, 0.0), CHAT_JOB_MAX_WAIT_SECONDS)
+
+        jobs = ChatJob.objects.filter(pk=job_id, owner=owner or "")
+        while True:
+            job = await jobs.afirst()
+            if job is None:
+                return JsonResponse({"error": "Chat job not found"}, status=404)
+            finished = job.status in (ChatJob.STATUS_DONE, ChatJob.STATUS_FAILED)
+            if finished or time.monotonic() >= deadline:
+                return JsonResponse(_job_payload(job))
+            await asyncio.sleep(CHAT_JOB_POLL_INTERVAL)
@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+"""
+ASGI config for BayKoc backend project.
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+
+application = get_asgi_application()
@@ -42,6 +42,7 @@ def build_absolute_uri(base_url: str, path: str) -> str:
         normalized_path = f"/{normalized_path}"
     return f"{base}{normalized_path}"
 
+
 ENVIRONMENT = config("DJANGO_ENV", default="development")
 IS_PRODUCTION = ENVIRONMENT == "production"
 
@@ -102,6 +103,15 @@ else:
     STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
 
 MEDIA_URL = "/media/"
+MEDIA_ROOT = config("MEDIA_ROOT", default=str(BASE_DIR / "media"))
+
+# Profile picture uploads wait here (shared with the worker) until resized
+PROFILE_PICTURE_STAGING_DIR = config(
+    "PROFILE_PICTURE_STAGING_DIR", default=str(BASE_DIR / "var" / "profile_uploads")
+)
+PROFILE_PICTURE_MAX_BYTES = config(
+    "PROFILE_PICTURE_MAX_BYTES", default=5 * 1024 * 1024, cast=int
+)
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
@@ -133,6 +143,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "backend.wsgi.application"
+ASGI_APPLICATION = "backend.asgi.application"
 
 # Database
 DATABASES = {
@@ -199,7 +210,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "backend.users.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
@@ -211,6 +222,32 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 100,
+    # Reverse proxies in front of Django (nginx); client IPs for rate limits are
+    # read from the X-Forwarded-For entry the outermost one appended.
+    "NUM_PROXIES": config("NUM_PROXIES", default=1, cast=int),
+}
+
+# Seconds an API token -> user lookup is served from the cache
+TOKEN_AUTH_CACHE_SECONDS = config("TOKEN_AUTH_CACHE_SECONDS", default=300, cast=int)
+
+# Sliding-window limits per view scope, keyed by client IP, submitted email or
+# authenticated user (see backend/throttling.py). Rates are "<count>/<period>".
+RATE_LIMITS = {
+    "login": {
+        "ip": config("RATE_LIMIT_LOGIN_IP", default="30/min"),
+        "email": config("RATE_LIMIT_LOGIN_EMAIL", default="10/min"),
+    },
+    "register": {
+        "ip": config("RATE_LIMIT_REGISTER_IP", default="10/hour"),
+    },
+    "forgot-password": {
+        "ip": config("RATE_LIMIT_FORGOT_PASSWORD_IP", default="20/hour"),
+        "email": config("RATE_LIMIT_FORGOT_PASSWORD_EMAIL", default="5/hour"),
+    },
+    "chat": {
+        "ip": config("RATE_LIMIT_CHAT_IP", default="60/min"),
+        "user": config("RATE_LIMIT_CHAT_USER", default="20/min"),
+    },
 }
 
 FRONTEND_URL = config("FRONTEND_URL", default="http://localhost:5173")
@@ -241,9 +278,7 @@ GOOGLE_OAUTH_STATE_MAX_AGE = config("GOOGLE_OAUTH_STATE_MAX_AGE", default=300, c
 # CORS settings (dev: allow Vite; prod: restrict origins)
 if DEBUG:
     CORS_ALLOW_ALL_ORIGINS = True
-    CORS_ALLOWED_ORIGINS = list(
-        dict.fromkeys(FRONTEND_ORIGINS + DEV_FRONTEND_ORIGINS)
-    )
+    CORS_ALLOWED_ORIGINS = list(dict.fromkeys(FRONTEND_ORIGINS + DEV_FRONTEND_ORIGINS))
 else:
     CORS_ALLOW_ALL_ORIGINS = False
     CORS_ALLOWED_ORIGINS = FRONTEND_ORIGINS
@@ -263,10 +298,32 @@ EMAIL_BACKEND = config(
     default="django.core.mail.backends.console.EmailBackend",
 )
 DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL", default="noreply@baykoc.com")
+# SMTP server used by the outbox sender (manage.py send_outbox_emails)
+EMAIL_HOST = config("EMAIL_HOST", default="localhost")
+EMAIL_PORT = config("EMAIL_PORT", default=25, cast=int)
+EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
+EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
+EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=False, cast=bool)
+EMAIL_TIMEOUT = config("EMAIL_TIMEOUT", default=10, cast=int)
 
 # Points to /app/data/curriculum in Docker and <repo>/backend/data/curriculum locally
 CURRICULUM_DIR = (BASE_DIR / "data" / "curriculum").resolve()
 
+# Chat LLM provider ("groq" or the offline "stub")
+GROQ_API_KEY = config("GROQ_API_KEY", default="")
+LLM_PROVIDER = config("LLM_PROVIDER", default="groq")
+LLM_MODEL = config("LLM_MODEL", default="llama-3.3-70b-versatile")
+LLM_MAX_CONCURRENCY = config("LLM_MAX_CONCURRENCY", default=8, cast=int)
+LLM_QUEUE_TIMEOUT_SECONDS = config("LLM_QUEUE_TIMEOUT_SECONDS", default=5.0, cast=float)
+LLM_TIMEOUT_SECONDS = config("LLM_TIMEOUT_SECONDS", default=30.0, cast=float)
+LLM_HEDGE_AFTER_SECONDS = config("LLM_HEDGE_AFTER_SECONDS", default=8.0, cast=float)
+LLM_MAX_ATTEMPTS = config("LLM_MAX_ATTEMPTS", default=2, cast=int)
+# Requests per process waiting on an identical prompt answered by another worker
+LLM_MAX_WAITING_FOLLOWERS = config("LLM_MAX_WAITING_FOLLOWERS", default=16, cast=int)
+LLM_STUB_DELAY_SECONDS = config("LLM_STUB_DELAY_SECONDS", default=0.0, cast=float)
+# Chat requests slower than this are logged as warnings and counted as SLO misses
+CHAT_LATENCY_SLO_MS = config("CHAT_LATENCY_SLO_MS", default=8000, cast=int)
+
 # Verification / reset config
 VERIFICATION_CODE_EXPIRY_MINUTES = config(
     "VERIFICATION_CODE_EXPIRY_MINUTES", default=30, cast=int
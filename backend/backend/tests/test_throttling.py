@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""Tests for the sliding-window rate limits of the auth and chat endpoints."""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from backend.throttling import hit, parse_rate
+
+LIMITS = {
+    "login": {"ip": "4/min", "email": "2/min"},
+    "forgot-password": {"ip": "5/min", "email": "1/hour"},
+    "chat": {"ip": "2/min"},
+}
+
+
+@override_settings(RATE_LIMITS=LIMITS)
+class SlidingWindowThrottleTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("20/min"), (20, 60))
+        self.assertEqual(parse_rate("3/hour"), (3, 3600))
+        self.assertEqual(parse_rate("1/s"), (1, 1))
+
+    def test_window_slides(self):
+        with mock.patch("backend.throttling.time.time", return_value=1000.0):
+            self.assertEqual(hit("chat", {"ip": "1.2.3.4"}), 0)
+        with mock.patch("backend.throttling.time.time", return_value=1030.0):
+            self.assertEqual(hit("chat", {"ip": "1.2.3.4"}), 0)
+            # The oldest hit leaves the window 30 seconds from now.
+            self.assertEqual(hit("chat", {"ip": "1.2.3.4"}), 30)
+            self.assertEqual(hit("chat", {"ip": "5.6.7.8"}), 0)
+        with mock.patch("backend.throttling.time.time", return_value=1060.5):
+            self.assertEqual(hit("chat", {"ip": "1.2.3.4"}), 0)
+
+    def test_login_is_limited_per_email_and_ip(self):
+        url = reverse("users:user-login")
+        for _ in range(2):
+            resp = self.client.post(url, {"email": "a@example.com", "password": "x"})
+            self.assertEqual(resp.status_code, 400)
+        resp = self.client.post(url, {"email": "A@example.com ", "password": "x"})
+        self.assertEqual(resp.status_code, 429)
+        self.assertGreater(int(resp["Retry-After"]), 0)
+
+        # Another email is still accepted until the IP limit is reached.
+        for _ in range(2):
+            resp = self.client.post(url, {"email": "b@example.com", "password": "x"})
+            self.assertEqual(resp.status_code, 400)
+        resp = self.client.post(url, {"email": "c@example.com", "password": "x"})
+        self.assertEqual(resp.status_code, 429)
+        resp = self.client.post(
+            url, {"email": "d@example.com", "password": "x"}, REMOTE_ADDR="10.0.0.9"
+        )
+        self.assertEqual(resp.status_code, 400)
+
+    def test_spoofed_forwarded_for_does_not_reset_the_ip_limit(self):
+        url = reverse("users:user-login")
+        for attempt in range(5):
+            # nginx appends the real peer address to whatever the client sent.
+            resp = self.client.post(
+                url,
+                {"email": f"user{attempt}@example.com", "password": "x"},
+                HTTP_X_FORWARDED_FOR=f"198.51.100.{attempt}, 203.0.113.7",
+            )
+        self.assertEqual(resp.status_code, 429)
+
+    def test_forgot_password_is_limited_per_email(self):
+        url = reverse("users:forgot-password")
+        resp = self.client.post(url, {"email": "nobody@example.com"})
+        self.assertNotEqual(resp.status_code, 429)
+        resp = self.client.post(url, {"email": "nobody@example.com"})
+        self.assertEqual(resp.status_code, 429)
+        self.assertGreater(int(resp["Retry-After"]), 3500)
+
+    def test_chat_endpoints_share_the_limit(self):
+        payload = {"message": "Merhaba"}
+        with mock.patch("backend.artifacts.views.get_llm_provider", return_value=None):
+            for _ in range(2):
+                resp = self.client.post(
+                    reverse("artifacts:graph-chat"),
+                    payload,
+                    content_type="application/json",
+                )
+                self.assertEqual(resp.status_code, 503)
+            resp = self.client.post(
+                reverse("artifacts:graph-chat"),
+                payload,
+                content_type="application/json",
+            )
+            self.assertEqual(resp.status_code, 429)
+            self.assertIn("Retry-After", resp)
+        with mock.patch(
+            "backend.artifacts.views.get_llm_provider", return_value=object()
+        ):
+            resp = self.client.post(
+                reverse("artifacts:graph-chat-stream"),
+                payload,
+                content_type="application/json",
+            )
+        self.assertEqual(resp.status_code, 429)
+        self.assertIn("error", resp.json())
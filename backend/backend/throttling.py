@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Sliding-window rate limits for the auth and chat endpoints.
+
+Limits are configured per scope in ``settings.RATE_LIMITS``, e.g.
+``{"login": {"ip": "20/min", "email": "10/min"}}``; a view opts in with
+``throttle_classes = (SlidingWindowThrottle,)`` and ``throttle_scope``.
+Every key of a scope is checked and recorded by one Lua script, so a request
+costs a single Redis round trip however many limits apply.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+import uuid
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+try:
+    from django_redis import get_redis_connection  # type: ignore
+except Exception:  # pragma: no cover - defensive import
+    get_redis_connection = None  # type: ignore[assignment]
+
+RATE_LIMIT_KEY = "ratelimit:{scope}:{key_by}:{digest}"
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# KEYS: one sorted set per limit; ARGV: now_ms, member, then limit/window_ms
+# pairs. Returns 0 after recording the hit, or the ms until every limit has
+# room again (nothing is recorded then).
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[1 + 2 * i])
+    local window = tonumber(ARGV[2 + 2 * i])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    local count = redis.call('ZCARD', key)
+    if count >= limit then
+        local entry = redis.call('ZRANGE', key, count - limit, count - limit, 'WITHSCORES')
+        wait = math.max(wait, tonumber(entry[2]) + window - now)
+    end
+end
+if wait > 0 then
+    return wait
+end
+for i, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[2])
+    redis.call('PEXPIRE', key, ARGV[2 + 2 * i])
+end
+return 0
+"""
+
+_scripts: dict[int, object] = {}
+_fallback_lock = threading.Lock()
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """``"20/min"`` -> ``(20, 60)``: allowed requests and window in seconds."""
+    count, period = rate.split("/")
+    return int(count), PERIODS[period.strip()[0].lower()]
+
+
+def _redis():
+    if get_redis_connection is None:
+        return None
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+def _script(client):
+    script = _scripts.get(id(client))
+    if script is None:
+        script = _scripts[id(client)] = client.register_script(SLIDING_WINDOW_SCRIPT)
+    return script
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()[:32]
+
+
+def hit(scope: str, idents: Mapping[str, str | None]) -> float:
+    """Record a request of ``scope``; returns 0 or the seconds to wait.
+
+    ``idents`` maps a limit key (``ip``, ``email``, ``user``) to the value of
+    the current request; keys without a value or without a configured rate
+    are skipped.
+    """
+    limits = []
+    for key_by, rate in settings.RATE_LIMITS.get(scope, {}).items():
+        ident = idents.get(key_by)
+        if not ident:
+            continue
+        key = RATE_LIMIT_KEY.format(scope=scope, key_by=key_by, digest=_digest(ident))
+        limits.append((key, *parse_rate(rate)))
+    if not limits:
+        return 0.0
+
+    now_ms = int(time.time() * 1000)
+    client = _redis()
+    if client is not None:
+        keys = [cache.make_key(key) for key, _, _ in limits]
+        args = [now_ms, uuid.uuid4().hex]
+        for _, count, window in limits:
+            args += [count, window * 1000]
+        return int(_script(client)(keys=keys, args=args)) / 1000
+
+    # Other cache backends (tests, local development) keep the same sliding
+    # window as timestamp lists; atomic only within one process.
+    with _fallback_lock:
+        wait_ms = 0
+        windows = {}
+        for key, count, window in limits:
+            hits = [t for t in cache.get(key, []) if t > now_ms - window * 1000]
+            windows[key] = hits
+            if len(hits) >= count:
+                wait_ms = max(wait_ms, hits[len(hits) - count] + window * 1000 - now_ms)
+        if wait_ms:
+            return wait_ms / 1000
+        for key, _, window in limits:
+            cache.set(key, [*windows[key], now_ms], window)
+    return 0.0
+
+
+def request_idents(request, user=None) -> dict[str, str | None]:
+    """Limit keys of ``request``: client IP, submitted email and user id.
+
+    The IP honours ``REST_FRAMEWORK["NUM_PROXIES"]``, so only the
+    ``X-Forwarded-For`` entry added by our own proxy is trusted.
+    """
+    user = user if user is not None else getattr(request, "user", None)
+    data = getattr(request, "data", None)
+    email = data.get("email") if isinstance(data, Mapping) else None
+    return {
+        "ip": BaseThrottle().get_ident(request),
+        "email": str(email).strip().lower() if email else None,
+        "user": str(user.pk) if user and user.is_authenticated else None,
+    }
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """DRF throttle applying the ``RATE_LIMITS`` of the view's ``throttle_scope``.
+
+    Rejected requests get DRF's 429 response with a ``Retry-After`` header.
+    """
+
+    wait_seconds = 0.0
+
+    def allow_request(self, request, view) -> bool:
+        scope = getattr(view, "throttle_scope", None)
+        if scope:
+            self.wait_seconds = hit(scope, request_idents(request))
+        return not self.wait_seconds
+
+    def wait(self) -> float | None:
+        return self.wait_seconds or None
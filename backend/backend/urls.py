@@ -24,3 +24,5 @@ if settings.DEBUG:
             else settings.STATIC_ROOT
         ),
     )
+    # Locally stored media (profile picture variants without Cloudinary)
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""
+Django users app configuration.
+"""
+
+from django.apps import AppConfig
+
+
+class UsersConfig(AppConfig):
+    name = "backend.users"
+
+    def ready(self):
+        from backend.users import signals  # noqa: F401
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Token authentication backed by the cache instead of a query per request.
+"""
+from __future__ import annotations
+
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+TOKEN_AUTH_CACHE_KEY = "auth-token:{digest}"
+TOKEN_AUTH_USER_KEY = "auth-token-user:{user_id}"
+# Non-secret user fields cached with a token; the rest (password hash, name,
+# email, ...) is loaded from the database on first access.
+TOKEN_AUTH_USER_FIELDS = ("is_active", "is_staff", "is_superuser", "grade", "track")
+
+
+def _token_cache_key(key: str) -> str:
+    # Raw tokens are credentials; only their digest appears in cache keys.
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return TOKEN_AUTH_CACHE_KEY.format(digest=digest)
+
+
+def invalidate_cached_token(user_id) -> None:
+    """Drop the cached token of a user so the next request re-reads the DB."""
+    user_key = TOKEN_AUTH_USER_KEY.format(user_id=user_id)
+    token_key = cache.get(user_key)
+    cache.delete_many([user_key, token_key] if token_key else [user_key])
+
+
+def _cached_token(key: str, entry: dict) -> Token:
+    """Rebuild a token and its user from a cache entry without a query.
+
+    The user only holds ``TOKEN_AUTH_USER_FIELDS``; any other field is
+    deferred and loaded (all together) on first access.
+    """
+    User = get_user_model()
+    loaded = {name: entry[name] for name in TOKEN_AUTH_USER_FIELDS}
+    loaded[User._meta.pk.attname] = entry["user_id"]
+    # ``from_db`` expects the values in the model's field order.
+    names = [f.attname for f in User._meta.concrete_fields if f.attname in loaded]
+    user = User.from_db(
+        router.db_for_read(User), names, [loaded[name] for name in names]
+    )
+    token = Token.from_db(router.db_for_read(Token), ["key", "user_id"], [key, user.pk])
+    token.user = user
+    return token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """``TokenAuthentication`` that caches the token's user id and auth fields.
+
+    Only the user id and ``TOKEN_AUTH_USER_FIELDS`` are kept for
+    ``TOKEN_AUTH_CACHE_SECONDS``, never the password hash or profile data.
+    Logout, password changes and user updates drop the entry through
+    ``invalidate_cached_token``, so the TTL only bounds changes made outside
+    the ORM (e.g. raw SQL).
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = _token_cache_key(key)
+        entry = cache.get(cache_key)
+        if entry is None:
+            user, token = super().authenticate_credentials(key)
+            timeout = settings.TOKEN_AUTH_CACHE_SECONDS
+            entry = {name: getattr(user, name) for name in TOKEN_AUTH_USER_FIELDS}
+            cache.set(cache_key, {"user_id": user.pk, **entry}, timeout)
+            cache.set(TOKEN_AUTH_USER_KEY.format(user_id=user.pk), cache_key, timeout)
+            return user, token
+
+        if not entry["is_active"]:
+            raise exceptions.AuthenticationFailed("User inactive or deleted.")
+        token = _cached_token(key, entry)
+        return token.user, token
@@ -0,0 +1,208 @@
+"""Account email templates, compiled once and rendered by substitution.
+
+Each template is compiled on first use per year: the shared layout is filled
+in, the CSS rules are inlined into ``style`` attributes (only pseudo-class
+rules such as ``:hover`` stay in a ``<style>`` block) and the copyright year
+is baked into the footer. Rendering then only joins the precompiled chunks
+with the escaped user name, code or URL.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.utils import timezone
+
+_FIELD_RE = re.compile(r"\{\{(\w+)\}\}")
+_RULE_RE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+_TAG_RE = re.compile(r"<([a-zA-Z][a-zA-Z0-9]*)((?:\s[^<>]*?)?)(/?)>")
+_ATTR_RE = r'\s{name}="([^"]*)"'
+
+BASE_CSS = """
+body { margin: 0; padding: 0; background-color: #e8f0fe; font-family: Arial, sans-serif; }
+.email-wrapper { max-width: 580px; margin: 20px auto; background: #ffffff; border-radius: 12px; overflow: hidden; }
+.email-header { background: linear-gradient(135deg, #2c3e50, #3498db); color: white; padding: 30px 20px; text-align: center; }
+.email-body { padding: 30px 25px; color: #2c3e50; line-height: 1.5; }
+.email-footer { background: #f8f9fa; padding: 20px; text-align: center; color: #6c757d; font-size: 12px; margin-top: 20px; }
+"""
+
+LAYOUT = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>[title]</title>
+[style]
+</head>
+<body>
+<div class="email-wrapper">
+<div class="email-header"><h1 style="margin: 0; font-size: 24px;">[heading]</h1></div>
+<div class="email-body">
+[body]
+<p>Best regards,<br>BayKoç Team</p>
+</div>
+<div class="email-footer"><p>&copy; [year] BayKoç. All rights reserved.</p></div>
+</div>
+</body>
+</html>
+"""
+
+
+def inline_css(document: str, css: str) -> str:
+    """Move ``tag`` and ``.class`` rules of ``css`` into ``style`` attributes.
+
+    Rules with pseudo-classes cannot be inlined and are kept in a ``<style>``
+    element replacing the ``[style]`` marker. Existing inline styles win over
+    the inlined rules, as they would in a browser.
+    """
+    by_tag: dict[str, list[str]] = {}
+    by_class: dict[str, list[str]] = {}
+    kept: list[str] = []
+    for selectors, declarations in _RULE_RE.findall(css):
+        declarations = " ".join(declarations.split()).rstrip(";")
+        for selector in (s.strip() for s in selectors.split(",")):
+            if ":" in selector:
+                kept.append(f"{selector} {{ {declarations}; }}")
+            elif selector.startswith("."):
+                by_class.setdefault(selector[1:], []).append(declarations)
+            else:
+                by_tag.setdefault(selector, []).append(declarations)
+
+    def _inline(match: re.Match) -> str:
+        tag, attrs, closing = match.groups()
+        classes = re.search(_ATTR_RE.format(name="class"), attrs)
+        styles = list(by_tag.get(tag.lower(), []))
+        for name in classes.group(1).split() if classes else ():
+            styles.extend(by_class.get(name, []))
+        if not styles:
+            return match.group(0)
+        existing = re.search(_ATTR_RE.format(name="style"), attrs)
+        if existing:
+            styles.append(existing.group(1).strip().rstrip(";"))
+            attrs = attrs.replace(existing.group(0), "")
+        return f'<{tag}{attrs} style="{"; ".join(styles)};"{closing}>'
+
+    style = f"<style>{' '.join(kept)}</style>" if kept else ""
+    return _TAG_RE.sub(_inline, document.replace("[style]", style))
+
+
+class CompiledTemplate:
+    """Literal chunks and ``{{field}}`` names of a template, split once."""
+
+    def __init__(self, source: str):
+        parts = _FIELD_RE.split(source)
+        self.literals = parts[0::2]
+        self.fields = parts[1::2]
+
+    def render(self, context: Mapping[str, object], escape=None) -> str:
+        out = [self.literals[0]]
+        for field, literal in zip(self.fields, self.literals[1:]):
+            value = str(context[field])
+            out.append(escape(value) if escape else value)
+            out.append(literal)
+        return "".join(out)
+
+
+@dataclass(frozen=True)
+class EmailTemplate:
+    subject: str
+    title: str
+    heading: str
+    text: str
+    body: str
+    css: str = ""
+
+
+EMAIL_TEMPLATES: dict[str, EmailTemplate] = {
+    "verification": EmailTemplate(
+        subject="Your Verification Code",
+        title="Account Verification",
+        heading="Verify Your Account",
+        text="""Hello {{user_name}},
+
+Welcome to BayKoç! Your verification code is: {{code}}
+
+Please enter this code to activate your account.
+
+This code will expire in 30 minutes for security reasons.
+
+Best regards,
+BayKoç Team
+""",
+        body="""<p>Hello {{user_name}},</p>
+<p>Welcome to BayKoç! To complete your account setup, please enter the verification code below:</p>
+<div class="verification-box">
+<div class="verification-code">{{code}}</div>
+<p style="margin: 5px 0 0; color: #6c757d;">Enter this code to activate your account</p>
+</div>
+<p>This code will expire in 30 minutes for security reasons.</p>""",
+        css="""
+.verification-box { background: linear-gradient(135deg, #f8f9fa, #e9ecef); border: 2px dashed #3498db; padding: 20px; border-radius: 10px; text-align: center; margin: 25px 0; }
+.verification-code { font-size: 32px; font-weight: bold; letter-spacing: 4px; color: #2c3e50; margin: 10px 0; }
+""",
+    ),
+    "password_reset": EmailTemplate(
+        subject="Reset Your Password",
+        title="Reset Your Password",
+        heading="Password Reset Request",
+        text="""Hello {{user_name}},
+
+We received a request to reset your password for your BayKoç account. Click the link below to reset your password:
+
+{{reset_url}}
+
+If you didn't request a password reset, you can safely ignore this email.
+
+This link will expire in 30 minutes for security reasons.
+
+Best regards,
+BayKoç Team
+""",
+        body="""<p>Hello {{user_name}},</p>
+<p>We received a request to reset your password. To proceed with the password reset, click the button below:</p>
+<div style="text-align: center;"><a href="{{reset_url}}" class="action-button">Reset Password</a></div>
+<p>If you didn't make this request, you can safely ignore this email.</p>
+<p>If you're having trouble with the button, copy and paste this link into your browser:</p>
+<div class="backup-link"><a href="{{reset_url}}" style="color: #2c3e50;">{{reset_url}}</a></div>
+<p>Note: This link will expire in 30 minutes for security reasons.</p>""",
+        css="""
+.action-button { display: inline-block; background: linear-gradient(135deg, #2c3e50, #3498db); color: white !important; text-decoration: none; padding: 14px 32px; border-radius: 25px; margin: 25px 0; font-weight: bold; text-align: center; box-shadow: 0 4px 6px rgba(44, 62, 80, 0.15); transition: transform 0.2s; }
+.action-button:hover { transform: translateY(-2px); }
+.backup-link { background: #f8f9fa; padding: 15px; border-radius: 8px; margin: 20px 0; word-break: break-all; color: #2c3e50; }
+""",
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def compile_email(name: str, year: int) -> tuple[CompiledTemplate, CompiledTemplate]:
+    """Text and HTML templates of ``name`` with the layout and year filled in."""
+    template = EMAIL_TEMPLATES[name]
+    document = (
+        LAYOUT.replace("[title]", template.title)
+        .replace("[heading]", template.heading)
+        .replace("[year]", str(year))
+        .replace("[body]", template.body)
+    )
+    document = inline_css(document, BASE_CSS + template.css)
+    return CompiledTemplate(template.text), CompiledTemplate(document)
+
+
+def render_emails(
+    name: str, contexts: Iterable[Mapping[str, object]]
+) -> list[tuple[str, str, str]]:
+    """``(subject, text, html)`` per context, for campaigns and batches."""
+    subject = EMAIL_TEMPLATES[name].subject
+    text, document = compile_email(name, timezone.now().year)
+    return [
+        (subject, text.render(context), document.render(context, html.escape))
+        for context in contexts
+    ]
+
+
+def render_email(name: str, **context: object) -> tuple[str, str, str]:
+    return render_emails(name, [context])[0]
@@ -0,0 +1,74 @@
+"""Create many student accounts from a CSV or JSON-lines file."""
+
+import os
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.users.services.bulk_import import (
+    IMPORT_BATCH_SIZE,
+    bulk_import_users,
+    read_user_rows,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users (email, name, password, grade, track, language) from CSV "
+        "or JSONL, hashing passwords in parallel and inserting in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or - for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=("csv", "jsonl"),
+            help="Input format (default: from the file extension, csv for stdin).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processes hashing passwords.",
+        )
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument(
+            "--active",
+            action="store_true",
+            help="Create the accounts already activated.",
+        )
+        parser.add_argument(
+            "--send-verification",
+            action="store_true",
+            help="Create verification codes and queue their emails.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or (
+            "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+        )
+        if path != "-" and not Path(path).is_file():
+            raise CommandError(f"{path} does not exist")
+
+        stream = sys.stdin if path == "-" else open(path, encoding="utf-8-sig")
+        try:
+            report = bulk_import_users(
+                read_user_rows(stream, fmt),
+                workers=max(1, options["workers"]),
+                batch_size=max(1, options["batch_size"]),
+                active=options["active"],
+                verification=options["send_verification"],
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for line, email, error in report.errors:
+            self.stderr.write(f"row {line} ({email}): {error}")
+        self.stdout.write(
+            f"{report.created} users created, {report.skipped} skipped, "
+            f"{len(report.errors)} rejected in {report.seconds:.2f}s "
+            f"({report.rate:.0f} users/s)"
+        )
@@ -0,0 +1,51 @@
+"""Resize staged profile picture uploads and store their variants."""
+
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from backend.users.services.profile_pictures import (
+    PICTURE_BATCH_SIZE,
+    process_profile_pictures,
+)
+
+
+class Command(BaseCommand):
+    help = "Produce avatar and thumbnail variants of uploaded profile pictures."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=PICTURE_BATCH_SIZE)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls when no upload is waiting.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process every waiting upload once and exit.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if options["once"]:
+            total = 0
+            while handled := process_profile_pictures(batch_size):
+                total += handled
+            self.stdout.write(f"{total} pictures processed")
+            return
+
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                if not process_profile_pictures(batch_size):
+                    stop.wait(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            close_old_connections()
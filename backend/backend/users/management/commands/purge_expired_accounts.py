@@ -0,0 +1,82 @@
+"""Delete expired codes and reset tokens, old sent emails and abandoned signups."""
+
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from backend.users.services.cleanup import (
+    PURGE_BATCH_SIZE,
+    SENT_EMAIL_RETENTION_DAYS,
+    purge_expired_codes,
+    purge_sent_emails,
+    purge_unverified_users,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Purge expired verification codes, password reset tokens and old sent "
+        "outbox emails in batches, optionally with accounts that were never "
+        "verified."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE)
+        parser.add_argument(
+            "--unverified-days",
+            type=int,
+            default=0,
+            help="Also delete inactive accounts whose email stayed unverified "
+            "for this many days (0 keeps them).",
+        )
+        parser.add_argument(
+            "--sent-email-days",
+            type=int,
+            default=SENT_EMAIL_RETENTION_DAYS,
+            help="Delete outbox emails sent more than this many days ago "
+            "(0 keeps them).",
+        )
+        parser.add_argument(
+            "--every",
+            type=float,
+            default=0,
+            help="Repeat every N seconds until stopped instead of running once.",
+        )
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        if options["every"]:
+            signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        try:
+            while True:
+                close_old_connections()
+                self._purge(
+                    options["batch_size"],
+                    options["unverified_days"],
+                    options["sent_email_days"],
+                )
+                if not options["every"] or stop.wait(options["every"]):
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            close_old_connections()
+
+    def _purge(
+        self, batch_size: int, unverified_days: int, sent_email_days: int
+    ) -> None:
+        counts = purge_expired_codes(batch_size)
+        if sent_email_days > 0:
+            counts["sent_emails"] = purge_sent_emails(sent_email_days, batch_size)
+        if unverified_days > 0:
+            counts["unverified_users"] = purge_unverified_users(
+                unverified_days, batch_size
+            )
+        self.stdout.write(
+            ", ".join(
+                f"{count} {name.replace('_', ' ')}" for name, count in counts.items()
+            )
+            + " deleted"
+        )
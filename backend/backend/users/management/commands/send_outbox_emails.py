@@ -0,0 +1,50 @@
+"""Deliver queued outbox emails in batches over one SMTP connection each."""
+
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from backend.users.services.outbox import (
+    OUTBOX_BATCH_SIZE,
+    deliver_outbox,
+    drain_outbox,
+)
+
+
+class Command(BaseCommand):
+    help = "Send pending outbox emails (verification codes, password resets)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=OUTBOX_BATCH_SIZE)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between polls when the outbox is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Send every due email once and exit.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if options["once"]:
+            sent = drain_outbox(batch_size)
+            self.stdout.write(f"{sent} emails sent")
+            return
+
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                if not deliver_outbox(batch_size):
+                    stop.wait(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            close_old_connections()
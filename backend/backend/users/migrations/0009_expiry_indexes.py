@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0008_outboxemail"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="passwordresettoken",
+            index=models.Index(fields=["created_at"], name="users_reset_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("is_active", False), ("last_login__isnull", True)),
+                fields=["date_joined"],
+                name="users_unverified_joined_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="verificationcode",
+            index=models.Index(fields=["created_at"], name="users_vcode_created_idx"),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:54
+
+from django.db import migrations, models
+
+
+def mark_existing_users_verified(apps, schema_editor):
+    # Verifying deletes the code, so only an inactive account that still has
+    # one is known to be unverified; keep every other existing account.
+    User = apps.get_model("users", "User")
+    VerificationCode = apps.get_model("users", "VerificationCode")
+    User.objects.exclude(
+        is_active=False,
+        pk__in=VerificationCode.objects.values("user_id"),
+    ).update(email_verified=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0010_profile_picture_jobs"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="user",
+            name="users_unverified_joined_idx",
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="email_verified",
+            field=models.BooleanField(
+                default=False,
+                help_text="Whether the user confirmed their email address.",
+                verbose_name="Email Verified",
+            ),
+        ),
+        migrations.RunPython(mark_existing_users_verified, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("email_verified", False), ("is_active", False)),
+                fields=["date_joined"],
+                name="users_unverified_joined_idx",
+            ),
+        ),
+    ]
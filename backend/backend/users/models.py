@@ -4,17 +4,14 @@ from cloudinary.models import CloudinaryField
 from django.conf import settings
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.auth.models import PermissionsMixin
-from django.core.mail import send_mail
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from backend.users.emails import render_email
 from backend.users.managers import UserManager
-from backend.users.utils import (
-    generate_verification_code,
-    get_password_reset_email_template,
-    get_verification_email_template,
-)
+from backend.users.utils import generate_verification_code
 
 
 class User(AbstractBaseUser, PermissionsMixin):
@@ -55,6 +52,11 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(
         default=False, help_text="Only active users can login."
     )
+    email_verified = models.BooleanField(
+        "Email Verified",
+        default=False,
+        help_text="Whether the user confirmed their email address.",
+    )
     date_joined = models.DateTimeField("Date Joined", default=timezone.now)
 
     # Profile completion fields
@@ -91,6 +93,12 @@ class User(AbstractBaseUser, PermissionsMixin):
         folder="profile_pictures",
         help_text="User's profile picture",
     )
+    profile_picture_variants = models.JSONField(
+        "Profile Picture Variants",
+        default=dict,
+        blank=True,
+        help_text="Resized copies of the latest upload: {variant: {name, url}}",
+    )
     google_sub = models.CharField(
         "Google Subject",
         max_length=255,
@@ -104,6 +112,27 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     objects = UserManager()
 
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # Touching one deferred field (e.g. of a user rebuilt from the token
+        # cache) loads every deferred field in the same query.
+        deferred = self.get_deferred_fields()
+        if fields is not None and set(fields) <= deferred:
+            fields = deferred
+        super().refresh_from_db(using, fields, from_queryset)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["grade", "track"], name="users_grade_track_idx"),
+            # Only unverified accounts, scanned by purge_expired_accounts
+            models.Index(
+                fields=["date_joined"],
+                condition=models.Q(is_active=False, email_verified=False),
+                name="users_unverified_joined_idx",
+            ),
+            # Case-insensitive duplicate check of bulk_import_users
+            models.Index(Lower("email"), name="users_email_lower_idx"),
+        ]
+
 
 class VerificationCode(models.Model):
     user = models.OneToOneField(
@@ -117,6 +146,11 @@ class VerificationCode(models.Model):
     )
     created_at = models.DateTimeField("Code Creation Date", auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="users_vcode_created_idx"),
+        ]
+
     @property
     def is_expired(self):
         return timezone.now() > self.created_at + timezone.timedelta(
@@ -124,16 +158,12 @@ class VerificationCode(models.Model):
         )
 
     def send(self):
-        subject = "Your Verification Code"
-
-        # Get both plain text and HTML versions of the message
-        plain_text_message, html_message = get_verification_email_template(
-            self.user.name, self.code
+        """Queue the code email; it is delivered after the transaction commits."""
+        subject, plain_text_message, html_message = render_email(
+            "verification", user_name=self.user.name, code=self.code
         )
-
-        recipient_list = [self.user.email]
-        send_mail(
-            subject, plain_text_message, None, recipient_list, html_message=html_message
+        OutboxEmail.queue(
+            subject, plain_text_message, [self.user.email], html_message=html_message
         )
 
 
@@ -154,20 +184,14 @@ class PasswordResetToken(models.Model):
         )
 
     def send(self):
-        """Send password reset email with a secure one-time link."""
-        subject = "Reset Your Password"
+        """Queue the password reset email with a secure one-time link."""
         frontend_url = getattr(settings, "FRONTEND_URL", "http://localhost:5173")
         reset_url = f"{frontend_url}/reset-password?token={self.token}"
-        plain_text_message, html_message = get_password_reset_email_template(
-            self.user.name, reset_url
+        subject, plain_text_message, html_message = render_email(
+            "password_reset", user_name=self.user.name, reset_url=reset_url
         )
-        recipient_list = [self.user.email]
-        send_mail(
-            subject,
-            plain_text_message,
-            None,
-            recipient_list,
-            html_message=html_message,
+        OutboxEmail.queue(
+            subject, plain_text_message, [self.user.email], html_message=html_message
         )
 
     class Meta:
@@ -177,3 +201,111 @@ class PasswordResetToken(models.Model):
         constraints = [
             models.UniqueConstraint(fields=["user"], name="unique_user_reset_token"),
         ]
+        indexes = [
+            models.Index(fields=["created_at"], name="users_reset_created_idx"),
+        ]
+
+
+class OutboxEmail(models.Model):
+    """An email written in the caller's transaction, delivered by the sender.
+
+    Rows only become visible to ``send_outbox_emails`` once the surrounding
+    transaction commits, so requests never wait on the mail server and a
+    rolled back registration sends nothing.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    subject = models.CharField("Subject", max_length=255)
+    body = models.TextField("Plain Text Body")
+    html_body = models.TextField("HTML Body", blank=True, default="")
+    from_email = models.CharField("From", max_length=255, blank=True, default="")
+    to = models.JSONField("Recipients", default=list)
+    status = models.CharField(
+        "Status", max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveSmallIntegerField("Attempts", default=0)
+    last_error = models.TextField("Last Error", blank=True, default="")
+    available_at = models.DateTimeField("Available At", default=timezone.now)
+    created_at = models.DateTimeField("Created At", auto_now_add=True)
+    sent_at = models.DateTimeField("Sent At", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Outbox Email"
+        verbose_name_plural = "Outbox Emails"
+        indexes = [
+            models.Index(
+                fields=["status", "available_at"], name="outbox_status_avail_idx"
+            ),
+            # Only delivered rows, scanned by purge_expired_accounts
+            models.Index(
+                fields=["sent_at"],
+                condition=models.Q(status="sent"),
+                name="outbox_sent_at_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
+
+    @classmethod
+    def queue(cls, subject, body, to, html_message=None, from_email=None):
+        return cls.objects.create(
+            subject=subject,
+            body=body,
+            html_body=html_message or "",
+            from_email=from_email or "",
+            to=list(to),
+        )
+
+
+class ProfilePictureJob(models.Model):
+    """An uploaded picture staged on local disk, resized by the worker.
+
+    ``process_profile_pictures`` renders the variants, stores them and then
+    removes the staged file.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="profile_picture_jobs",
+        verbose_name="Owner",
+    )
+    staged_path = models.CharField("Staged File", max_length=500)
+    status = models.CharField(
+        "Status", max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveSmallIntegerField("Attempts", default=0)
+    last_error = models.TextField("Last Error", blank=True, default="")
+    available_at = models.DateTimeField("Available At", default=timezone.now)
+    created_at = models.DateTimeField("Created At", auto_now_add=True)
+    finished_at = models.DateTimeField("Finished At", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Profile Picture Job"
+        verbose_name_plural = "Profile Picture Jobs"
+        indexes = [
+            models.Index(
+                fields=["status", "available_at"], name="picture_status_avail_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} picture ({self.status})"
@@ -3,6 +3,7 @@ from rest_framework import serializers
 from backend.common.serializers import UUIDModelSerializer
 from backend.users.models import User
 
+DEFAULT_PICTURE_VARIANT = "avatar"
 HIGH_SCHOOL_TRACKS = {"sayisal", "sozel", "dil"}
 DIL_TRACK = "dil"
 
@@ -40,6 +41,7 @@ class NullableChoiceField(serializers.ChoiceField):
 
 class UserSerializer(serializers.ModelSerializer):
     profile_picture = serializers.SerializerMethodField()
+    profile_picture_urls = serializers.SerializerMethodField()
     grade = FlexibleGradeChoiceField(
         choices=User.GRADE_CHOICES, required=False, allow_null=True
     )
@@ -59,6 +61,7 @@ class UserSerializer(serializers.ModelSerializer):
             "profile_completed",
             "date_joined",
             "profile_picture",
+            "profile_picture_urls",
             "google_sub",
         )
         read_only_fields = (
@@ -72,12 +75,22 @@ class UserSerializer(serializers.ModelSerializer):
         )
 
     def get_profile_picture(self, obj):
-        """Return the full Cloudinary URL for the profile picture"""
+        """Return the avatar-sized URL, or the original Cloudinary upload's"""
+        variant = (obj.profile_picture_variants or {}).get(DEFAULT_PICTURE_VARIANT)
+        if variant:
+            return variant["url"]
         if obj.profile_picture:
             # Use Cloudinary's build_url to get the full URL
             return obj.profile_picture.url
         return None
 
+    def get_profile_picture_urls(self, obj):
+        """Resized picture URLs by variant name (``avatar``, ``thumbnail``)"""
+        return {
+            name: variant["url"]
+            for name, variant in (obj.profile_picture_variants or {}).items()
+        }
+
     def validate(self, attrs):
         provided_grade = "grade" in attrs
         provided_track = "track" in attrs
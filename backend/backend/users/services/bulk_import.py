@@ -0,0 +1,234 @@
+"""Bulk account creation for school onboarding."""
+
+from __future__ import annotations
+
+import csv
+import json
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import IO, Any
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from backend.users.models import User, VerificationCode
+from backend.users.services.outbox import queue_template_emails
+
+IMPORT_BATCH_SIZE = 500
+USER_FIELDS = ("email", "name", "password", "grade", "track", "language")
+
+
+@dataclass
+class ImportReport:
+    created: int = 0
+    skipped: int = 0  # already registered or repeated in the input
+    errors: list[tuple[int, str, str]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.created / self.seconds if self.seconds else 0.0
+
+
+class InvalidLine(dict):
+    """Stand-in row for an input line that is not a JSON object."""
+
+    def __init__(self, error: str):
+        super().__init__()
+        self.error = error
+
+
+def read_user_rows(stream: IO[str], fmt: str) -> Iterator[dict[str, Any]]:
+    """Rows of a CSV file with a header line or of a JSON-lines file.
+
+    Unparsable JSON lines are yielded as ``InvalidLine`` so they are reported
+    like other invalid rows instead of aborting the import.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield InvalidLine(f"invalid JSON: {exc.msg}")
+            continue
+        yield row if isinstance(row, dict) else InvalidLine("not a JSON object")
+
+
+def _init_worker() -> None:
+    # Spawned workers (non-fork platforms) start without configured apps.
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def _hash_row(row: dict[str, Any]) -> tuple[str | None, str | None]:
+    """``(password hash, None)`` or ``(None, error)``; runs in a pool worker."""
+    password = row.get("password") or None
+    if password is None:
+        return make_password(None), None
+    try:
+        validate_password(password, User(email=row["email"], name=row["name"]))
+    except ValidationError as exc:
+        return None, " ".join(exc.messages)
+    return make_password(password), None
+
+
+def _clean_row(row: dict[str, Any]) -> dict[str, Any]:
+    """Normalized user fields; raises ``ValueError`` for unusable rows."""
+    if isinstance(row, InvalidLine):
+        raise ValueError(row.error)
+    cleaned = {
+        key: str(row[key]).strip()
+        for key in USER_FIELDS
+        if row.get(key) not in (None, "")
+    }
+    cleaned["email"] = User.objects.normalize_email(cleaned.get("email", ""))
+    try:
+        validate_email(cleaned["email"])
+    except ValidationError:
+        raise ValueError("invalid email")
+    if not cleaned.get("name"):
+        raise ValueError("name is required")
+    if "grade" in cleaned:
+        cleaned["grade"] = int(cleaned["grade"])
+        if cleaned["grade"] not in dict(User.GRADE_CHOICES):
+            raise ValueError(f"unknown grade {cleaned['grade']}")
+    for key, choices in (
+        ("track", User.TRACK_CHOICES),
+        ("language", User.LANGUAGE_CHOICES),
+    ):
+        if key in cleaned and cleaned[key] not in dict(choices):
+            raise ValueError(f"unknown {key} {cleaned[key]!r}")
+    return cleaned
+
+
+def _chunks(rows: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _import_batch(
+    batch: list[tuple[int, dict[str, Any]]],
+    hashes: Iterable[tuple[str | None, str | None]],
+    report: ImportReport,
+    *,
+    active: bool,
+    verification: bool,
+) -> None:
+    users = []
+    for (line, row), (password, error) in zip(batch, hashes):
+        if error is not None:
+            report.errors.append((line, row["email"], error))
+            continue
+        users.append(
+            User(
+                **{key: value for key, value in row.items() if key != "password"},
+                password=password,
+                is_active=active,
+                email_verified=active,
+            )
+        )
+    if not users:
+        return
+
+    with transaction.atomic():
+        User.objects.bulk_create(users, batch_size=IMPORT_BATCH_SIZE)
+        if verification:
+            codes = VerificationCode.objects.bulk_create(
+                [VerificationCode(user=user) for user in users],
+                batch_size=IMPORT_BATCH_SIZE,
+            )
+            queue_template_emails(
+                "verification",
+                (
+                    (user.email, {"user_name": user.name, "code": code.code})
+                    for user, code in zip(users, codes)
+                ),
+            )
+    report.created += len(users)
+
+
+def bulk_import_users(
+    rows: Iterable[dict[str, Any]],
+    *,
+    workers: int = 1,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    active: bool = False,
+    verification: bool = False,
+) -> ImportReport:
+    """Create the users of ``rows``, hashing passwords in ``workers`` processes.
+
+    Every batch costs one query for already registered emails and one
+    ``bulk_create`` (plus one for verification codes and one for their queued
+    emails with ``verification``). Invalid rows and weak passwords are
+    reported instead of aborting the import.
+    """
+    report = ImportReport()
+    started = time.perf_counter()
+    seen: set[str] = set()
+    pool = (
+        ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        if workers > 1
+        else None
+    )
+    try:
+        for chunk in _chunks(enumerate(rows, start=1), batch_size):
+            batch = []
+            for line, row in chunk:
+                try:
+                    cleaned = _clean_row(row)
+                except (KeyError, TypeError, ValueError) as exc:
+                    report.errors.append((line, str(row.get("email", "")), str(exc)))
+                    continue
+                # Emails are stored as given (domain lowercased, as at signup)
+                # but duplicates are matched regardless of case.
+                key = cleaned["email"].lower()
+                if key in seen:
+                    report.skipped += 1
+                    continue
+                seen.add(key)
+                batch.append((line, cleaned))
+
+            if not batch:
+                continue
+            existing = set(
+                User.objects.annotate(email_lower=Lower("email"))
+                .filter(email_lower__in=[row["email"].lower() for _, row in batch])
+                .values_list("email_lower", flat=True)
+            )
+            batch_existing = [row["email"].lower() in existing for _, row in batch]
+            report.skipped += sum(batch_existing)
+            batch = [pair for pair, skip in zip(batch, batch_existing) if not skip]
+
+            to_hash = [row for _, row in batch]
+            hashes = (
+                pool.map(_hash_row, to_hash, chunksize=max(1, len(to_hash) // workers))
+                if pool is not None and to_hash
+                else map(_hash_row, to_hash)
+            )
+            _import_batch(
+                batch, hashes, report, active=active, verification=verification
+            )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,91 @@
+"""Batched purge of expired codes, reset tokens, sent emails and stale signups."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+from backend.users.models import OutboxEmail, PasswordResetToken, User, VerificationCode
+
+PURGE_BATCH_SIZE = 1000
+SENT_EMAIL_RETENTION_DAYS = 30
+
+
+def _delete_in_batches(
+    queryset: models.QuerySet, order_by: str, batch_size: int
+) -> int:
+    """Delete ``queryset`` one short transaction per batch; returns rows deleted.
+
+    Each batch selects its primary keys through the ``order_by`` index and
+    deletes them by key, so no statement scans or locks the whole table.
+    """
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                queryset.order_by(order_by).values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                return deleted
+            queryset.model.objects.filter(pk__in=ids).delete()
+        deleted += len(ids)
+
+
+def purge_expired_codes(batch_size: int = PURGE_BATCH_SIZE) -> dict[str, int]:
+    """Delete verification codes and reset tokens past their expiry."""
+    now = timezone.now()
+    code_cutoff = now - timedelta(
+        minutes=getattr(settings, "VERIFICATION_CODE_EXPIRY_MINUTES", 30)
+    )
+    token_cutoff = now - timedelta(
+        minutes=getattr(settings, "PASSWORD_RESET_EXPIRY_MINUTES", 30)
+    )
+    return {
+        "verification_codes": _delete_in_batches(
+            VerificationCode.objects.filter(created_at__lt=code_cutoff),
+            "created_at",
+            batch_size,
+        ),
+        "password_reset_tokens": _delete_in_batches(
+            PasswordResetToken.objects.filter(created_at__lt=token_cutoff),
+            "created_at",
+            batch_size,
+        ),
+    }
+
+
+def purge_sent_emails(
+    days: int = SENT_EMAIL_RETENTION_DAYS, batch_size: int = PURGE_BATCH_SIZE
+) -> int:
+    """Delete outbox emails delivered more than ``days`` days ago.
+
+    Failed rows are kept for inspection.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    return _delete_in_batches(
+        OutboxEmail.objects.filter(status=OutboxEmail.STATUS_SENT, sent_at__lt=cutoff),
+        "sent_at",
+        batch_size,
+    )
+
+
+def purge_unverified_users(days: int, batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """Delete inactive accounts whose email stayed unverified for ``days`` days.
+
+    Only ``email_verified=False`` signups qualify, so accounts an admin
+    deactivated after verification and staff accounts are kept.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    return _delete_in_batches(
+        User.objects.filter(
+            is_active=False,
+            email_verified=False,
+            is_staff=False,
+            date_joined__lt=cutoff,
+        ),
+        "date_joined",
+        batch_size,
+    )
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import base64
+import hashlib
+import json
+import re
+import threading
 import time
 from dataclasses import dataclass
 from typing import Any, Dict
@@ -8,13 +13,28 @@ from urllib.parse import urlencode
 import requests
 from django.conf import settings
 from django.core import signing
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.utils.crypto import get_random_string
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token
+from google.auth import exceptions as google_exceptions
+from google.auth import jwt as google_jwt
+from requests.adapters import HTTPAdapter
 from rest_framework.authtoken.models import Token
 
 from backend.users.models import User
 
+GOOGLE_TOKEN_ENDPOINT = "https://oauth2.googleapis.com/token"
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+GOOGLE_CERTS_CACHE_KEY = "google-oauth:certs:{digest}"
+GOOGLE_CERTS_DEFAULT_MAX_AGE = 300  # when Google sends no usable Cache-Control
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+# Per-process copy of the shared certificate cache: url -> (expires_at, certs)
+_certs: dict[str, tuple[float, dict[str, str]]] = {}
+
 
 class GoogleOAuthError(Exception):
     """Domain-specific error for Google OAuth failures."""
@@ -27,8 +47,77 @@ class GoogleOAuthResult:
     next_path: str
 
 
+def http_session() -> requests.Session:
+    """Keep-alive session shared by every OAuth call of this process."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_maxsize=getattr(settings, "GOOGLE_HTTP_POOL_SIZE", 10)
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _certs_max_age(headers) -> int:
+    cache_control = headers.get("Cache-Control", "")
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    if match is None:
+        return GOOGLE_CERTS_DEFAULT_MAX_AGE
+    age = headers.get("Age", "0")
+    return max(0, int(match.group(1)) - (int(age) if age.isdigit() else 0))
+
+
+def get_google_certs(url: str = GOOGLE_CERTS_URL, *, refresh: bool = False) -> dict:
+    """Google's ``{key id: certificate}`` signing keys, cached as Google allows.
+
+    Certificates are kept for the ``max-age`` of the response, in this process
+    and in the shared cache so that every worker reuses one fetch; ``refresh``
+    skips both caches after a key rotation.
+    """
+    cache_key = GOOGLE_CERTS_CACHE_KEY.format(
+        digest=hashlib.sha256(url.encode()).hexdigest()[:16]
+    )
+    now = time.time()
+    if not refresh:
+        local = _certs.get(url)
+        if local is not None and local[0] > now:
+            return local[1]
+        shared = cache.get(cache_key)
+        if shared is not None:
+            _certs[url] = (shared["expires_at"], shared["certs"])
+            return shared["certs"]
+
+    try:
+        response = http_session().get(url, timeout=10)
+        response.raise_for_status()
+        certs = response.json()
+    except (requests.RequestException, ValueError) as exc:
+        raise GoogleOAuthError("Could not fetch Google signing certificates.") from exc
+
+    max_age = _certs_max_age(response.headers)
+    if max_age:
+        _certs[url] = (now + max_age, certs)
+        cache.set(cache_key, {"expires_at": now + max_age, "certs": certs}, max_age)
+    return certs
+
+
+def _token_key_id(raw_id_token: str) -> str | None:
+    try:
+        header = raw_id_token.split(".", 1)[0]
+        padded = header + "=" * (-len(header) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded)).get("kid")
+    except (ValueError, AttributeError):
+        return None
+
+
 class GoogleOAuthService:
-    TOKEN_ENDPOINT = "https://oauth2.googleapis.com/token"
     STATE_SALT = "backend.users.google_oauth.state"
 
     def __init__(self):
@@ -39,6 +128,10 @@ class GoogleOAuthService:
             settings, "GOOGLE_OAUTH_SCOPES", ["openid", "email", "profile"]
         )
         self.state_max_age = getattr(settings, "GOOGLE_OAUTH_STATE_MAX_AGE", 300)
+        self.token_endpoint = getattr(
+            settings, "GOOGLE_TOKEN_ENDPOINT", GOOGLE_TOKEN_ENDPOINT
+        )
+        self.certs_url = getattr(settings, "GOOGLE_CERTS_URL", GOOGLE_CERTS_URL)
         if not self.client_id or not self.client_secret:
             raise GoogleOAuthError("Google OAuth client configuration is missing.")
         if not self.redirect_uri:
@@ -64,8 +157,7 @@ class GoogleOAuthService:
         state_payload = self._decode_state(state)
         tokens = self._exchange_code_for_tokens(code)
         id_info = self._verify_id_token(tokens.get("id_token"))
-        user = self._sync_user(id_info)
-        token, _ = Token.objects.get_or_create(user=user)
+        user, token = self._sync_user(id_info)
         return GoogleOAuthResult(
             user=user,
             token=token.key,
@@ -104,8 +196,8 @@ class GoogleOAuthService:
             "grant_type": "authorization_code",
         }
         try:
-            response = requests.post(
-                self.TOKEN_ENDPOINT,
+            response = http_session().post(
+                self.token_endpoint,
                 data=payload,
                 timeout=10,
             )
@@ -123,15 +215,18 @@ class GoogleOAuthService:
     def _verify_id_token(self, raw_id_token: str | None) -> Dict[str, Any]:
         if not raw_id_token:
             raise GoogleOAuthError("Google response did not include an id_token.")
+        certs = get_google_certs(self.certs_url)
+        if _token_key_id(raw_id_token) not in certs:
+            # Google rotated its keys since the certificates were cached
+            certs = get_google_certs(self.certs_url, refresh=True)
         try:
-            request_adapter = google_requests.Request()
-            id_info = id_token.verify_oauth2_token(
-                raw_id_token,
-                request_adapter,
-                self.client_id,
+            id_info = google_jwt.decode(
+                raw_id_token, certs=certs, audience=self.client_id
             )
-        except ValueError as exc:
+        except (ValueError, google_exceptions.GoogleAuthError) as exc:
             raise GoogleOAuthError("Google token verification failed.") from exc
+        if id_info.get("iss") not in GOOGLE_ISSUERS:
+            raise GoogleOAuthError("Google token verification failed.")
 
         if not id_info.get("email"):
             raise GoogleOAuthError("Google account did not return an email address.")
@@ -143,16 +238,36 @@ class GoogleOAuthService:
             )
         return id_info
 
-    def _sync_user(self, id_info: Dict[str, Any]) -> User:
+    def _sync_user(self, id_info: Dict[str, Any]) -> tuple[User, Token]:
+        """Find or create the user and their API token in as few queries as possible.
+
+        A returning user costs one query (the token is joined in); linking an
+        existing account adds one ``UPDATE``. New users are inserted with their
+        token in one savepoint, so two simultaneous first logins cannot both
+        create the account.
+        """
         email = id_info["email"].lower()
         google_sub = id_info["sub"]
         name = id_info.get("name") or email.split("@")[0]
 
-        user = User.objects.filter(email=email).first()
+        user = self._find_user(email)
         if user is None:
-            user = User.objects.create_user(email=email, name=name)
-            user.set_unusable_password()
-            user.save(update_fields=["password"])
+            try:
+                with transaction.atomic():
+                    user = User(
+                        email=email,
+                        name=name,
+                        google_sub=google_sub,
+                        is_active=True,
+                        email_verified=True,
+                    )
+                    user.set_unusable_password()
+                    user.save(force_insert=True)
+                    return user, Token.objects.create(user=user)
+            except IntegrityError:
+                user = self._find_user(email)
+                if user is None:
+                    raise
 
         if user.google_sub and user.google_sub != google_sub:
             raise GoogleOAuthError(
@@ -166,16 +281,24 @@ class GoogleOAuthService:
         if not user.is_active:
             user.is_active = True
             updated_fields.add("is_active")
+        if not user.email_verified:
+            user.email_verified = True
+            updated_fields.add("email_verified")
         if name and not user.name:
             user.name = name
             updated_fields.add("name")
-        if not user.has_usable_password():
-            user.set_unusable_password()
-            updated_fields.add("password")
 
         if updated_fields:
             user.save(update_fields=list(updated_fields))
-        return user
+        try:
+            token = user.auth_token
+        except Token.DoesNotExist:
+            token, _ = Token.objects.get_or_create(user=user)
+        return user, token
+
+    @staticmethod
+    def _find_user(email: str) -> User | None:
+        return User.objects.select_related("auth_token").filter(email=email).first()
 
     def _sanitize_next_path(self, next_path: str | None) -> str:
         if not next_path:
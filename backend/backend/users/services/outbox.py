@@ -0,0 +1,151 @@
+"""Transactional outbox for emails, delivered in batches by the sender."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Mapping
+from datetime import timedelta
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from backend.users.emails import render_emails
+from backend.users.models import OutboxEmail
+
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_BACKOFF_SECONDS = 30  # doubled after every failed attempt
+OUTBOX_CLAIM_SECONDS = 10 * 60  # claimed rows are due again if a sender dies
+OUTBOX_DRAIN_MAX_BATCHES = 100
+
+logger = logging.getLogger(__name__)
+
+
+def queue_template_emails(
+    name: str, recipients: Iterable[tuple[str, Mapping[str, object]]]
+) -> list[OutboxEmail]:
+    """Render template ``name`` for many ``(email, context)`` pairs and queue them.
+
+    Meant for mass sends such as re-verification campaigns: the template is
+    compiled once and the rows are written with ``bulk_create``.
+    """
+    recipients = list(recipients)
+    rendered = render_emails(name, [context for _, context in recipients])
+    return OutboxEmail.objects.bulk_create(
+        [
+            OutboxEmail(subject=subject, body=text, html_body=html, to=[address])
+            for (address, _), (subject, text, html) in zip(recipients, rendered)
+        ],
+        batch_size=500,
+    )
+
+
+def _message(email: OutboxEmail, connection) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(
+        email.subject,
+        email.body,
+        email.from_email or None,
+        email.to,
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    return message
+
+
+def _failed(email: OutboxEmail, exc: Exception, now) -> None:
+    email.attempts += 1
+    email.last_error = f"{type(exc).__name__}: {exc}"
+    if email.attempts >= OUTBOX_MAX_ATTEMPTS:
+        email.status = OutboxEmail.STATUS_FAILED
+    else:
+        delay = OUTBOX_BACKOFF_SECONDS * 2 ** (email.attempts - 1)
+        email.available_at = now + timedelta(seconds=delay)
+    logger.warning(
+        "outbox email %s attempt %d failed: %s", email.pk, email.attempts, exc
+    )
+
+
+def _claim(batch_size: int) -> list[OutboxEmail]:
+    """Lease a batch of due emails to this sender in a short transaction.
+
+    Claimed rows get an ``available_at`` of ``OUTBOX_CLAIM_SECONDS`` ahead, so
+    other senders skip them while they are sent without holding row locks,
+    and pick them up again if this sender dies before recording the outcome.
+    """
+    with transaction.atomic():
+        now = timezone.now()
+        batch = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxEmail.STATUS_PENDING, available_at__lte=now)
+            .order_by("available_at", "pk")[:batch_size]
+        )
+        if batch:
+            OutboxEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+                available_at=now + timedelta(seconds=OUTBOX_CLAIM_SECONDS)
+            )
+    return batch
+
+
+def _deliver_batch(batch_size: int) -> tuple[int, int]:
+    batch = _claim(batch_size)
+    if not batch:
+        return 0, 0
+
+    sent = 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        for email in batch:
+            _failed(email, exc, timezone.now())
+    else:
+        try:
+            for email in batch:
+                try:
+                    _message(email, connection).send()
+                except Exception as exc:
+                    _failed(email, exc, timezone.now())
+                else:
+                    email.status = OutboxEmail.STATUS_SENT
+                    email.attempts += 1
+                    email.sent_at = timezone.now()
+                    sent += 1
+        finally:
+            connection.close()
+
+    OutboxEmail.objects.bulk_update(
+        batch,
+        ["status", "attempts", "last_error", "available_at", "sent_at"],
+    )
+    return len(batch), sent
+
+
+def deliver_outbox(batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+    """Send one batch of due emails over a single connection; returns sent count.
+
+    The batch is claimed with ``SKIP LOCKED`` so several senders can run side
+    by side, and sent outside the claiming transaction. A failed message is
+    retried with exponential backoff up to ``OUTBOX_MAX_ATTEMPTS``; if the
+    connection itself cannot be opened the whole batch is rescheduled.
+    """
+    return _deliver_batch(batch_size)[1]
+
+
+def drain_outbox(
+    batch_size: int = OUTBOX_BATCH_SIZE,
+    max_batches: int = OUTBOX_DRAIN_MAX_BATCHES,
+) -> int:
+    """Deliver batches until no due email is left or ``max_batches`` ran.
+
+    A batch in which every send failed does not stop the drain; its emails
+    are rescheduled and the next due ones are claimed.
+    """
+    total = 0
+    for _ in range(max_batches):
+        claimed, sent = _deliver_batch(batch_size)
+        total += sent
+        if not claimed:
+            break
+    return total
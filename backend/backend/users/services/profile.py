@@ -0,0 +1,53 @@
+"""Versioned cache of the serialized ``/api/users/me/`` payload."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.cache import cache
+
+from backend.users.serializers import UserSerializer
+
+PROFILE_VERSION_KEY = "users:profile-version:{user_id}"
+PROFILE_KEY = "users:profile:{user_id}:{version}"
+PROFILE_CACHE_SECONDS = 24 * 60 * 60
+
+
+def get_profile_version(user_id) -> int:
+    """Current version of a user's profile; part of its cache key and ETag."""
+    key = PROFILE_VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), None)
+        version = cache.get(key) or 1
+    return int(version)
+
+
+def _initial_version() -> int:
+    # Time based so a re-created (evicted) counter never reuses an old ETag.
+    return int(time.time() * 1000)
+
+
+def bump_profile_version(user_id) -> int:
+    key = PROFILE_VERSION_KEY.format(user_id=user_id)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _initial_version()
+        cache.set(key, version, None)
+        return version
+
+
+def profile_etag(user_id, version: int) -> str:
+    return f'"{user_id}-{version}"'
+
+
+def get_profile_payload(user, version: int) -> dict[str, Any]:
+    """``UserSerializer`` data of ``user``, serialized once per version."""
+    key = PROFILE_KEY.format(user_id=user.pk, version=version)
+    data = cache.get(key)
+    if data is None:
+        data = dict(UserSerializer(user).data)
+        cache.set(key, data, PROFILE_CACHE_SECONDS)
+    return data
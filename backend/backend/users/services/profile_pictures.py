@@ -0,0 +1,187 @@
+"""Staged profile picture uploads and their resized variants."""
+
+from __future__ import annotations
+
+import io
+import logging
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from backend.users.models import ProfilePictureJob, User
+
+# Square edge (px) of every stored variant
+PICTURE_VARIANTS = {"avatar": 256, "thumbnail": 64}
+PICTURE_QUALITY = 85
+PICTURE_BATCH_SIZE = 10
+PICTURE_MAX_ATTEMPTS = 3
+PICTURE_BACKOFF_SECONDS = 30  # doubled after every failed attempt
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidPicture(ValueError):
+    """The upload is not an image Pillow can read."""
+
+
+def picture_storage() -> Storage:
+    """The project's file storage: Cloudinary, or the local media directory."""
+    return import_string(settings.DEFAULT_FILE_STORAGE)()
+
+
+def stage_profile_picture(user: User, upload) -> ProfilePictureJob:
+    """Copy ``upload`` to the staging directory and queue it for the worker."""
+    staging = Path(settings.PROFILE_PICTURE_STAGING_DIR)
+    staging.mkdir(parents=True, exist_ok=True)
+    path = staging / f"{user.pk}-{uuid.uuid4().hex}"
+    with open(path, "wb") as staged:
+        for chunk in upload.chunks():
+            staged.write(chunk)
+    return ProfilePictureJob.objects.create(user=user, staged_path=str(path))
+
+
+def render_variants(source) -> dict[str, bytes]:
+    """Centre-cropped square JPEGs of ``source`` for every ``PICTURE_VARIANTS``."""
+    try:
+        image = Image.open(source)
+        # Let the JPEG decoder downscale while decoding; variants are small.
+        image.draft("RGB", (max(PICTURE_VARIANTS.values()),) * 2)
+        image.load()  # decode now so truncated files count as invalid, too
+        image = ImageOps.exif_transpose(image)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        raise InvalidPicture(str(exc)) from exc
+
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    else:
+        image = image.convert("RGB")
+
+    variants = {}
+    for name, size in sorted(PICTURE_VARIANTS.items(), key=lambda item: -item[1]):
+        image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(
+            buffer, "JPEG", quality=PICTURE_QUALITY, optimize=True, progressive=True
+        )
+        variants[name] = buffer.getvalue()
+    return variants
+
+
+def _store_variants(job: ProfilePictureJob, storage: Storage) -> bool:
+    with open(job.staged_path, "rb") as staged:
+        rendered = render_variants(staged)
+
+    variants = {}
+    for name, content in rendered.items():
+        stored = storage.save(
+            f"profile_pictures/{job.user_id}/{job.pk}-{name}.jpg", ContentFile(content)
+        )
+        variants[name] = {"name": stored, "url": storage.url(stored)}
+
+    # Lock the owner so a newer upload finishing at the same time cannot be
+    # overwritten by this one.
+    user = User.objects.select_for_update().get(pk=job.user_id)
+    if _has_newer_upload(job):
+        transaction.on_commit(lambda: _delete_files(storage, variants))
+        return False
+    previous = user.profile_picture_variants or {}
+    user.profile_picture_variants = variants
+    user.save(update_fields=["profile_picture_variants"])
+    transaction.on_commit(lambda: _delete_files(storage, previous))
+    return True
+
+
+def _has_newer_upload(job: ProfilePictureJob) -> bool:
+    return ProfilePictureJob.objects.filter(user_id=job.user_id, pk__gt=job.pk).exists()
+
+
+def _delete_files(storage: Storage, variants: dict) -> None:
+    for variant in variants.values():
+        try:
+            storage.delete(variant["name"])
+        except Exception:  # an old file must not fail the new upload
+            logger.warning("could not delete old picture %s", variant.get("name"))
+
+
+def _discard(job: ProfilePictureJob) -> None:
+    Path(job.staged_path).unlink(missing_ok=True)
+
+
+def _supersede(job: ProfilePictureJob, now) -> None:
+    job.status = ProfilePictureJob.STATUS_DONE
+    job.last_error = "Superseded by a newer upload"
+    job.finished_at = now
+    _discard(job)
+
+
+def process_profile_pictures(batch_size: int = PICTURE_BATCH_SIZE) -> int:
+    """Resize and store one batch of staged uploads; returns the jobs handled.
+
+    Jobs are claimed with ``SKIP LOCKED`` so several workers can run. Storage
+    errors are retried with backoff; unreadable images fail at once.
+    """
+    with transaction.atomic():
+        now = timezone.now()
+        jobs = list(
+            ProfilePictureJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ProfilePictureJob.STATUS_PENDING, available_at__lte=now)
+            .order_by("available_at", "pk")[:batch_size]
+        )
+        storage = picture_storage() if jobs else None
+        # A newer upload of the same user, in this batch or not (an older job
+        # may come back from backoff), makes the older ones pointless.
+        newest = dict(
+            ProfilePictureJob.objects.filter(user_id__in={job.user_id for job in jobs})
+            .values("user_id")
+            .annotate(newest=Max("pk"))
+            .values_list("user_id", "newest")
+        )
+        for job in jobs:
+            job.attempts += 1
+            if job.pk < newest[job.user_id]:
+                _supersede(job, now)
+                continue
+            try:
+                with transaction.atomic():
+                    stored = _store_variants(job, storage)
+            except InvalidPicture as exc:
+                job.status = ProfilePictureJob.STATUS_FAILED
+                job.last_error = f"Invalid image: {exc}"
+            except Exception as exc:
+                job.last_error = f"{type(exc).__name__}: {exc}"
+                if job.attempts >= PICTURE_MAX_ATTEMPTS:
+                    job.status = ProfilePictureJob.STATUS_FAILED
+                else:
+                    delay = PICTURE_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+                    job.available_at = now + timedelta(seconds=delay)
+                logger.warning(
+                    "profile picture %s attempt %d failed: %s",
+                    job.pk,
+                    job.attempts,
+                    exc,
+                )
+            else:
+                if not stored:
+                    _supersede(job, timezone.now())
+                    continue
+                job.status = ProfilePictureJob.STATUS_DONE
+                job.finished_at = timezone.now()
+            if job.status != ProfilePictureJob.STATUS_PENDING:
+                _discard(job)
+
+        ProfilePictureJob.objects.bulk_update(
+            jobs, ["status", "attempts", "last_error", "available_at", "finished_at"]
+        )
+    return len(jobs)
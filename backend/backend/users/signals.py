@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+Signal handlers keeping cached authentication and profiles in sync with the
+database.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from backend.users.authentication import invalidate_cached_token
+from backend.users.models import User
+from backend.users.services.profile import bump_profile_version
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def drop_cached_token_of_user(sender, instance, **kwargs):
+    # Covers profile edits, password changes and activation from any code path.
+    invalidate_cached_token(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def bump_profile_of_user(sender, instance, **kwargs):
+    # Bumped again on commit: a GET racing the open transaction may have cached
+    # the old row under the first new version.
+    bump_profile_version(instance.pk)
+    transaction.on_commit(lambda: bump_profile_version(instance.pk))
+
+
+@receiver(post_delete, sender=Token)
+def drop_deleted_token(sender, instance, **kwargs):
+    invalidate_cached_token(instance.user_id)
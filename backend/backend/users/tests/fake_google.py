@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Local Google OAuth token and certificate endpoints used by the OAuth tests."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.auth import crypt, jwt
+
+
+class FakeGoogleOAuthServer:
+    """Serve ``/token`` and ``/certs`` like Google's OAuth endpoints.
+
+    ``/token`` answers with an ``id_token`` for ``claims`` signed by the
+    current key; ``/certs`` publishes the public keys with ``cache_control``.
+    ``rotate_key()`` starts signing with a new key id. Requests are counted
+    per path in ``hits`` and client connections in ``connections``.
+    """
+
+    def __init__(self, client_id="test-client", claims=None):
+        self.client_id = client_id
+        self.claims = claims or {}
+        self.cache_control = "public, max-age=3600"
+        self.hits = {"/token": 0, "/certs": 0}
+        self.connections = set()
+        self._keys = {}
+        self.rotate_key()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def rotate_key(self):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.key_id = f"key-{len(self._keys) + 1}"
+        self._keys[self.key_id] = key
+
+    def id_token(self):
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": self.client_id,
+            "iat": now,
+            "exp": now + 3600,
+            **self.claims,
+        }
+        private_pem = self._keys[self.key_id].private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        signer = crypt.RSASigner.from_string(private_pem, key_id=self.key_id)
+        return jwt.encode(signer, payload).decode()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like Google
+
+            def log_message(self, *args):  # keep test output quiet
+                pass
+
+            def _json(self, payload, headers=()):
+                fake.connections.add(self.client_address)
+                fake.hits[self.path] += 1
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                certs = {
+                    kid: key.public_key()
+                    .public_bytes(
+                        serialization.Encoding.PEM,
+                        serialization.PublicFormat.SubjectPublicKeyInfo,
+                    )
+                    .decode()
+                    for kid, key in fake._keys.items()
+                }
+                self._json(certs, [("Cache-Control", fake.cache_control)])
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                form = parse_qs(self.rfile.read(length).decode())
+                assert form["grant_type"] == ["authorization_code"]
+                self._json({"access_token": "access", "id_token": fake.id_token()})
+
+        return Handler
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Minimal local SMTP server used by the outbox tests."""
+
+import socketserver
+import threading
+
+
+class StubSMTPServer:
+    """Accept mail on a local port and keep it in ``messages``.
+
+    ``connections`` counts SMTP sessions, so tests can assert that a batch
+    reuses one connection; ``reject`` lists recipients answered with a
+    permanent 550 error.
+    """
+
+    def __init__(self):
+        self.messages = []  # (sender, recipients, raw data)
+        self.connections = 0
+        self.reject = set()
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(
+            ("127.0.0.1", 0), self._handler()
+        )
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def settings(self):
+        return {
+            "EMAIL_BACKEND": "django.core.mail.backends.smtp.EmailBackend",
+            "EMAIL_HOST": "127.0.0.1",
+            "EMAIL_PORT": self.port,
+            "EMAIL_HOST_USER": "",
+            "EMAIL_HOST_PASSWORD": "",
+            "EMAIL_USE_TLS": False,
+        }
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write(f"{line}\r\n".encode())
+
+            def handle(self):
+                with stub._lock:
+                    stub.connections += 1
+                self.reply("220 stub ESMTP")
+                sender, recipients = None, []
+                while True:
+                    line = self.rfile.readline().decode().strip()
+                    if not line:
+                        return
+                    command = line.split(" ", 1)[0].upper()
+                    if command in ("EHLO", "HELO"):
+                        self.reply("250 stub")
+                    elif command == "MAIL":
+                        sender, recipients = line.split(":", 1)[1].strip("<> "), []
+                        self.reply("250 OK")
+                    elif command == "RCPT":
+                        recipient = line.split(":", 1)[1].strip("<> ")
+                        if recipient in stub.reject:
+                            self.reply("550 No such user")
+                        else:
+                            recipients.append(recipient)
+                            self.reply("250 OK")
+                    elif command == "DATA":
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                        data = []
+                        while (chunk := self.rfile.readline()) not in (b".\r\n", b""):
+                            data.append(chunk)
+                        with stub._lock:
+                            stub.messages.append((sender, recipients, b"".join(data)))
+                        self.reply("250 OK")
+                    elif command == "RSET":
+                        sender, recipients = None, []
+                        self.reply("250 OK")
+                    elif command == "QUIT":
+                        self.reply("221 Bye")
+                        return
+                    else:
+                        self.reply("250 OK")
+
+        return Handler
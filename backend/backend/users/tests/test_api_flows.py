@@ -32,6 +32,7 @@ class UserAPIFLowTest(TestCase):
 
         user = self.User.objects.get(email="test@example.com")
         self.assertFalse(user.is_active)
+        self.assertFalse(user.email_verified)
         code_obj = VerificationCode.objects.get(user=user)
 
         resp = self.client.post(
@@ -42,6 +43,7 @@ class UserAPIFLowTest(TestCase):
         self.assertEqual(resp.status_code, 200)
         user.refresh_from_db()
         self.assertTrue(user.is_active)
+        self.assertTrue(user.email_verified)
 
         resp = self.client.post(
             login_url,
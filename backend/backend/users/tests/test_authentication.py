@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Tests for the cached token authentication and its invalidation."""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from backend.users.authentication import (
+    TOKEN_AUTH_USER_FIELDS,
+    CachedTokenAuthentication,
+    _token_cache_key,
+)
+
+
+class CachedTokenAuthenticationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="cached@example.com",
+            name="Cached",
+            password="StrongPass123!",
+            is_active=True,
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.headers = {"HTTP_AUTHORIZATION": f"Token {self.token.key}"}
+        self.me = reverse("users:user-me")
+
+    def test_repeated_requests_skip_the_database(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.me, **self.headers).status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.me, **self.headers).status_code, 200)
+        self.assertEqual(
+            self.client.get(self.me, HTTP_AUTHORIZATION="Token nope").status_code, 401
+        )
+
+    def test_logout_invalidates_the_token(self):
+        self.client.get(self.me, **self.headers)
+        resp = self.client.post(reverse("users:user-logout"), **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.client.get(self.me, **self.headers).status_code, 401)
+
+    def test_user_updates_are_visible_immediately(self):
+        self.client.get(self.me, **self.headers)
+        resp = self.client.put(
+            self.me,
+            {"name": "Renamed"},
+            content_type="application/json",
+            **self.headers,
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            self.client.get(self.me, **self.headers).json()["name"], "Renamed"
+        )
+
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        self.assertEqual(self.client.get(self.me, **self.headers).status_code, 401)
+
+    def test_password_change_refreshes_the_cached_user(self):
+        self.client.get(self.me, **self.headers)
+        resp = self.client.post(
+            reverse("users:user-change-password"),
+            {
+                "current_password": "StrongPass123!",
+                "new_password": "EvenStronger456!",
+                "confirm_password": "EvenStronger456!",
+            },
+            content_type="application/json",
+            **self.headers,
+        )
+        self.assertEqual(resp.status_code, 200)
+        with self.assertNumQueries(1):  # cache entry dropped, token re-read
+            self.client.get(self.me, **self.headers)
+
+    def test_cache_holds_no_credentials_or_profile_data(self):
+        self.client.get(self.me, **self.headers)
+        entry = cache.get(_token_cache_key(self.token.key))
+        self.assertEqual(set(entry), {"user_id", *TOKEN_AUTH_USER_FIELDS})
+        self.assertEqual(entry["user_id"], self.user.pk)
+
+        with self.assertNumQueries(0):
+            user, token = CachedTokenAuthentication().authenticate_credentials(
+                self.token.key
+            )
+        self.assertEqual((user.pk, token.key), (self.user.pk, self.token.key))
+        with self.assertNumQueries(1):  # deferred fields load together
+            self.assertEqual((user.name, user.email), ("Cached", "cached@example.com"))
+            self.assertTrue(user.check_password("StrongPass123!"))
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Tests for the bulk user import command."""
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from backend.users.models import OutboxEmail, VerificationCode
+from backend.users.services.bulk_import import bulk_import_users
+
+User = get_user_model()
+
+
+class BulkImportUsersTest(TestCase):
+    def setUp(self):
+        User.objects.create_user(
+            email="existing@example.com", name="Existing", password="StrongPass123!"
+        )
+
+    def _write(self, name: str, content: str) -> str:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / name
+        path.write_text(content, encoding="utf-8")
+        return str(path)
+
+    def test_csv_import_with_process_pool(self):
+        path = self._write(
+            "students.csv",
+            "email,name,password,grade,track\n"
+            "Ayse@Example.com,Ayşe Yılmaz,Kalem-Defter-42,12,sayisal\n"
+            "mehmet@example.com,Mehmet Kaya,Silgi-Cetvel-77,8,lgs\n"
+            "ayse@example.com,Ayşe Tekrar,Kalem-Defter-42,,\n"
+            "Existing@Example.com,Existing,Kalem-Defter-42,,\n"
+            "zayif@example.com,Zayıf Şifre,123,,\n"
+            "bad-email,Geçersiz,Kalem-Defter-42,,\n",
+        )
+        out, err = StringIO(), StringIO()
+        call_command(
+            "bulk_import_users",
+            path,
+            "--workers=2",
+            "--batch-size=2",
+            "--active",
+            stdout=out,
+            stderr=err,
+        )
+
+        self.assertIn("2 users created, 2 skipped, 2 rejected", out.getvalue())
+        self.assertIn("row 5 (zayif@example.com)", err.getvalue())
+        self.assertIn("row 6 (bad-email): invalid email", err.getvalue())
+
+        # Only the domain is lowercased, as for sign-ups.
+        ayse = User.objects.get(email="Ayse@example.com")
+        self.assertEqual(
+            (ayse.name, ayse.grade, ayse.track), ("Ayşe Yılmaz", 12, "sayisal")
+        )
+        self.assertTrue(ayse.is_active)
+        self.assertTrue(ayse.check_password("Kalem-Defter-42"))
+        self.assertTrue(
+            User.objects.get(email="mehmet@example.com").check_password(
+                "Silgi-Cetvel-77"
+            )
+        )
+        self.assertFalse(User.objects.filter(email="zayif@example.com").exists())
+        self.assertFalse(VerificationCode.objects.exists())
+
+    def test_jsonl_import_queues_verification_codes(self):
+        rows = [
+            {"email": f"ogrenci{i}@okul.edu.tr", "name": f"Öğrenci {i}"}
+            for i in range(5)
+        ]
+        # Existence check, then user, code and outbox inserts in a savepoint.
+        with self.assertNumQueries(6):
+            report = bulk_import_users(rows, verification=True)
+
+        self.assertEqual(report.created, 5)
+        users = User.objects.filter(email__endswith="@okul.edu.tr")
+        self.assertEqual(users.count(), 5)
+        self.assertTrue(all(not user.has_usable_password() for user in users))
+        self.assertFalse(any(user.is_active for user in users))
+
+        code = VerificationCode.objects.get(user__email="ogrenci3@okul.edu.tr")
+        email = OutboxEmail.objects.get(to=["ogrenci3@okul.edu.tr"])
+        self.assertIn(code.code, email.body)
+        self.assertIn("Öğrenci 3", email.html_body)
+
+        path = self._write("again.jsonl", "\n".join(json.dumps(r) for r in rows))
+        out = StringIO()
+        call_command("bulk_import_users", path, "--workers=1", stdout=out)
+        self.assertIn("0 users created, 5 skipped", out.getvalue())
+
+    def test_malformed_jsonl_lines_are_reported(self):
+        path = self._write(
+            "students.jsonl",
+            '{"email": "ilk@example.com", "name": "İlk"}\n'
+            '{"email": "yarim@example.com", "name": \n'
+            '["not", "an", "object"]\n'
+            "\n"
+            '{"email": "son@example.com", "name": "Son"}\n',
+        )
+        out, err = StringIO(), StringIO()
+        call_command(
+            "bulk_import_users", path, "--batch-size=1", stdout=out, stderr=err
+        )
+        self.assertIn("2 users created, 0 skipped, 2 rejected", out.getvalue())
+        self.assertIn("row 2 (): invalid JSON", err.getvalue())
+        self.assertIn("row 3 (): not a JSON object", err.getvalue())
+        self.assertTrue(User.objects.filter(email="son@example.com").exists())
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Tests for the purge of expired codes, reset tokens and unverified accounts."""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from backend.users.models import OutboxEmail, PasswordResetToken, VerificationCode
+from backend.users.services.cleanup import purge_expired_codes, purge_sent_emails
+
+User = get_user_model()
+
+
+class PurgeExpiredAccountsTest(TestCase):
+    def _user(self, email, days_old=0, **extra):
+        user = User.objects.create_user(email=email, name=email, **extra)
+        User.objects.filter(pk=user.pk).update(
+            date_joined=timezone.now() - timedelta(days=days_old)
+        )
+        return user
+
+    def _age(self, model, pk, minutes):
+        model.objects.filter(pk=pk).update(
+            created_at=timezone.now() - timedelta(minutes=minutes)
+        )
+
+    def test_expired_codes_and_tokens_are_deleted_in_batches(self):
+        fresh = VerificationCode.objects.create(user=self._user("fresh@example.com"))
+        expired = [
+            VerificationCode.objects.create(user=self._user(f"old{i}@example.com"))
+            for i in range(5)
+        ]
+        for code in expired:
+            self._age(VerificationCode, code.pk, 31)
+        token = PasswordResetToken.objects.create(user=expired[0].user)
+        self._age(PasswordResetToken, token.pk, 45)
+        kept_token = PasswordResetToken.objects.create(user=expired[1].user)
+
+        counts = purge_expired_codes(batch_size=2)
+
+        self.assertEqual(counts, {"verification_codes": 5, "password_reset_tokens": 1})
+        self.assertEqual(list(VerificationCode.objects.all()), [fresh])
+        self.assertEqual(list(PasswordResetToken.objects.all()), [kept_token])
+
+    def test_old_sent_emails_are_deleted(self):
+        now = timezone.now()
+        old, recent, failed, pending = [
+            OutboxEmail.objects.create(subject=name, body="", to=["a@example.com"])
+            for name in ("old", "recent", "failed", "pending")
+        ]
+        OutboxEmail.objects.filter(pk=old.pk).update(
+            status=OutboxEmail.STATUS_SENT, sent_at=now - timedelta(days=31)
+        )
+        OutboxEmail.objects.filter(pk=recent.pk).update(
+            status=OutboxEmail.STATUS_SENT, sent_at=now - timedelta(days=1)
+        )
+        OutboxEmail.objects.filter(pk=failed.pk).update(
+            status=OutboxEmail.STATUS_FAILED
+        )
+
+        self.assertEqual(purge_sent_emails(30, batch_size=1), 1)
+        self.assertEqual(
+            set(OutboxEmail.objects.values_list("subject", flat=True)),
+            {"recent", "failed", "pending"},
+        )
+
+    def test_unverified_accounts_are_removed_only_on_request(self):
+        stale = self._user("stale@example.com", days_old=40)
+        VerificationCode.objects.create(user=stale)
+        self._user("recent@example.com", days_old=2)
+        self._user("verified@example.com", days_old=40, is_active=True)
+        # Verified, then deactivated by an admin; never logged in.
+        self._user("suspended@example.com", days_old=40, email_verified=True)
+
+        out = StringIO()
+        call_command("purge_expired_accounts", stdout=out)
+        self.assertTrue(User.objects.filter(pk=stale.pk).exists())
+
+        call_command("purge_expired_accounts", "--unverified-days=30", stdout=out)
+        self.assertIn("1 unverified users deleted", out.getvalue())
+        self.assertEqual(
+            set(User.objects.values_list("email", flat=True)),
+            {"recent@example.com", "verified@example.com", "suspended@example.com"},
+        )
+        self.assertFalse(VerificationCode.objects.exists())
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Tests for the precompiled account email templates."""
+
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from backend.users import emails
+from backend.users.models import OutboxEmail
+from backend.users.services.outbox import queue_template_emails
+
+
+class EmailTemplateTest(SimpleTestCase):
+    def test_css_is_inlined_and_values_are_escaped(self):
+        subject, text, html = emails.render_email(
+            "password_reset", user_name="<Ali>", reset_url="https://x/r?t=1&u=2"
+        )
+        self.assertEqual(subject, "Reset Your Password")
+        self.assertIn("Hello <Ali>,", text)
+        self.assertIn("https://x/r?t=1&u=2", text)
+        self.assertIn("Hello &lt;Ali&gt;,", html)
+        self.assertIn('href="https://x/r?t=1&amp;u=2"', html)
+        self.assertIn('<body style="margin: 0; padding: 0;', html)
+        self.assertIn('class="backup-link" style="background: #f8f9fa;', html)
+        # Only the rule that cannot be inlined keeps a stylesheet.
+        self.assertIn("<style>.action-button:hover", html)
+        self.assertNotIn(".email-body", html)
+
+    def test_inline_styles_take_precedence(self):
+        document = emails.inline_css(
+            '[style]<p class="a" style="color: red">x</p>', ".a { color: blue; }"
+        )
+        self.assertEqual(
+            document, '<p class="a" style="color: blue; color: red;">x</p>'
+        )
+
+    def test_templates_compile_once_per_year(self):
+        emails.compile_email.cache_clear()
+        contexts = [{"user_name": f"U{i}", "code": f"{i:06d}"} for i in range(50)]
+        with mock.patch.object(emails, "inline_css", wraps=emails.inline_css) as inline:
+            rendered = emails.render_emails("verification", contexts)
+            emails.render_email("verification", user_name="X", code="123456")
+        self.assertEqual(inline.call_count, 1)
+        self.assertEqual(len(rendered), 50)
+        self.assertIn("000049", rendered[-1][2])
+        year = emails.timezone.now().year
+        self.assertIn(f"&copy; {year} BayKoç", rendered[0][2])
+
+
+class TemplateCampaignTest(TestCase):
+    def test_bulk_queueing_renders_each_recipient(self):
+        queued = queue_template_emails(
+            "verification",
+            [
+                (f"u{i}@example.com", {"user_name": f"U{i}", "code": i})
+                for i in range(3)
+            ],
+        )
+        self.assertEqual(len(queued), 3)
+        row = OutboxEmail.objects.get(to=["u2@example.com"])
+        self.assertEqual(row.subject, "Your Verification Code")
+        self.assertIn("Hello U2,", row.body)
@@ -1,10 +1,13 @@
 from unittest.mock import MagicMock, patch
 
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 from rest_framework.authtoken.models import Token
 
 from backend.users.models import User
+from backend.users.services import google_oauth
 from backend.users.services.google_oauth import GoogleOAuthError, GoogleOAuthService
+from backend.users.tests.fake_google import FakeGoogleOAuthServer
 
 
 @override_settings(
@@ -20,15 +23,19 @@ class GoogleOAuthServiceTest(TestCase):
         self.assertIn("response_type=code", url)
         self.assertIn("state=", url)
 
-    @patch("backend.users.services.google_oauth.id_token.verify_oauth2_token")
-    @patch("backend.users.services.google_oauth.requests.post")
-    def test_process_callback_creates_or_updates_user(self, mock_post, mock_verify):
+    @patch("backend.users.services.google_oauth.get_google_certs", return_value={})
+    @patch("backend.users.services.google_oauth.google_jwt.decode")
+    @patch("backend.users.services.google_oauth.http_session")
+    def test_process_callback_creates_or_updates_user(
+        self, mock_session, mock_verify, _mock_certs
+    ):
         mock_response = MagicMock()
         mock_response.json.return_value = {"id_token": "encoded-token"}
         mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        mock_session.return_value.post.return_value = mock_response
 
         mock_verify.return_value = {
+            "iss": "https://accounts.google.com",
             "sub": "google-sub-1",
             "email": "oauth@example.com",
             "email_verified": True,
@@ -63,16 +70,19 @@ class GoogleOAuthServiceTest(TestCase):
         state_value = service._encode_state("/dashboard")
 
         with patch(
-            "backend.users.services.google_oauth.requests.post"
-        ) as mock_post, patch(
-            "backend.users.services.google_oauth.id_token.verify_oauth2_token"
-        ) as mock_verify:
+            "backend.users.services.google_oauth.http_session"
+        ) as mock_session, patch(
+            "backend.users.services.google_oauth.google_jwt.decode"
+        ) as mock_verify, patch(
+            "backend.users.services.google_oauth.get_google_certs", return_value={}
+        ):
             mock_response = MagicMock()
             mock_response.json.return_value = {"id_token": "encoded-token"}
             mock_response.raise_for_status.return_value = None
-            mock_post.return_value = mock_response
+            mock_session.return_value.post.return_value = mock_response
 
             mock_verify.return_value = {
+                "iss": "accounts.google.com",
                 "sub": "different-sub",
                 "email": "conflict@example.com",
                 "email_verified": True,
@@ -81,3 +91,124 @@ class GoogleOAuthServiceTest(TestCase):
 
             with self.assertRaises(GoogleOAuthError):
                 service.process_callback(code="abc", state=state_value)
+
+
+class GoogleOAuthFakeServerTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        google_oauth._certs.clear()
+        self.server = FakeGoogleOAuthServer(
+            claims={
+                "sub": "google-sub-fake",
+                "email": "fake@example.com",
+                "email_verified": True,
+                "name": "Fake User",
+            }
+        )
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.settings_override = override_settings(
+            GOOGLE_CLIENT_ID="test-client",
+            GOOGLE_CLIENT_SECRET="test-secret",
+            GOOGLE_REDIRECT_URI="http://localhost:8000/api/users/auth/google/callback",
+            GOOGLE_TOKEN_ENDPOINT=f"{self.server.base_url}/token",
+            GOOGLE_CERTS_URL=f"{self.server.base_url}/certs",
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def _login(self):
+        service = GoogleOAuthService()
+        return service.process_callback(
+            code="abc", state=service._encode_state("/dashboard")
+        )
+
+    def test_certs_are_fetched_once_and_connection_is_reused(self):
+        first = self._login()
+        second = self._login()
+
+        self.assertEqual(first.user, second.user)
+        self.assertEqual(first.token, second.token)
+        self.assertEqual(self.server.hits, {"/token": 2, "/certs": 1})
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_certs_are_shared_between_workers(self):
+        self._login()
+        google_oauth._certs.clear()  # a fresh worker process
+        self._login()
+        self.assertEqual(self.server.hits["/certs"], 1)
+
+    def test_key_rotation_and_uncacheable_certs_refetch(self):
+        self._login()
+        self.server.rotate_key()
+        self._login()
+        self.assertEqual(self.server.hits["/certs"], 2)
+
+        cache.clear()
+        google_oauth._certs.clear()
+        self.server.cache_control = "no-cache, no-store"
+        self._login()
+        self._login()
+        self.assertEqual(self.server.hits["/certs"], 4)
+
+    def test_token_for_another_client_is_rejected(self):
+        self.server.client_id = "someone-else"
+        with self.assertRaises(GoogleOAuthError):
+            self._login()
+
+
+@override_settings(
+    GOOGLE_CLIENT_ID="test-client",
+    GOOGLE_CLIENT_SECRET="test-secret",
+    GOOGLE_REDIRECT_URI="http://localhost:8000/api/users/auth/google/callback",
+)
+class GoogleOAuthUserSyncTest(TestCase):
+    id_info = {
+        "sub": "google-sub-sync",
+        "email": "Sync@Example.com",
+        "email_verified": True,
+        "name": "Sync User",
+    }
+
+    def test_new_user_is_created_with_token(self):
+        service = GoogleOAuthService()
+        # Lookup, then user and token inserts inside one savepoint.
+        with self.assertNumQueries(5):
+            user, token = service._sync_user(self.id_info)
+        self.assertEqual(user.email, "sync@example.com")
+        self.assertEqual(user.google_sub, "google-sub-sync")
+        self.assertTrue(user.is_active)
+        self.assertTrue(user.email_verified)
+        self.assertFalse(user.has_usable_password())
+        self.assertEqual(Token.objects.get(user=user), token)
+
+    def test_returning_user_costs_one_query(self):
+        service = GoogleOAuthService()
+        user, token = service._sync_user(self.id_info)
+        with self.assertNumQueries(1):
+            again, again_token = service._sync_user(self.id_info)
+        self.assertEqual((again, again_token), (user, token))
+
+    def test_existing_account_is_linked_with_one_update(self):
+        user = User.objects.create_user(
+            email="sync@example.com", name="", password="SecurePass123!"
+        )
+        token = Token.objects.create(user=user)
+        service = GoogleOAuthService()
+        with self.assertNumQueries(2):
+            linked, linked_token = service._sync_user(self.id_info)
+        self.assertEqual(linked_token, token)
+        linked.refresh_from_db()
+        self.assertEqual(
+            (linked.google_sub, linked.is_active, linked.name),
+            ("google-sub-sync", True, "Sync User"),
+        )
+        self.assertTrue(linked.check_password("SecurePass123!"))
+
+    def test_concurrent_first_login_reuses_the_created_account(self):
+        service = GoogleOAuthService()
+        user, token = service._sync_user(self.id_info)
+        with patch.object(GoogleOAuthService, "_find_user", side_effect=[None, user]):
+            again, again_token = service._sync_user(self.id_info)
+        self.assertEqual((again, again_token), (user, token))
+        self.assertEqual(User.objects.filter(email="sync@example.com").count(), 1)
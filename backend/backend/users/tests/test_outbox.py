@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Tests for the transactional email outbox and its batched sender."""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from backend.users.models import OutboxEmail, PasswordResetToken, VerificationCode
+from backend.users.services import outbox
+from backend.users.services.auth import register_user_with_verification
+from backend.users.tests.smtp_stub import StubSMTPServer
+
+
+class OutboxTest(TestCase):
+    def setUp(self):
+        self.User = get_user_model()
+
+    def _user(self, email):
+        return self.User.objects.create_user(
+            email=email, name="Outbox", password="StrongPass123!", is_active=True
+        )
+
+    def test_registration_queues_instead_of_sending(self):
+        resp = self.client.post(
+            reverse("users:user-register"),
+            {"email": "new@example.com", "name": "New", "password": "StrongPass123!"},
+            content_type="application/json",
+        )
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(mail.outbox, [])
+        queued = OutboxEmail.objects.get()
+        self.assertEqual(queued.to, ["new@example.com"])
+        code = VerificationCode.objects.get(user__email="new@example.com").code
+        self.assertIn(code, queued.body)
+
+        self.assertEqual(outbox.drain_outbox(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].alternatives[0][1], "text/html")
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, OutboxEmail.STATUS_SENT)
+
+    def test_rolled_back_registration_sends_nothing(self):
+        with mock.patch.object(
+            VerificationCode, "send", side_effect=RuntimeError("boom")
+        ):
+            with self.assertRaises(RuntimeError):
+                register_user_with_verification("x@example.com", "X", "StrongPass123!")
+        self.assertFalse(self.User.objects.filter(email="x@example.com").exists())
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_batch_reuses_one_smtp_connection(self):
+        for index in range(3):
+            VerificationCode.objects.create(
+                user=self._user(f"u{index}@example.com")
+            ).send()
+        PasswordResetToken.objects.create(user=self._user("reset@example.com")).send()
+
+        with StubSMTPServer() as smtp, override_settings(**smtp.settings()):
+            self.assertEqual(outbox.deliver_outbox(), 4)
+        self.assertEqual(smtp.connections, 1)
+        self.assertEqual(
+            sorted(recipients[0] for _, recipients, _ in smtp.messages),
+            ["reset@example.com", "u0@example.com", "u1@example.com", "u2@example.com"],
+        )
+
+    def test_failures_are_retried_with_backoff(self):
+        OutboxEmail.queue("Hi", "Body", ["bounce@example.com"])
+        OutboxEmail.queue("Hi", "Body", ["ok@example.com"])
+
+        with StubSMTPServer() as smtp, override_settings(**smtp.settings()):
+            smtp.reject.add("bounce@example.com")
+            self.assertEqual(outbox.deliver_outbox(), 1)
+            failed = OutboxEmail.objects.get(to=["bounce@example.com"])
+            self.assertEqual(failed.status, OutboxEmail.STATUS_PENDING)
+            self.assertEqual(failed.attempts, 1)
+            self.assertIn("550", failed.last_error)
+            self.assertGreater(failed.available_at, timezone.now())
+            self.assertEqual(outbox.deliver_outbox(), 0)  # not due yet
+
+            for attempt in range(2, outbox.OUTBOX_MAX_ATTEMPTS + 1):
+                OutboxEmail.objects.filter(pk=failed.pk).update(
+                    available_at=timezone.now() - timedelta(seconds=1)
+                )
+                outbox.deliver_outbox()
+        failed.refresh_from_db()
+        self.assertEqual(failed.attempts, outbox.OUTBOX_MAX_ATTEMPTS)
+        self.assertEqual(failed.status, OutboxEmail.STATUS_FAILED)
+
+    @override_settings(
+        EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+        EMAIL_HOST="127.0.0.1",
+        EMAIL_PORT=1,
+        EMAIL_TIMEOUT=1,
+    )
+    def test_unreachable_server_reschedules_the_batch(self):
+        OutboxEmail.queue("Hi", "Body", ["a@example.com"])
+        self.assertEqual(outbox.deliver_outbox(), 0)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(
+            (email.status, email.attempts), (OutboxEmail.STATUS_PENDING, 1)
+        )
+
+    def test_drain_continues_past_a_batch_that_all_failed(self):
+        OutboxEmail.queue("Hi", "Body", ["bounce1@example.com"])
+        OutboxEmail.queue("Hi", "Body", ["bounce2@example.com"])
+        OutboxEmail.queue("Hi", "Body", ["ok@example.com"])
+
+        with StubSMTPServer() as smtp, override_settings(**smtp.settings()):
+            smtp.reject.update({"bounce1@example.com", "bounce2@example.com"})
+            self.assertEqual(outbox.drain_outbox(batch_size=2), 1)
+        self.assertEqual(
+            OutboxEmail.objects.get(to=["ok@example.com"]).status,
+            OutboxEmail.STATUS_SENT,
+        )
+
+    def test_batch_is_claimed_before_sending(self):
+        email = OutboxEmail.queue("Hi", "Body", ["claim@example.com"])
+        seen = []
+        message = outbox._message
+
+        def _checked(row, connection):
+            # Another sender must see the row as not due while it is sent.
+            seen.append(OutboxEmail.objects.get(pk=row.pk).available_at)
+            return message(row, connection)
+
+        with mock.patch.object(outbox, "_message", side_effect=_checked):
+            self.assertEqual(outbox.deliver_outbox(), 1)
+        self.assertGreater(seen[0], email.available_at + timedelta(minutes=1))
+
+    def test_command_sends_due_emails(self):
+        OutboxEmail.queue("Hi", "Body", ["cmd@example.com"])
+        call_command("send_outbox_emails", "--once", stdout=mock.MagicMock())
+        self.assertEqual(mail.outbox[0].to, ["cmd@example.com"])
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Tests for the versioned /api/users/me/ cache and its ETags."""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from backend.users.serializers import UserSerializer
+
+
+class UserProfileCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="profile@example.com",
+            name="Profil",
+            password="StrongPass123!",
+            is_active=True,
+        )
+        token = Token.objects.create(user=self.user)
+        self.headers = {"HTTP_AUTHORIZATION": f"Token {token.key}"}
+        self.me = reverse("users:user-me")
+
+    def test_repeated_fetches_skip_serialization(self):
+        with mock.patch.object(
+            UserSerializer,
+            "to_representation",
+            autospec=True,
+            side_effect=UserSerializer.to_representation,
+        ) as serialize:
+            first = self.client.get(self.me, **self.headers)
+            with self.assertNumQueries(0):
+                second = self.client.get(self.me, **self.headers)
+        self.assertEqual(serialize.call_count, 1)
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(first.json()["name"], "Profil")
+        self.assertEqual(first["ETag"], second["ETag"])
+
+    def test_etag_revalidation(self):
+        etag = self.client.get(self.me, **self.headers)["ETag"]
+        resp = self.client.get(self.me, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp["ETag"], etag)
+        self.assertEqual(resp.content, b"")
+
+        resp = self.client.get(
+            self.me, HTTP_IF_NONE_MATCH=f'"other", W/{etag}', **self.headers
+        )
+        self.assertEqual(resp.status_code, 304)
+        resp = self.client.get(self.me, HTTP_IF_NONE_MATCH='"stale"', **self.headers)
+        self.assertEqual(resp.status_code, 200)
+
+    def test_updates_change_the_version(self):
+        etag = self.client.get(self.me, **self.headers)["ETag"]
+        resp = self.client.put(
+            self.me,
+            {"name": "Yeni İsim"},
+            content_type="application/json",
+            **self.headers,
+        )
+        self.assertEqual(resp.status_code, 200)
+
+        resp = self.client.get(self.me, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["name"], "Yeni İsim")
+        etag = resp["ETag"]
+
+        resp = self.client.post(
+            reverse("users:complete-profile"),
+            {"grade": 12, "track": "sayisal"},
+            content_type="application/json",
+            **self.headers,
+        )
+        self.assertEqual(resp.status_code, 200)
+        resp = self.client.get(self.me, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.json()["profile_completed"])
+        self.assertEqual(resp.json()["track"], "sayisal")
+
+    def test_saves_outside_the_api_are_visible(self):
+        self.client.get(self.me, **self.headers)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.name = "Admin Düzenledi"
+            self.user.save(update_fields=["name"])
+        self.assertEqual(
+            self.client.get(self.me, **self.headers).json()["name"], "Admin Düzenledi"
+        )
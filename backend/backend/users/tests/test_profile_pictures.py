@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""Tests for staged profile picture uploads and their resized variants."""
+
+import io
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework.authtoken.models import Token
+
+from backend.users.models import ProfilePictureJob
+from backend.users.services import profile_pictures
+
+
+def _image(size=(900, 600), mode="RGBA", fmt="PNG"):
+    buffer = io.BytesIO()
+    Image.new(mode, size, (200, 40, 40, 255) if mode == "RGBA" else "red").save(
+        buffer, fmt
+    )
+    return buffer.getvalue()
+
+
+class ProfilePictureUploadTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        media = tempfile.TemporaryDirectory()
+        staging = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.addCleanup(staging.cleanup)
+        self.media = Path(media.name)
+        self.staging = Path(staging.name)
+        override = override_settings(
+            MEDIA_ROOT=media.name,
+            MEDIA_URL="/media/",
+            DEFAULT_FILE_STORAGE="django.core.files.storage.FileSystemStorage",
+            PROFILE_PICTURE_STAGING_DIR=staging.name,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = get_user_model().objects.create_user(
+            email="picture@example.com",
+            name="Resim",
+            password="StrongPass123!",
+            is_active=True,
+        )
+        token = Token.objects.create(user=self.user)
+        self.headers = {"HTTP_AUTHORIZATION": f"Token {token.key}"}
+        self.me = reverse("users:user-me")
+
+    def _upload(self, content, name="profile.png", content_type="image/png"):
+        return self.client.patch(
+            self.me,
+            encode_multipart(
+                BOUNDARY,
+                {"profile_picture": SimpleUploadedFile(name, content, content_type)},
+            ),
+            content_type=MULTIPART_CONTENT,
+            **self.headers,
+        )
+
+    def _process(self):
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("process_profile_pictures", "--once", stdout=out)
+        return out.getvalue()
+
+    def test_upload_is_staged_then_resized(self):
+        resp = self._upload(_image())
+        self.assertEqual(resp.status_code, 202)
+        self.assertIsNone(resp.json()["profile_picture"])
+        self.assertEqual(len(list(self.staging.iterdir())), 1)
+
+        self.assertIn("1 pictures processed", self._process())
+        self.assertEqual(list(self.staging.iterdir()), [])
+        job = ProfilePictureJob.objects.get()
+        self.assertEqual(job.status, ProfilePictureJob.STATUS_DONE)
+
+        data = self.client.get(self.me, **self.headers).json()
+        urls = data["profile_picture_urls"]
+        self.assertEqual(set(urls), {"avatar", "thumbnail"})
+        self.assertEqual(data["profile_picture"], urls["avatar"])
+        for name, size in (("avatar", 256), ("thumbnail", 64)):
+            path = self.media / urls[name].removeprefix("/media/")
+            with Image.open(path) as image:
+                self.assertEqual((image.format, image.size), ("JPEG", (size, size)))
+
+    def test_new_upload_replaces_the_old_variants(self):
+        self._upload(_image())
+        self._process()
+        old = dict(
+            self.client.get(self.me, **self.headers).json()["profile_picture_urls"]
+        )
+
+        self._upload(_image(mode="RGB", fmt="JPEG"), "a.jpg", "image/jpeg")
+        self._upload(
+            _image(size=(300, 800), mode="RGB", fmt="JPEG"), "b.jpg", "image/jpeg"
+        )
+        self._process()
+
+        jobs = ProfilePictureJob.objects.order_by("pk")
+        self.assertEqual(jobs[1].last_error, "Superseded by a newer upload")
+        self.assertEqual(jobs[2].status, ProfilePictureJob.STATUS_DONE)
+        new = self.client.get(self.me, **self.headers).json()["profile_picture_urls"]
+        self.assertIn(f"/{jobs[2].pk}-avatar", new["avatar"])
+        for url in old.values():
+            self.assertFalse((self.media / url.removeprefix("/media/")).exists())
+
+    def test_older_job_retried_later_does_not_overwrite_newer(self):
+        self._upload(_image())
+        self._upload(_image(mode="RGB", fmt="JPEG"), "b.jpg", "image/jpeg")
+        older, newer = ProfilePictureJob.objects.order_by("pk")
+        # The older job is waiting for a retry while the newer one is handled.
+        ProfilePictureJob.objects.filter(pk=older.pk).update(
+            available_at=timezone.now() + timedelta(minutes=5)
+        )
+        self._process()
+        ProfilePictureJob.objects.filter(pk=older.pk).update(
+            available_at=timezone.now()
+        )
+        self._process()
+
+        older.refresh_from_db()
+        self.assertEqual(older.last_error, "Superseded by a newer upload")
+        urls = self.client.get(self.me, **self.headers).json()["profile_picture_urls"]
+        self.assertIn(f"/{newer.pk}-avatar", urls["avatar"])
+        self.assertEqual(list(self.staging.iterdir()), [])
+
+    def test_upload_arriving_during_resize_wins(self):
+        self._upload(_image())
+        render = profile_pictures.render_variants
+
+        def _render_then_upload(source):
+            variants = render(source)
+            ProfilePictureJob.objects.create(user=self.user, staged_path="/missing")
+            return variants
+
+        with mock.patch.object(
+            profile_pictures, "render_variants", side_effect=_render_then_upload
+        ):
+            self._process()
+
+        job = ProfilePictureJob.objects.order_by("pk").first()
+        self.assertEqual(job.last_error, "Superseded by a newer upload")
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_picture_variants, {})
+        self.assertEqual(list(self.media.rglob("*.jpg")), [])
+
+    def test_invalid_uploads(self):
+        resp = self._upload(b"%PDF-1.4", "cv.pdf", "application/pdf")
+        self.assertEqual(resp.status_code, 400)
+        with override_settings(PROFILE_PICTURE_MAX_BYTES=100):
+            self.assertEqual(self._upload(_image()).status_code, 400)
+
+        self.assertEqual(self._upload(b"not an image").status_code, 202)
+        self._process()
+        job = ProfilePictureJob.objects.get()
+        self.assertEqual(job.status, ProfilePictureJob.STATUS_FAILED)
+        self.assertTrue(job.last_error.startswith("Invalid image"))
+        self.assertEqual(list(self.staging.iterdir()), [])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_picture_variants, {})
+
+    def test_truncated_image_fails_without_retries(self):
+        content = _image(mode="RGB", fmt="JPEG")
+        self._upload(content[: len(content) // 2], "half.jpg", "image/jpeg")
+        self._process()
+        job = ProfilePictureJob.objects.get()
+        self.assertEqual((job.status, job.attempts), (job.STATUS_FAILED, 1))
+        self.assertTrue(job.last_error.startswith("Invalid image"))
@@ -14,6 +14,8 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from backend.throttling import SlidingWindowThrottle
+from backend.users.authentication import invalidate_cached_token
 from backend.users.models import PasswordResetToken, User, VerificationCode
 from backend.users.serializers import (
     UserChangePasswordSerializer,
@@ -30,18 +32,37 @@ from backend.users.services.auth import (
     reset_password,
 )
 from backend.users.services.google_oauth import GoogleOAuthError, GoogleOAuthService
+from backend.users.services.profile import (
+    get_profile_payload,
+    get_profile_version,
+    profile_etag,
+)
+from backend.users.services.profile_pictures import stage_profile_picture
 
 # Removed legacy template-based views (migrated to React SPA)
 
 
+def _if_none_match(request) -> set[str]:
+    value = request.headers.get("If-None-Match", "")
+    return {tag.strip().removeprefix("W/") for tag in value.split(",") if tag.strip()}
+
+
 @method_decorator(csrf_exempt, name="dispatch")
 class UserAPIView(APIView):
     permission_classes = (IsAuthenticated,)
 
     def get(self, request, *args, **kwargs):
         user = request.user
-        serializer = UserSerializer(user)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        version = get_profile_version(user.pk)
+        etag = profile_etag(user.pk, version)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if {etag, "*"} & _if_none_match(request):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(
+            get_profile_payload(user, version),
+            status=status.HTTP_200_OK,
+            headers=headers,
+        )
 
     def put(self, request, *args, **kwargs):
         user = request.user
@@ -56,10 +77,26 @@ class UserAPIView(APIView):
         user = request.user
 
         if "profile_picture" in request.FILES:
-            user.profile_picture = request.FILES["profile_picture"]
-            user.save(update_fields=["profile_picture"])
+            upload = request.FILES["profile_picture"]
+            if upload.size > settings.PROFILE_PICTURE_MAX_BYTES:
+                return Response(
+                    {"message": "Profil fotoğrafı çok büyük."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if not (upload.content_type or "").startswith("image/"):
+                return Response(
+                    {"message": "Profil fotoğrafı bir resim dosyası olmalı."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            # Resized variants are produced by process_profile_pictures.
+            job = stage_profile_picture(user, upload)
             return Response(
-                {"message": "Profil fotoğrafı güncellendi."}, status=status.HTTP_200_OK
+                {
+                    **UserSerializer(user).data,
+                    "message": "Profil fotoğrafı yüklendi, hazırlanıyor.",
+                    "profile_picture_job": job.pk,
+                },
+                status=status.HTTP_202_ACCEPTED,
             )
 
         return Response(
@@ -71,6 +108,8 @@ class UserAPIView(APIView):
 @method_decorator(csrf_exempt, name="dispatch")
 class UserRegisterAPIView(APIView):
     permission_classes = (AllowAny,)
+    throttle_classes = (SlidingWindowThrottle,)
+    throttle_scope = "register"
 
     def post(self, request, *args, **kwargs):
         serializer = UserRegisterSerializer(data=request.data)
@@ -109,6 +148,8 @@ class UserRegisterAPIView(APIView):
 class UserLoginAPIView(APIView):
     queryset = User.objects.all()
     permission_classes = (AllowAny,)
+    throttle_classes = (SlidingWindowThrottle,)
+    throttle_scope = "login"
 
     def post(self, request, *args, **kwargs):
         serializer = UserLoginSerializer(data=request.data)
@@ -151,6 +192,7 @@ class UserLogoutAPIView(APIView):
     permission_classes = (IsAuthenticated,)
 
     def post(self, request, *args, **kwargs):
+        invalidate_cached_token(request.user.pk)
         token = getattr(request.user, "auth_token", None)
         if token is not None:
             token.delete()
@@ -227,6 +269,7 @@ class UserVerifyAPIView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
             verification_code.user.is_active = True
+            verification_code.user.email_verified = True
             verification_code.user.save()
             verification_code.delete()
             return Response(
@@ -249,6 +292,8 @@ class UserForgotPasswordAPIView(APIView):
     """
 
     permission_classes = (AllowAny,)
+    throttle_classes = (SlidingWindowThrottle,)
+    throttle_scope = "forgot-password"
 
     def post(self, request, *args, **kwargs):
         serializer = UserForgotPasswordSerializer(data=request.data)
@@ -353,8 +398,16 @@ class UserCompleteProfileAPIView(APIView):
 
     def get(self, request, *args, **kwargs):
         user = request.user
-        serializer = UserSerializer(user)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        version = get_profile_version(user.pk)
+        etag = profile_etag(user.pk, version)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if {etag, "*"} & _if_none_match(request):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(
+            get_profile_payload(user, version),
+            status=status.HTTP_200_OK,
+            headers=headers,
+        )
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -7,5 +7,9 @@ python manage.py migrate --noinput
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
-echo "Starting Gunicorn..."
-exec gunicorn backend.wsgi:application --bind 0.0.0.0:8000
+echo "Starting Gunicorn (ASGI workers)..."
+# Uvicorn workers serve the async chat stream without pinning a worker per
+# request; sync views still run concurrently in per-request threads.
+exec gunicorn backend.asgi:application \
+    --worker-class uvicorn_worker.UvicornWorker \
+    --bind 0.0.0.0:8000
@@ -4,43 +4,42 @@ import baykocDefaultAvatar from '../../../assets/icons/baykoc_default.png';
 import userDefaultAvatar from '../../../assets/icons/user_default.svg';
 import { apiUrl, parseJsonResponse, extractErrorMessage } from '../../../utils/api';
 
-function toScore(value) {
-  const num = Number(value);
-  return Number.isFinite(num) ? num : 0;
+// The server rebuilds the graph summary from the same query parameters the
+// graph itself was loaded with, so only the filters are sent.
+function chatFilters(graphContext = {}) {
+  const { subject, konu, grup, alt_grup, grades } = graphContext.filters || {};
+  const grade = Array.isArray(grades) && grades.length > 0 ? grades.join(',') : '';
+  return Object.fromEntries(
+    Object.entries({ subject, konu, grup, alt_grup, grade }).filter(([, value]) => value),
+  );
 }
 
-function summarizeGraphContext(graphContext = {}) {
-  const nodes = Array.isArray(graphContext.nodes) ? graphContext.nodes : [];
-  const links = Array.isArray(graphContext.links) ? graphContext.links : [];
-  const filters = graphContext.filters || {};
-
-  const pickTop = (arr, asc = false) =>
-    [...arr]
-      .map((node) => ({
-        label: node.label || node.name || node.id || 'Konu',
-        score: toScore(
-          node.basari_puani ??
-            node.basari ??
-            node.kazanim_basarisi ??
-            node.success ??
-            node.score ??
-            node.puan ??
-            node.value,
-        ),
-        type: node.type,
-      }))
-      .sort((a, b) => (asc ? a.score - b.score : b.score - a.score))
-      .slice(0, 5);
-
-  return {
-    filters,
-    stats: {
-      node_count: nodes.length,
-      link_count: links.length,
-    },
-    best_nodes: pickTop(nodes, false),
-    worst_nodes: pickTop(nodes, true),
-  };
+async function* readServerSentEvents(stream) {
+  const reader = stream.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+      let name = 'message';
+      let data = '';
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event: ')) name = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      }
+      try {
+        yield { event: name, data: JSON.parse(data) };
+      } catch {
+        // ignore malformed events
+      }
+    }
+  }
 }
 
 export default function GraphChatWidget({ graphContext }) {
@@ -65,19 +64,20 @@ export default function GraphChatWidget({ graphContext }) {
     setInput('');
     setLoading(true);
     try {
-      const payload = { message: text, graph: summarizeGraphContext(graphContext) };
+      const payload = { message: text, filters: chatFilters(graphContext) };
       const token = localStorage.getItem('authToken');
-      const res = await fetch(apiUrl('/api/graph/chat/'), {
+      const res = await fetch(apiUrl('/api/graph/chat/stream/'), {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          Accept: 'text/event-stream',
           ...(token ? { Authorization: `Token ${token}` } : {}),
         },
         body: JSON.stringify(payload),
         credentials: 'include',
       });
-      const data = await parseJsonResponse(res);
-      if (!res.ok) {
+      if (!res.ok || !res.body) {
+        const data = await parseJsonResponse(res);
         const errText = extractErrorMessage(
           data,
           `Sohbet servisine ulaşılamadı (HTTP ${res.status})`,
@@ -85,11 +85,22 @@ export default function GraphChatWidget({ graphContext }) {
         setMessages((prev) => [...prev, { from: 'bot', text: errText }]);
         return;
       }
-      const reply = data && typeof data === 'object' ? data.reply : null;
-      setMessages((prev) => [
-        ...prev,
-        { from: 'bot', text: reply || 'Bir yanıt alınamadı.' },
-      ]);
+
+      setMessages((prev) => [...prev, { from: 'bot', text: '' }]);
+      const setReply = (replyText) =>
+        setMessages((prev) => [...prev.slice(0, -1), { from: 'bot', text: replyText }]);
+
+      let reply = '';
+      for await (const { event: name, data } of readServerSentEvents(res.body)) {
+        if (name === 'token') {
+          reply += data.text || '';
+          setReply(reply);
+        } else if (name === 'done') {
+          setReply(data.reply || reply || 'Bir yanıt alınamadı.');
+        } else if (name === 'error') {
+          setReply(data.error || 'Bir hata oluştu. Lütfen daha sonra tekrar dene.');
+        }
+      }
     } catch (error) {
       setMessages((prev) => [
         ...prev,